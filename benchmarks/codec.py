@@ -0,0 +1,59 @@
+import argparse
+import time
+
+from easydb import MultipleElementFields
+from easydb.codec import JsonCodec, OrjsonCodec, UjsonCodec
+
+
+def available_codecs():
+    codecs = [JsonCodec()]
+    for codec_class in (OrjsonCodec, UjsonCodec):
+        try:
+            codecs.append(codec_class())
+        except ImportError:
+            pass
+    return codecs
+
+
+def add_element_body(fields):
+    element_fields = MultipleElementFields()
+    for i in range(fields):
+        element_fields.add_field('field%d' % i, 'value %d' % i)
+    return element_fields._as_json()
+
+
+def filter_page(elements, fields):
+    return {
+        'nextPageLink': 'http://localhost:9000/api/v1/spaces/space/buckets/bucket/elements?limit=%d&offset=%d' %
+                        (elements, elements),
+        'results': [dict(id='id%d' % i, **add_element_body(fields)) for i in range(elements)]
+    }
+
+
+def throughput(operation, argument, iterations):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        operation(argument)
+    return iterations / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare JSON codec throughput on easydb payloads')
+    parser.add_argument('--iterations', type=int, default=20000)
+    parser.add_argument('--fields', type=int, default=10)
+    parser.add_argument('--page-size', type=int, default=100)
+    args = parser.parse_args()
+
+    body = add_element_body(args.fields)
+    page = filter_page(args.page_size, args.fields)
+    page_iterations = max(1, args.iterations // args.page_size)
+
+    print('%-8s %18s %18s' % ('codec', 'add_element enc/s', 'filter page dec/s'))
+    for codec in available_codecs():
+        encoded_page = codec.encode(page)
+        print('%-8s %18.0f %18.0f' % (codec.name, throughput(codec.encode, body, args.iterations),
+                                      throughput(codec.decode, encoded_page, page_iterations)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+import argparse
+import gc
+import time
+import tracemalloc
+
+from easydb import EasydbClient
+
+
+class DictElementField:
+    def __init__(self, name, value):
+        self.name = name
+        self.value = value
+
+
+class DictMultipleElementFields:
+    def __init__(self, fields=None):
+        self.fields = fields or []
+
+
+class DictElement:
+    def __init__(self, identifier, fields=None):
+        self.identifier = identifier
+        self.element_fields = DictMultipleElementFields(fields)
+
+
+def parse_with_dict_classes(rows):
+    return [DictElement(row['id'], [DictElementField(f['name'], f['value']) for f in row['fields']]) for row in rows]
+
+
+def parse_with_domain_classes(rows):
+    return EasydbClient._parse_multiple_elements(rows)
+
+
+def parse_with_lazy_elements(rows):
+    return EasydbClient._parse_lazy_elements(rows)
+
+
+def build_rows(elements, fields):
+    return [{'id': 'id%d' % i, 'fields': [{'name': 'field%d' % j, 'value': 'value%d' % j} for j in range(fields)]}
+            for i in range(elements)]
+
+
+def measure(parse, rows):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    parsed = parse(rows)
+    elapsed = time.perf_counter() - started
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del parsed
+    return {'seconds': elapsed, 'retained_bytes': current, 'peak_bytes': peak}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare memory used by parsed filter results')
+    parser.add_argument('--elements', type=int, default=100000)
+    parser.add_argument('--fields', type=int, default=10)
+    args = parser.parse_args()
+
+    rows = build_rows(args.elements, args.fields)
+    results = {
+        'dict': measure(parse_with_dict_classes, rows),
+        'slots': measure(parse_with_domain_classes, rows),
+        'lazy': measure(parse_with_lazy_elements, rows),
+    }
+
+    print('%d elements x %d fields' % (args.elements, args.fields))
+    for name, result in results.items():
+        print('%-6s %8.3f s  retained %8.1f MiB  peak %8.1f MiB' % (
+            name, result['seconds'], result['retained_bytes'] / 2 ** 20, result['peak_bytes'] / 2 ** 20))
+    saving = 1 - results['slots']['retained_bytes'] / results['dict']['retained_bytes']
+    print('slots retain %.1f%% less memory' % (saving * 100))
+
+
+if __name__ == '__main__':
+    main()
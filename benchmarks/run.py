@@ -0,0 +1,242 @@
+import argparse
+import asyncio
+import contextlib
+import json
+import multiprocessing
+import platform
+import sys
+import time
+import tracemalloc
+
+from aiohttp import web
+
+from easydb import EasydbClient, FakeEasydbServer, FilterQuery, MultipleElementFields, TransactionOperation
+
+
+def element_fields(i, fields):
+    element_fields = MultipleElementFields()
+    for field in range(fields):
+        element_fields.add_field('field%d' % field, 'value %d-%d' % (i, field))
+    return element_fields
+
+
+async def run_workers(operation, operations, concurrency):
+    latencies = []
+    counter = iter(range(operations))
+
+    async def worker():
+        for i in counter:
+            started = time.perf_counter()
+            await operation(i)
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return latencies
+
+
+async def populate(client, space_name, bucket_name, elements, fields):
+    await client.create_bucket(space_name, bucket_name)
+    results = await client.add_elements(space_name, bucket_name,
+                                        [element_fields(i, fields) for i in range(elements)], concurrency=32)
+    return [result.value.identifier for result in results]
+
+
+async def crud_scenario(client, space_name, args, concurrency):
+    bucket_name = 'crud%d' % concurrency
+
+    async def crud(i):
+        element = await client.add_element(space_name, bucket_name, element_fields(i, args.fields))
+        await client.get_element(space_name, bucket_name, element.identifier)
+        await client.update_element(space_name, bucket_name, element.identifier, element_fields(i + 1, args.fields))
+        await client.delete_element(space_name, bucket_name, element.identifier)
+
+    await client.create_bucket(space_name, bucket_name)
+    return crud, args.operations, concurrency, 4
+
+
+async def bulk_scenario(client, space_name, args, concurrency):
+    bucket_name = 'bulk%d' % concurrency
+
+    async def add_batch(i):
+        await client.add_elements(space_name, bucket_name,
+                                  [element_fields(i, args.fields) for _ in range(args.batch_size)],
+                                  concurrency=concurrency)
+
+    await client.create_bucket(space_name, bucket_name)
+    return add_batch, max(1, args.operations // args.batch_size), 1, args.batch_size
+
+
+async def iter_scenario(client, space_name, args, concurrency):
+    bucket_name = 'iter%d' % concurrency
+    await populate(client, space_name, bucket_name, args.scan_size, args.fields)
+
+    async def scan(i):
+        query = FilterQuery(space_name, bucket_name, limit=args.page_size)
+        elements = [element async for element in client.iter_elements(query, prefetch=concurrency)]
+        assert len(elements) == args.scan_size, len(elements)
+
+    return scan, args.scans, 1, args.scan_size
+
+
+async def scan_bucket_scenario(client, space_name, args, concurrency):
+    bucket_name = 'scan%d' % concurrency
+    await populate(client, space_name, bucket_name, args.scan_size, args.fields)
+
+    async def scan(i):
+        elements = [element async for element in client.scan_bucket(space_name, bucket_name,
+                                                                     shard_size=args.page_size,
+                                                                     concurrency=concurrency)]
+        assert len(elements) == args.scan_size, len(elements)
+
+    return scan, args.scans, 1, args.scan_size
+
+
+async def transaction_scenario(client, space_name, args, concurrency):
+    bucket_name = 'transactions%d' % concurrency
+    element_ids = await populate(client, space_name, bucket_name, args.transaction_size, args.fields)
+
+    async def transaction(i):
+        async with client.transaction(space_name, window=concurrency) as builder:
+            for element_id in element_ids:
+                builder.add_operation(TransactionOperation('UPDATE', bucket_name, element_id,
+                                                           element_fields(i, args.fields)))
+
+    return transaction, max(1, args.operations // args.transaction_size), 1, args.transaction_size
+
+
+SCENARIOS = {
+    'crud': crud_scenario,
+    'bulk_add': bulk_scenario,
+    'iter_elements': iter_scenario,
+    'scan_bucket': scan_bucket_scenario,
+    'transaction': transaction_scenario,
+}
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def serve(host, connection):
+    async def start():
+        runner = web.AppRunner(FakeEasydbServer().app())
+        await runner.setup()
+        await web.TCPSite(runner, host, 0).start()
+        connection.send(runner.addresses[0][1])
+
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(start())
+    loop.run_forever()
+
+
+@contextlib.contextmanager
+def start_server(host='127.0.0.1'):
+    connection, child_connection = multiprocessing.Pipe()
+    process = multiprocessing.Process(target=serve, args=(host, child_connection), daemon=True)
+    process.start()
+    try:
+        yield 'http://%s:%d' % (host, connection.recv())
+    finally:
+        process.terminate()
+        process.join()
+
+
+async def measure(server_url, transport, scenario, args, concurrency):
+    async with EasydbClient(server_url, connection_limit=max(100, concurrency), transport=transport) as client:
+        space_name = await client.create_space()
+        operation, operations, workers, items_per_operation = await SCENARIOS[scenario](
+            client, space_name, args, concurrency)
+        tracemalloc.start()
+        started = time.perf_counter()
+        latencies = await run_workers(operation, operations, workers)
+        seconds = time.perf_counter() - started
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        'scenario': scenario,
+        'concurrency': concurrency,
+        'operations': operations,
+        'items': operations * items_per_operation,
+        'seconds': seconds,
+        'throughput': operations * items_per_operation / seconds,
+        'latency_ms': {name: percentile(latencies, q) * 1000 for name, q in
+                       (('p50', 0.50), ('p95', 0.95), ('p99', 0.99))},
+        'peak_memory_kb': peak_memory / 1024,
+    }
+
+
+async def run(args):
+    with contextlib.ExitStack() as stack:
+        if args.transport:
+            server_url, transport = 'http://fake-easydb', FakeEasydbServer()
+        else:
+            server_url, transport = stack.enter_context(start_server()), None
+        results = []
+        for scenario in args.scenarios:
+            for concurrency in args.concurrency:
+                result = await measure(server_url, transport, scenario, args, concurrency)
+                results.append(result)
+                print('%-14s %4d %10.0f items/s  p50 %8.2f ms  p95 %8.2f ms  p99 %8.2f ms  peak %9.0f KiB' %
+                      (scenario, concurrency, result['throughput'], result['latency_ms']['p50'],
+                       result['latency_ms']['p95'], result['latency_ms']['p99'], result['peak_memory_kb']))
+        return results
+
+
+def compare(results, baseline, tolerance):
+    baseline_results = {(r['scenario'], r['concurrency']): r for r in baseline['results']}
+    regressions = []
+    print('\n%-14s %4s %12s %12s %8s' % ('scenario', 'conc', 'baseline', 'current', 'change'))
+    for result in results:
+        key = (result['scenario'], result['concurrency'])
+        previous = baseline_results.get(key)
+        if previous is None:
+            continue
+        change = result['throughput'] / previous['throughput'] - 1
+        print('%-14s %4d %12.0f %12.0f %+7.1f%%' % (key + (previous['throughput'], result['throughput'], change * 100)))
+        if change < -tolerance:
+            regressions.append(key)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the easydb client against a local fake easydb server')
+    parser.add_argument('--scenarios', nargs='+', choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument('--concurrency', nargs='+', type=int, default=[1, 8, 32])
+    parser.add_argument('--operations', type=int, default=1000)
+    parser.add_argument('--fields', type=int, default=5)
+    parser.add_argument('--batch-size', type=int, default=100)
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--scan-size', type=int, default=2000)
+    parser.add_argument('--scans', type=int, default=5)
+    parser.add_argument('--transaction-size', type=int, default=20)
+    parser.add_argument('--transport', action='store_true',
+                        help='plug the fake server in as the client transport instead of serving it over HTTP '
+                             'from a separate process (peak memory then includes the fake server)')
+    parser.add_argument('--output', help='write results as JSON to this file')
+    parser.add_argument('--compare', help='compare throughput against results saved with --output')
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help='relative throughput drop reported as a regression (default: 0.1)')
+    args = parser.parse_args()
+
+    results = asyncio.new_event_loop().run_until_complete(run(args))
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump({'python': sys.version.split()[0], 'platform': platform.platform(),
+                       'arguments': {k: v for k, v in vars(args).items() if k not in ('output', 'compare')},
+                       'results': results}, output, indent=2)
+
+    if args.compare:
+        with open(args.compare) as baseline:
+            regressions = compare(results, json.load(baseline), args.tolerance)
+        if regressions:
+            print('\nThroughput regressions: %s' % ', '.join('%s@%d' % key for key in regressions))
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,22 @@
 from .http import EasydbClient
+from .balancing import EndpointPool, LoadBalancingPolicy
+from .cache import ElementCache
+from .circuit import CircuitBreaker, CircuitBreakerPolicy
+from .codec import JsonCodec, OrjsonCodec, UjsonCodec
+from .fake import FakeEasydbServer
+from .hedging import RequestHedger
+from .instrumentation import Instrumentation, InMemoryCollector, RequestMetrics
+from .limits import RequestLimiter, TokenBucket, AdaptiveConcurrencyLimiter
+from .retry import RetryPolicy
+from .singleflight import SingleFlight
+from .streaming import ElementStream
+from .sync import SyncEasydbClient, SyncElementStream, SyncTransactionBuilder
+from .timeouts import Timeout, deadline, request_timeout
+from .transaction import TransactionBuilder
+from .writer import ElementWriter
 
 from .domain import SpaceDoesNotExistException, BucketDoesNotExistException, ElementDoesNotExistException, \
     TransactionDoesNotExistException, MultipleElementFields, ElementField, Element, FilterQuery, \
     PaginatedElements, TransactionOperation, OperationResult, Element, UnknownOperationException, \
-    BucketAlreadyExistsException
\ No newline at end of file
+    BucketAlreadyExistsException, BulkResult, LazyElement, \
+    RequestTimeoutException, DeadlineExceededException, CircuitOpenException
\ No newline at end of file
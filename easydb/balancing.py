@@ -0,0 +1,156 @@
+import itertools
+import random
+import time
+from typing import Sequence
+
+ROUND_ROBIN = 'round_robin'
+LEAST_OUTSTANDING = 'least_outstanding'
+LATENCY_WEIGHTED = 'latency_weighted'
+STRATEGIES = (ROUND_ROBIN, LEAST_OUTSTANDING, LATENCY_WEIGHTED)
+
+
+class LoadBalancingPolicy:
+    def __init__(self, strategy=ROUND_ROBIN, max_failures=3, ejection_seconds=10.0, pin_transactions=True,
+                 latency_smoothing=0.2):
+        if strategy not in STRATEGIES:
+            raise ValueError('strategy must be one of %s, got %s' % (', '.join(STRATEGIES), strategy))
+        if max_failures < 1:
+            raise ValueError('max_failures must be positive, got %s' % max_failures)
+        self.strategy = strategy
+        self.max_failures = max_failures
+        self.ejection_seconds = ejection_seconds
+        self.pin_transactions = pin_transactions
+        self.latency_smoothing = latency_smoothing
+
+    def __str__(self):
+        return 'LoadBalancingPolicy(strategy=%s, max_failures=%d, ejection_seconds=%s, pin_transactions=%s)' % \
+               (self.strategy, self.max_failures, self.ejection_seconds, self.pin_transactions)
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class Endpoint:
+    def __init__(self, url: str):
+        self.url = url
+        self.outstanding = 0
+        self.latency = None
+        self.consecutive_failures = 0
+        self.ejected_until = None
+        self.probing = False
+        self.requests = 0
+        self.failures = 0
+
+    @property
+    def ejected(self):
+        return self.ejected_until is not None
+
+    def is_available(self, now: float):
+        return self.ejected_until is None or (self.ejected_until <= now and not self.probing)
+
+    def __str__(self):
+        return 'Endpoint(url=%s, outstanding=%d, latency=%s, consecutive_failures=%d, ejected=%s)' % \
+               (self.url, self.outstanding, self.latency, self.consecutive_failures, self.ejected)
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class EndpointPool:
+    def __init__(self, urls: Sequence[str], policy: LoadBalancingPolicy = None, clock=time.monotonic):
+        if not urls:
+            raise ValueError('at least one endpoint is required')
+        self.endpoints = [Endpoint(url) for url in urls]
+        self.policy = policy or LoadBalancingPolicy()
+        self._clock = clock
+        self._round_robin = itertools.count()
+        self._pinned = {}
+
+    def acquire(self, exclude=()):
+        now = self._clock()
+        candidates = [e for e in self.endpoints if e.is_available(now) and e not in exclude] or \
+                     [e for e in self.endpoints if e.is_available(now)]
+        if candidates:
+            endpoint = self._select(candidates)
+        else:
+            endpoint = min(self.endpoints, key=lambda e: e.ejected_until)
+        return self.acquire_endpoint(endpoint)
+
+    def acquire_endpoint(self, endpoint: Endpoint):
+        if endpoint.ejected_until is not None and endpoint.ejected_until <= self._clock():
+            endpoint.probing = True
+        endpoint.outstanding += 1
+        endpoint.requests += 1
+        return endpoint
+
+    def release(self, endpoint: Endpoint, latency: float = None, failed=False):
+        endpoint.outstanding -= 1
+        if failed:
+            endpoint.failures += 1
+            endpoint.consecutive_failures += 1
+            if endpoint.probing or endpoint.consecutive_failures >= self.policy.max_failures:
+                endpoint.ejected_until = self._clock() + self.policy.ejection_seconds
+                endpoint.probing = False
+            return
+
+        endpoint.consecutive_failures = 0
+        endpoint.ejected_until = None
+        endpoint.probing = False
+        if latency is not None:
+            if endpoint.latency is None:
+                endpoint.latency = latency
+            else:
+                smoothing = self.policy.latency_smoothing
+                endpoint.latency = (1 - smoothing) * endpoint.latency + smoothing * latency
+
+    def abandon(self, endpoint: Endpoint):
+        endpoint.outstanding -= 1
+        endpoint.probing = False
+
+    def find(self, url: str):
+        for endpoint in self.endpoints:
+            if url.startswith(endpoint.url) and url[len(endpoint.url):len(endpoint.url) + 1] in ('', '/', '?'):
+                return endpoint
+        return None
+
+    def rewrite(self, url: str, endpoint: Endpoint):
+        current = self.find(url)
+        if current is None or current is endpoint:
+            return url
+        return endpoint.url + url[len(current.url):]
+
+    def pin(self, transaction_id: str, endpoint: Endpoint):
+        if self.policy.pin_transactions:
+            self._pinned[transaction_id] = endpoint
+
+    def unpin(self, transaction_id: str):
+        self._pinned.pop(transaction_id, None)
+
+    def pinned(self, transaction_id: str):
+        return self._pinned.get(transaction_id)
+
+    def _select(self, candidates):
+        strategy = self.policy.strategy
+        if strategy == LEAST_OUTSTANDING:
+            fewest = min(e.outstanding for e in candidates)
+            return self._round_robin_choice([e for e in candidates if e.outstanding == fewest])
+        if strategy == LATENCY_WEIGHTED:
+            return self._latency_weighted_choice(candidates)
+        return self._round_robin_choice(candidates)
+
+    def _round_robin_choice(self, candidates):
+        return candidates[next(self._round_robin) % len(candidates)]
+
+    @staticmethod
+    def _latency_weighted_choice(candidates):
+        unmeasured = [e for e in candidates if e.latency is None]
+        if unmeasured:
+            return random.choice(unmeasured)
+        weights = [1.0 / (max(e.latency, 1e-6) * (e.outstanding + 1)) for e in candidates]
+        return random.choices(candidates, weights)[0]
+
+    def __str__(self):
+        return 'EndpointPool(endpoints=%s, policy=%s)' % (self.endpoints, self.policy)
+
+    def __repr__(self):
+        return self.__str__()
@@ -0,0 +1,86 @@
+import time
+from collections import OrderedDict
+
+
+class ElementCache:
+    def __init__(self, max_size=1024, ttl_seconds=60.0, clock=time.monotonic):
+        if max_size < 1:
+            raise ValueError('max_size must be positive, got %s' % max_size)
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._generations = {}
+        self._generation = 0
+        self._oldest_generation = 0
+
+    def get(self, space_name, bucket_name, element_id):
+        key = (space_name, bucket_name, element_id)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        element, expires_at = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return element.copy()
+
+    def generation(self, space_name, bucket_name, element_id):
+        return max(self._generations.get(key, self._oldest_generation)
+                   for key in ((space_name,), (space_name, bucket_name), (space_name, bucket_name, element_id)))
+
+    def put(self, space_name, bucket_name, element, generation=None):
+        if generation is not None and generation != self.generation(space_name, bucket_name, element.identifier):
+            return
+        key = (space_name, bucket_name, element.identifier)
+        self._entries[key] = (element.copy(), self._clock() + self.ttl_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, space_name, bucket_name, element_id):
+        self._entries.pop((space_name, bucket_name, element_id), None)
+        self._bump((space_name, bucket_name, element_id))
+
+    def invalidate_bucket(self, space_name, bucket_name):
+        for key in [key for key in self._entries if key[0] == space_name and key[1] == bucket_name]:
+            del self._entries[key]
+        self._bump((space_name, bucket_name))
+
+    def invalidate_space(self, space_name):
+        for key in [key for key in self._entries if key[0] == space_name]:
+            del self._entries[key]
+        self._bump((space_name,))
+
+    def clear(self):
+        self._entries.clear()
+        self._forget_generations()
+
+    def _bump(self, key):
+        self._generation += 1
+        self._generations[key] = self._generation
+        if len(self._generations) > self.max_size:
+            self._forget_generations()
+
+    def _forget_generations(self):
+        self._generation += 1
+        self._generations.clear()
+        self._oldest_generation = self._generation
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __str__(self):
+        return 'ElementCache(size=%d, max_size=%d, ttl_seconds=%s, hits=%d, misses=%d)' % \
+               (len(self), self.max_size, self.ttl_seconds, self.hits, self.misses)
+
+    def __repr__(self):
+        return self.__str__()
@@ -0,0 +1,115 @@
+import time
+from collections import deque
+
+from easydb.domain import CircuitOpenException
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreakerPolicy:
+    def __init__(self, failure_rate_threshold=0.5, slow_call_rate_threshold=1.0, slow_call_seconds=5.0,
+                 window_size=20, minimum_calls=10, open_seconds=30.0, half_open_calls=3):
+        if not 0 < failure_rate_threshold <= 1 or not 0 < slow_call_rate_threshold <= 1:
+            raise ValueError('rate thresholds must be in (0, 1], got %s and %s' %
+                             (failure_rate_threshold, slow_call_rate_threshold))
+        if minimum_calls < 1 or window_size < minimum_calls or half_open_calls < 1:
+            raise ValueError('expected 1 <= minimum_calls <= window_size and half_open_calls >= 1')
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.window_size = window_size
+        self.minimum_calls = minimum_calls
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+
+    def __str__(self):
+        return 'CircuitBreakerPolicy(failure_rate_threshold=%s, slow_call_rate_threshold=%s, ' \
+               'slow_call_seconds=%s, window_size=%d, open_seconds=%s)' % \
+               (self.failure_rate_threshold, self.slow_call_rate_threshold, self.slow_call_seconds,
+                self.window_size, self.open_seconds)
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class CircuitBreaker:
+    def __init__(self, server_url: str, policy: CircuitBreakerPolicy = None, clock=time.monotonic):
+        self.server_url = server_url
+        self.policy = policy or CircuitBreakerPolicy()
+        self.state = CLOSED
+        self.rejected = 0
+        self.opened = 0
+        self._clock = clock
+        self._calls = deque(maxlen=self.policy.window_size)
+        self._opened_at = None
+        self._trials_in_flight = 0
+        self._trials_succeeded = 0
+
+    @property
+    def failure_rate(self):
+        return sum(1 for failed, _ in self._calls if failed) / len(self._calls) if self._calls else 0.0
+
+    @property
+    def slow_call_rate(self):
+        return sum(1 for _, slow in self._calls if slow) / len(self._calls) if self._calls else 0.0
+
+    def allows(self):
+        if self.state == OPEN:
+            return self._clock() - self._opened_at >= self.policy.open_seconds
+        if self.state == HALF_OPEN:
+            return self._trials_in_flight + self._trials_succeeded < self.policy.half_open_calls
+        return True
+
+    def acquire(self):
+        if self.state == OPEN and self._clock() - self._opened_at >= self.policy.open_seconds:
+            self._transition(HALF_OPEN)
+        if not self.allows():
+            self.rejected += 1
+            retry_after = 0.0
+            if self.state == OPEN:
+                retry_after = self._opened_at + self.policy.open_seconds - self._clock()
+            raise CircuitOpenException(self.server_url, retry_after)
+        if self.state == HALF_OPEN:
+            self._trials_in_flight += 1
+
+    def release(self):
+        if self.state == HALF_OPEN:
+            self._trials_in_flight = max(0, self._trials_in_flight - 1)
+
+    def record(self, duration: float, failed=False):
+        slow = duration >= self.policy.slow_call_seconds
+        if self.state == HALF_OPEN:
+            self._trials_in_flight = max(0, self._trials_in_flight - 1)
+            if failed or slow:
+                self._transition(OPEN)
+            else:
+                self._trials_succeeded += 1
+                if self._trials_succeeded >= self.policy.half_open_calls:
+                    self._transition(CLOSED)
+            return
+
+        if self.state == OPEN:
+            return
+        self._calls.append((failed, slow))
+        if len(self._calls) >= self.policy.minimum_calls and \
+                (self.failure_rate >= self.policy.failure_rate_threshold or
+                 self.slow_call_rate >= self.policy.slow_call_rate_threshold):
+            self._transition(OPEN)
+
+    def _transition(self, state):
+        self.state = state
+        self._calls.clear()
+        self._trials_in_flight = 0
+        self._trials_succeeded = 0
+        if state == OPEN:
+            self._opened_at = self._clock()
+            self.opened += 1
+
+    def __str__(self):
+        return 'CircuitBreaker(server_url=%s, state=%s, failure_rate=%.2f, slow_call_rate=%.2f)' % \
+               (self.server_url, self.state, self.failure_rate, self.slow_call_rate)
+
+    def __repr__(self):
+        return self.__str__()
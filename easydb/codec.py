@@ -0,0 +1,63 @@
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+class JsonCodec:
+    name = 'json'
+
+    def encode(self, data) -> bytes:
+        return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+    def decode(self, body: bytes):
+        return json.loads(body)
+
+    def __str__(self):
+        return '%s()' % type(self).__name__
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class OrjsonCodec(JsonCodec):
+    name = 'orjson'
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError('orjson is not installed, install easydb-http-client[orjson]')
+
+    def encode(self, data) -> bytes:
+        return orjson.dumps(data)
+
+    def decode(self, body: bytes):
+        return orjson.loads(body)
+
+
+class UjsonCodec(JsonCodec):
+    name = 'ujson'
+
+    def __init__(self):
+        if ujson is None:
+            raise ImportError('ujson is not installed, install easydb-http-client[ujson]')
+
+    def encode(self, data) -> bytes:
+        return ujson.dumps(data, ensure_ascii=False).encode('utf-8')
+
+    def decode(self, body: bytes):
+        return ujson.loads(body)
+
+
+def default_codec() -> JsonCodec:
+    if orjson is not None:
+        return OrjsonCodec()
+    if ujson is not None:
+        return UjsonCodec()
+    return JsonCodec()
@@ -1,3 +1,5 @@
+import asyncio
+from collections import Counter
 from typing import List
 
 
@@ -77,6 +79,35 @@ class TransactionAbortedException(Exception):
         return 'TransactionAbortedException(transaction_id=%s)' % self.transaction_id
 
 
+class RequestTimeoutException(asyncio.TimeoutError):
+    def __init__(self, url: str):
+        super().__init__()
+        self.url = url
+
+    def __str__(self):
+        return '%s(url=%s)' % (type(self).__name__, self.url)
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class DeadlineExceededException(RequestTimeoutException):
+    pass
+
+
+class CircuitOpenException(Exception):
+    def __init__(self, server_url: str, retry_after: float):
+        super().__init__()
+        self.server_url = server_url
+        self.retry_after = retry_after
+
+    def __str__(self):
+        return 'CircuitOpenException(server_url=%s, retry_after=%.3f)' % (self.server_url, self.retry_after)
+
+    def __repr__(self):
+        return self.__str__()
+
+
 class UnknownOperationException(Exception):
     pass
 
@@ -94,6 +125,8 @@ TRANSACTION_DOES_NOT_EXIST = 'TRANSACTION_DOES_NOT_EXIST'
 OPERATION_TYPES = ['CREATE', 'UPDATE', 'DELETE', 'READ']
 TRANSACTION_ABORTED = 'TRANSACTION_ABORTED'
 
+_MISSING = object()
+
 
 class Space:
     def __init__(self, name):
@@ -120,6 +153,8 @@ class Bucket:
         return {'bucketName': self.name}
 
 class ElementField:
+    __slots__ = ('name', 'value')
+
     def __init__(self, name, value):
         self.name = name
         self.value = value
@@ -139,34 +174,73 @@ class ElementField:
 
 
 class MultipleElementFields:
+    __slots__ = ('_fields', '_index', '_indexed_count')
+
     def __init__(self, fields: List[ElementField] = None):
         if not fields:
-            self.fields = []
+            self._fields = []
         else:
-            self.fields = fields
+            self._fields = fields
+        self._index = None
+        self._indexed_count = 0
+
+    @property
+    def fields(self):
+        self._index = None
+        return self._fields
+
+    @fields.setter
+    def fields(self, fields: List[ElementField]):
+        self._fields = fields
+        self._index = None
 
     def add_field(self, name, value):
-        self.fields.append(ElementField(name, value))
+        self._fields.append(ElementField(name, value))
+        if self._index is not None and self._indexed_count == len(self._fields) - 1:
+            self._index.setdefault(name, value)
+            self._indexed_count += 1
         return self
 
+    def get(self, name, default=None):
+        return self._get_index().get(name, default)
+
+    def __getitem__(self, name):
+        return self._get_index()[name]
+
+    def __contains__(self, name):
+        return name in self._get_index()
+
+    def _get_index(self):
+        if self._index is None or self._indexed_count != len(self._fields):
+            index = {}
+            for field in self._fields:
+                index.setdefault(field.name, field.value)
+            self._index = index
+            self._indexed_count = len(self._fields)
+        return self._index
+
     def __str__(self):
-        fields_str = ", ".join(['{%s = %s}' % (f.name, f.value) for f in self.fields])
+        fields_str = ", ".join(['{%s = %s}' % (f.name, f.value) for f in self._fields])
         return 'ElementFields(fields=[ %s ])' % fields_str
 
     def __repr__(self):
         return self.__str__()
 
     def __eq__(self, other):
-        return self.fields == other.fields
+        if self._fields == other._fields:
+            return True
+        return len(self._fields) == len(other._fields) and Counter(self._fields) == Counter(other._fields)
 
     def __hash__(self):
-        return hash(self.fields)
+        return hash(frozenset(self._fields))
 
     def _as_json(self):
-        return {'fields': [dict((('name', f.name), ('value', f.value))) for f in self.fields]}
+        return {'fields': [dict((('name', f.name), ('value', f.value))) for f in self._fields]}
 
 
 class Element:
+    __slots__ = ('identifier', 'element_fields')
+
     def __init__(self, identifier: str, fields: List[ElementField] = None):
         self.identifier = identifier
         self.element_fields = MultipleElementFields(fields)
@@ -194,6 +268,60 @@ class Element:
         self.element_fields.add_field(name, value)
         return self
 
+    def copy(self):
+        return Element(self.identifier, [ElementField(f.name, f.value) for f in self.element_fields._fields])
+
+    def get(self, name, default=None):
+        return self.element_fields.get(name, default)
+
+    def __getitem__(self, name):
+        return self.element_fields[name]
+
+    def __contains__(self, name):
+        return name in self.element_fields
+
+
+class LazyElement(Element):
+    __slots__ = ('_raw_fields', '_materialized')
+
+    def __init__(self, identifier: str, raw_fields: List[dict]):
+        self.identifier = identifier
+        self._raw_fields = raw_fields
+        self._materialized = None
+
+    @property
+    def materialized(self):
+        return self._materialized is not None
+
+    def copy(self):
+        if self._materialized is None:
+            return LazyElement(self.identifier, self._raw_fields)
+        return super().copy()
+
+    @property
+    def element_fields(self):
+        if self._materialized is None:
+            self._materialized = MultipleElementFields([ElementField(f['name'], f['value']) for f in self._raw_fields])
+            self._raw_fields = None
+        return self._materialized
+
+    def get(self, name, default=None):
+        if self._materialized is not None:
+            return self._materialized.get(name, default)
+        for f in self._raw_fields:
+            if f['name'] == name:
+                return f['value']
+        return default
+
+    def __getitem__(self, name):
+        value = self.get(name, _MISSING)
+        if value is _MISSING:
+            raise KeyError(name)
+        return value
+
+    def __contains__(self, name):
+        return self.get(name, _MISSING) is not _MISSING
+
 
 class Transaction:
     def __init__(self, transaction_id):
@@ -223,10 +351,15 @@ class FilterQuery:
 
 
 class PaginatedElements:
+    __slots__ = ('elements', 'next_link')
+
     def __init__(self, elements: List[Element] = None, next_link: str = None):
         self.elements = elements if elements else []
         self.next_link = next_link
 
+    def copy(self):
+        return PaginatedElements([element.copy() for element in self.elements], self.next_link)
+
     def __eq__(self, other):
         return self.elements == other.elements and self.next_link == other.next_link
 
@@ -261,6 +394,8 @@ class TransactionOperation:
 
 
 class OperationResult:
+    __slots__ = ('element',)
+
     def __init__(self, element: Element):
         self.element = element
 
@@ -278,3 +413,24 @@ class OperationResult:
 
     def __repr__(self):
         return self.__str__()
+
+
+class BulkResult:
+    def __init__(self, value=None, error: Exception = None):
+        self.value = value
+        self.error = error
+
+    def is_failed(self):
+        return self.error is not None
+
+    def __eq__(self, other):
+        return self.value == other.value and self.error == other.error
+
+    def __hash__(self):
+        return hash((self.value, self.error))
+
+    def __str__(self):
+        return 'BulkResult(value=%s, error=%s)' % (self.value, self.error)
+
+    def __repr__(self):
+        return self.__str__()
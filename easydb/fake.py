@@ -0,0 +1,254 @@
+import itertools
+import json
+import uuid
+from collections import OrderedDict
+
+from aiohttp import web
+from yarl import URL
+
+from easydb.domain import SPACE_DOES_NOT_EXIST, BUCKET_DOES_NOT_EXIST, ELEMENT_DOES_NOT_EXIST, \
+    TRANSACTION_DOES_NOT_EXIST, TRANSACTION_ABORTED, BUCKET_ALREADY_EXISTS, OPERATION_TYPES
+from easydb.http import Request, ResponseData
+
+API_PREFIX = '/api/v1'
+
+
+class _StoredElement:
+    __slots__ = ('identifier', 'fields', 'version')
+
+    def __init__(self, identifier, fields, version):
+        self.identifier = identifier
+        self.fields = fields
+        self.version = version
+
+    def as_json(self):
+        return {'id': self.identifier, 'fields': [dict(field) for field in self.fields]}
+
+
+class _FakeTransaction:
+    def __init__(self, space_name):
+        self.space_name = space_name
+        self.operations = []
+        self.observed = {}
+        self.aborted = False
+
+
+class FakeEasydbServer:
+    def __init__(self):
+        self.spaces = {}
+        self.transactions = {}
+        self.requests = 0
+        self._versions = itertools.count(1)
+        self._space_ids = itertools.count(1)
+
+    async def send(self, request: Request):
+        return self.handle(request.method, request.url, request.data)
+
+    def app(self):
+        app = web.Application()
+        app.router.add_route('*', API_PREFIX + '/{path:.*}', self._handle_http)
+        return app
+
+    def handle(self, method: str, url: str, data=None):
+        self.requests += 1
+        url = URL(url)
+        base_url, _, path = str(url.with_query(None)).partition(API_PREFIX)
+        segments = [segment for segment in path.split('/') if segment]
+        try:
+            return self._route(method, segments, url.query, data, base_url)
+        except _FakeError as e:
+            return ResponseData(e.status, {'errorCode': e.error_code, 'status': e.error_code, 'message': e.message})
+
+    def abort_transaction(self, transaction_id):
+        self._transaction(transaction_id).aborted = True
+
+    def _route(self, method, segments, query, data, base_url):
+        route = (method,) + tuple(None if i % 2 else segment for i, segment in enumerate(segments))
+        handler = _ROUTES.get(route)
+        if handler is None:
+            return ResponseData(404, {})
+        return handler(self, *(segments[1::2] + [query, data, base_url]))
+
+    def _create_space(self, query, data, base_url):
+        space_name = 'space%d' % next(self._space_ids)
+        self.spaces[space_name] = OrderedDict()
+        return ResponseData(201, {'spaceName': space_name})
+
+    def _get_space(self, space_name, query, data, base_url):
+        self._space(space_name)
+        return ResponseData(200, {'spaceName': space_name})
+
+    def _delete_space(self, space_name, query, data, base_url):
+        self._space(space_name)
+        del self.spaces[space_name]
+        return ResponseData(200, {})
+
+    def _create_bucket(self, space_name, query, data, base_url):
+        space = self._space(space_name)
+        bucket_name = data['bucketName']
+        if bucket_name in space:
+            raise _FakeError(400, BUCKET_ALREADY_EXISTS, 'Bucket %s already exists' % bucket_name)
+        space[bucket_name] = OrderedDict()
+        return ResponseData(201, {})
+
+    def _delete_bucket(self, space_name, bucket_name, query, data, base_url):
+        self._bucket(space_name, bucket_name)
+        del self.spaces[space_name][bucket_name]
+        return ResponseData(200, {})
+
+    def _add_element(self, space_name, bucket_name, query, data, base_url):
+        element = self._store(self._bucket(space_name, bucket_name), uuid.uuid4().hex, data['fields'])
+        return ResponseData(201, element.as_json())
+
+    def _filter_elements(self, space_name, bucket_name, query, data, base_url):
+        bucket = self._bucket(space_name, bucket_name)
+        limit = int(query.get('limit', 20))
+        offset = int(query.get('offset', 0))
+        results = [element.as_json() for element in itertools.islice(bucket.values(), offset, offset + limit)]
+        next_link = None
+        if offset + limit < len(bucket):
+            next_query = dict(query, limit=limit, offset=offset + limit)
+            next_link = str(URL('%s%s/spaces/%s/buckets/%s/elements' % (base_url, API_PREFIX, space_name, bucket_name))
+                            .with_query(next_query))
+        return ResponseData(200, {'results': results, 'nextPageLink': next_link})
+
+    def _get_element(self, space_name, bucket_name, element_id, query, data, base_url):
+        return ResponseData(200, self._element(space_name, bucket_name, element_id).as_json())
+
+    def _update_element(self, space_name, bucket_name, element_id, query, data, base_url):
+        self._element(space_name, bucket_name, element_id)
+        self._store(self.spaces[space_name][bucket_name], element_id, data['fields'])
+        return ResponseData(200, {})
+
+    def _delete_element(self, space_name, bucket_name, element_id, query, data, base_url):
+        self._element(space_name, bucket_name, element_id)
+        del self.spaces[space_name][bucket_name][element_id]
+        return ResponseData(200, {})
+
+    def _begin_transaction(self, space_name, query, data, base_url):
+        self._space(space_name)
+        transaction_id = uuid.uuid4().hex
+        self.transactions[transaction_id] = _FakeTransaction(space_name)
+        return ResponseData(201, {'transactionId': transaction_id})
+
+    def _add_operation(self, space_name, transaction_id, query, data, base_url):
+        self._space(space_name)
+        transaction = self._active_transaction(transaction_id)
+        operation_type = data['type']
+        bucket_name = data['bucketName']
+        if operation_type not in OPERATION_TYPES:
+            return ResponseData(400, {})
+        self._bucket(space_name, bucket_name)
+        element = None
+        if operation_type != 'CREATE':
+            element = self._element(space_name, bucket_name, data['elementId'])
+            observed = transaction.observed.setdefault((bucket_name, element.identifier), element.version)
+            if observed != element.version:
+                self._abort(transaction_id)
+        transaction.operations.append(data)
+        if operation_type == 'READ':
+            return ResponseData(200, {'element': element.as_json()})
+        return ResponseData(200, {'element': None})
+
+    def _commit_transaction(self, space_name, transaction_id, query, data, base_url):
+        space = self._space(space_name)
+        transaction = self._active_transaction(transaction_id)
+        for (bucket_name, element_id), version in transaction.observed.items():
+            element = space.get(bucket_name, {}).get(element_id)
+            if element is None or element.version != version:
+                self._abort(transaction_id)
+
+        del self.transactions[transaction_id]
+        for operation in transaction.operations:
+            bucket = space.get(operation['bucketName'])
+            if bucket is None:
+                continue
+            if operation['type'] == 'CREATE':
+                self._store(bucket, uuid.uuid4().hex, operation['fields'])
+            elif operation['type'] == 'UPDATE':
+                self._store(bucket, operation['elementId'], operation['fields'])
+            elif operation['type'] == 'DELETE':
+                bucket.pop(operation['elementId'], None)
+        return ResponseData(202, {})
+
+    def _store(self, bucket, element_id, fields):
+        element = bucket[element_id] = _StoredElement(
+            element_id, [{'name': field['name'], 'value': field['value']} for field in fields], next(self._versions))
+        return element
+
+    def _abort(self, transaction_id):
+        transaction = self.transactions[transaction_id]
+        transaction.aborted = True
+        transaction.operations = []
+        raise _FakeError(409, TRANSACTION_ABORTED, 'Transaction was aborted. Possible many conflicting transactions '
+                                                   'running at the same time. Try later again')
+
+    def _space(self, space_name):
+        space = self.spaces.get(space_name)
+        if space is None:
+            raise _FakeError(404, SPACE_DOES_NOT_EXIST, 'Space %s does not exist' % space_name)
+        return space
+
+    def _bucket(self, space_name, bucket_name):
+        bucket = self._space(space_name).get(bucket_name)
+        if bucket is None:
+            raise _FakeError(404, BUCKET_DOES_NOT_EXIST, 'Bucket %s does not exist' % bucket_name)
+        return bucket
+
+    def _element(self, space_name, bucket_name, element_id):
+        element = self._bucket(space_name, bucket_name).get(element_id)
+        if element is None:
+            raise _FakeError(404, ELEMENT_DOES_NOT_EXIST, 'Element %s does not exist' % element_id)
+        return element
+
+    def _transaction(self, transaction_id):
+        transaction = self.transactions.get(transaction_id)
+        if transaction is None:
+            raise _FakeError(404, TRANSACTION_DOES_NOT_EXIST, 'Transaction %s does not exist' % transaction_id)
+        return transaction
+
+    def _active_transaction(self, transaction_id):
+        transaction = self._transaction(transaction_id)
+        if transaction.aborted:
+            self._abort(transaction_id)
+        return transaction
+
+    async def _handle_http(self, request: web.Request):
+        body = await request.read()
+        response = self.handle(request.method, '%s://%s%s' % (request.scheme, request.host, request.rel_url),
+                               json.loads(body) if body else None)
+        if not response.data:
+            return web.Response(status=response.status)
+        return web.json_response(response.data, status=response.status)
+
+    def __str__(self):
+        return 'FakeEasydbServer(spaces=%d, transactions=%d, requests=%d)' % \
+               (len(self.spaces), len(self.transactions), self.requests)
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class _FakeError(Exception):
+    def __init__(self, status, error_code, message):
+        super().__init__(message)
+        self.status = status
+        self.error_code = error_code
+        self.message = message
+
+
+_ROUTES = {
+    ('POST', 'spaces'): FakeEasydbServer._create_space,
+    ('GET', 'spaces', None): FakeEasydbServer._get_space,
+    ('DELETE', 'spaces', None): FakeEasydbServer._delete_space,
+    ('POST', 'spaces', None, 'buckets'): FakeEasydbServer._create_bucket,
+    ('DELETE', 'spaces', None, 'buckets', None): FakeEasydbServer._delete_bucket,
+    ('POST', 'spaces', None, 'buckets', None, 'elements'): FakeEasydbServer._add_element,
+    ('GET', 'spaces', None, 'buckets', None, 'elements'): FakeEasydbServer._filter_elements,
+    ('GET', 'spaces', None, 'buckets', None, 'elements', None): FakeEasydbServer._get_element,
+    ('PUT', 'spaces', None, 'buckets', None, 'elements', None): FakeEasydbServer._update_element,
+    ('DELETE', 'spaces', None, 'buckets', None, 'elements', None): FakeEasydbServer._delete_element,
+    ('POST', 'spaces', None, 'transactions'): FakeEasydbServer._begin_transaction,
+    ('POST', 'spaces', None, 'transactions', None, 'add-operation'): FakeEasydbServer._add_operation,
+    ('POST', 'spaces', None, 'transactions', None, 'commit'): FakeEasydbServer._commit_transaction,
+}
@@ -0,0 +1,61 @@
+from collections import deque
+
+
+class RequestHedger:
+    def __init__(self, delay_seconds: float = None, quantile=0.95, min_delay_seconds=0.001, max_delay_seconds=1.0,
+                 budget_ratio=0.1, max_tokens=10.0, other_endpoint=True, window_size=1000, min_samples=20):
+        if not 0 < quantile < 1:
+            raise ValueError('quantile must be in (0, 1), got %s' % quantile)
+        if budget_ratio < 0:
+            raise ValueError('budget_ratio must not be negative, got %s' % budget_ratio)
+        self.delay_seconds = delay_seconds
+        self.quantile = quantile
+        self.min_delay_seconds = min_delay_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.budget_ratio = budget_ratio
+        self.max_tokens = max_tokens
+        self.other_endpoint = other_endpoint
+        self.min_samples = min_samples
+        self.requests = 0
+        self.hedged = 0
+        self.won = 0
+        self.throttled = 0
+        self._latencies = deque(maxlen=window_size)
+        self._tokens = max_tokens
+        self._observed_delay = None
+        self._stale = 0
+
+    def delay(self):
+        if self.delay_seconds is not None:
+            return self.delay_seconds
+        if len(self._latencies) < self.min_samples:
+            return None
+        if self._observed_delay is None or self._stale >= max(1, self.min_samples // 2):
+            latencies = sorted(self._latencies)
+            observed = latencies[min(len(latencies) - 1, int(self.quantile * len(latencies)))]
+            self._observed_delay = min(self.max_delay_seconds, max(self.min_delay_seconds, observed))
+            self._stale = 0
+        return self._observed_delay
+
+    def start(self):
+        self.requests += 1
+        self._tokens = min(self.max_tokens, self._tokens + self.budget_ratio)
+
+    def try_hedge(self):
+        if self._tokens < 1:
+            self.throttled += 1
+            return False
+        self._tokens -= 1
+        self.hedged += 1
+        return True
+
+    def observe(self, latency: float):
+        self._latencies.append(latency)
+        self._stale += 1
+
+    def __str__(self):
+        return 'RequestHedger(delay=%s, budget_ratio=%s, requests=%d, hedged=%d, won=%d, throttled=%d)' % \
+               (self.delay(), self.budget_ratio, self.requests, self.hedged, self.won, self.throttled)
+
+    def __repr__(self):
+        return self.__str__()
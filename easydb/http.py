@@ -1,4 +1,10 @@
+import asyncio
+import contextlib
+import functools
+import re
+import time
 from asyncio import sleep
+from typing import Iterable, Sequence, Tuple, Union
 
 import aiohttp
 
@@ -6,15 +12,52 @@ from easydb.domain import Space, Bucket, ElementField, MultipleElementFields, El
     PaginatedElements, \
     SPACE_DOES_NOT_EXIST, SpaceDoesNotExistException, BUCKET_DOES_NOT_EXIST, BucketDoesNotExistException, \
     ELEMENT_DOES_NOT_EXIST, ElementDoesNotExistException, TRANSACTION_DOES_NOT_EXIST, TransactionDoesNotExistException, \
-    UnknownError, OPERATION_TYPES, UnknownOperationException, Transaction, OperationResult, FilterQuery, \
-    TRANSACTION_ABORTED, TransactionAbortedException, BUCKET_ALREADY_EXISTS, BucketAlreadyExistsException
+    UnknownError, OPERATION_TYPES, UnknownOperationException, Transaction, OperationResult, FilterQuery, LazyElement, \
+    TRANSACTION_ABORTED, TransactionAbortedException, BUCKET_ALREADY_EXISTS, BucketAlreadyExistsException, \
+    BulkResult, RequestTimeoutException, DeadlineExceededException, CircuitOpenException
+from easydb.balancing import EndpointPool, LoadBalancingPolicy
+from easydb.cache import ElementCache
+from easydb.circuit import CircuitBreaker, CircuitBreakerPolicy
+from easydb.codec import JsonCodec, default_codec
+from easydb.hedging import RequestHedger
+from easydb.instrumentation import Instrumentation, RequestMetrics
+from easydb.limits import RequestLimiter, AdaptiveConcurrencyLimiter
+from easydb.retry import RetryPolicy
+from easydb.singleflight import SingleFlight
+from easydb.streaming import ElementStream
+from easydb.timeouts import Timeout, current_timeout, remaining_budget
+from easydb.transaction import TransactionBuilder
+from easydb.writer import ElementWriter
+
+JSON_HEADERS = {'Content-Type': 'application/json'}
+SPACE_IN_URL = re.compile(r'/spaces/([^/?]+)')
+TRANSACTION_IN_URL = re.compile(r'/transactions/([^/?]+)')
+IDEMPOTENT_METHODS = frozenset(['GET', 'PUT', 'DELETE'])
 
 
 class Request:
-    def __init__(self, url: str, method: str, data: dict = None):
+    def __init__(self, url: str, method: str, data: dict = None, hedge=False):
         self.url = url
         self.method = method
         self.data = data
+        self.hedge = hedge
+        self.body = None
+        self.metrics = None
+        self.endpoint = None
+
+    @property
+    def space_name(self):
+        match = SPACE_IN_URL.search(self.url)
+        return match.group(1) if match else None
+
+    @property
+    def idempotent(self):
+        return self.method in IDEMPOTENT_METHODS
+
+    @property
+    def transaction_id(self):
+        match = TRANSACTION_IN_URL.search(self.url)
+        return match.group(1) if match else None
 
     def __str__(self):
         return "Request(url=%s, method=%s, data=%s)" % (self.url, self.method, self.data)
@@ -33,10 +76,60 @@ class ResponseData:
 
 
 class EasydbClient:
-    def __init__(self, server_url: str, retry_backoff_millis=300, retries_number=3):
-        self.server_url = server_url + "/api/v1"
+    def __init__(self, server_url: Union[str, Sequence[str]], retry_backoff_millis=300, retries_number=3, connection_limit=100,
+                 connection_limit_per_host=0, keepalive_timeout=15, dns_cache_ttl=10, retry_policy: RetryPolicy = None,
+                 element_cache: ElementCache = None, coalesce_reads=False, codec: JsonCodec = None,
+                 limiter: Union[RequestLimiter, AdaptiveConcurrencyLimiter] = None, timeout: Timeout = None,
+                 instrumentation: Instrumentation = None, transport=None,
+                 load_balancing: LoadBalancingPolicy = None, circuit_breaker: CircuitBreakerPolicy = None,
+                 hedging: RequestHedger = None):
+        server_urls = [server_url] if isinstance(server_url, str) else list(server_url)
+        self.server_url = server_urls[0] + "/api/v1"
+        self.endpoints = None
+        if len(server_urls) > 1 or load_balancing is not None:
+            self.endpoints = EndpointPool([url + "/api/v1" for url in server_urls], load_balancing)
         self.retry_backoff_millis = retry_backoff_millis
         self.retries_number = retries_number
+        self.retry_policy = retry_policy or RetryPolicy(max_attempts=retries_number + 1,
+                                                        backoff_millis=retry_backoff_millis)
+        self.connection_limit = connection_limit
+        self.connection_limit_per_host = connection_limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.element_cache = element_cache
+        self.single_flight = SingleFlight() if coalesce_reads else None
+        self.codec = codec or default_codec()
+        self.limiter = limiter
+        self.timeout = timeout
+        self.instrumentation = instrumentation
+        self.transport = transport
+        self.circuit_breaker_policy = circuit_breaker
+        self.hedging = hedging
+        self.circuit_breakers = {}
+        self._session = None
+        self._transaction_elements = {}
+
+    async def __aenter__(self):
+        if self.transport is None:
+            self._get_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self):
+        if self._session is not None:
+            session, self._session = self._session, None
+            await session.close()
+
+    @property
+    def closed(self):
+        return self._session is None or self._session.closed
+
+    def circuit_breaker(self, server_url: str = None):
+        if self.circuit_breaker_policy is None:
+            return None
+        return self._circuit_breaker(server_url + "/api/v1" if server_url else self.server_url)
 
     async def create_space(self):
         response = await self._perform_request(Request("%s/spaces" % self.server_url, 'POST'))
@@ -46,12 +139,23 @@ class EasydbClient:
 
     async def delete_space(self, space_name):
         response = await self._perform_request(Request("%s/spaces/%s" % (self.server_url, space_name), 'DELETE'))
+        if self.element_cache is not None:
+            self.element_cache.invalidate_space(space_name)
+        self._forget_reads(space_name)
 
         self._ensure_space_found(response, space_name)
         self._ensure_status_2xx(response)
 
     async def get_space(self, space_name):
-        response = await self._perform_request(Request("%s/spaces/%s" % (self.server_url, space_name), 'GET'))
+        if self.single_flight is not None:
+            return await self.single_flight.do(('get_space', space_name),
+                                               functools.partial(self._get_space, space_name),
+                                               lambda space: Space(space.name))
+        return await self._get_space(space_name)
+
+    async def _get_space(self, space_name):
+        response = await self._perform_request(
+            Request("%s/spaces/%s" % (self.server_url, space_name), 'GET', hedge=True))
 
         self._ensure_space_found(response, space_name)
         self._ensure_status_2xx(response)
@@ -69,6 +173,7 @@ class EasydbClient:
         response = await self._perform_request(
             Request("%s/spaces/%s/buckets/%s/elements" % (self.server_url, space_name, bucket_name), 'POST',
                     data=element_fields._as_json()))
+        self._forget_reads(space_name, bucket_name)
 
         self._ensure_space_found(response, space_name)
         self._ensure_bucket_found(response, space_name, bucket_name)
@@ -79,6 +184,9 @@ class EasydbClient:
     async def delete_bucket(self, space_name, bucket_name):
         response = await self._perform_request(
             Request('%s/spaces/%s/buckets/%s' % (self.server_url, space_name, bucket_name), 'DELETE'))
+        if self.element_cache is not None:
+            self.element_cache.invalidate_bucket(space_name, bucket_name)
+        self._forget_reads(space_name, bucket_name)
 
         self._ensure_space_found(response, space_name)
         self._ensure_bucket_found(response, space_name, bucket_name)
@@ -88,6 +196,9 @@ class EasydbClient:
         response = await self._perform_request(
             Request('%s/spaces/%s/buckets/%s/elements/%s' % (self.server_url, space_name, bucket_name, element_id),
                     'DELETE'))
+        if self.element_cache is not None:
+            self.element_cache.invalidate(space_name, bucket_name, element_id)
+        self._forget_reads(space_name, bucket_name, element_id)
 
         self._ensure_space_found(response, space_name)
         self._ensure_bucket_found(response, space_name, bucket_name)
@@ -99,6 +210,9 @@ class EasydbClient:
             Request('%s/spaces/%s/buckets/%s/elements/%s' % (self.server_url, space_name, bucket_name, element_id),
                     'PUT',
                     data=element_fields._as_json()))
+        if self.element_cache is not None:
+            self.element_cache.invalidate(space_name, bucket_name, element_id)
+        self._forget_reads(space_name, bucket_name, element_id)
 
         self._ensure_space_found(response, space_name)
         self._ensure_bucket_found(response, space_name, bucket_name)
@@ -106,9 +220,25 @@ class EasydbClient:
         self._ensure_status_2xx(response)
 
     async def get_element(self, space_name, bucket_name, element_id):
+        if self.element_cache is not None:
+            element = self.element_cache.get(space_name, bucket_name, element_id)
+            if element is not None:
+                return element
+
+        if self.single_flight is not None:
+            return await self.single_flight.do(('get_element', space_name, bucket_name, element_id),
+                                               functools.partial(self._get_element, space_name, bucket_name,
+                                                                 element_id),
+                                               Element.copy)
+        return await self._get_element(space_name, bucket_name, element_id)
+
+    async def _get_element(self, space_name, bucket_name, element_id):
+        generation = None
+        if self.element_cache is not None:
+            generation = self.element_cache.generation(space_name, bucket_name, element_id)
         response = await self._perform_request(
             Request('%s/spaces/%s/buckets/%s/elements/%s' % (self.server_url, space_name, bucket_name, element_id),
-                    'GET'))
+                    'GET', hedge=True))
 
         self._ensure_space_found(response, space_name)
         self._ensure_bucket_found(response, space_name, bucket_name)
@@ -116,42 +246,161 @@ class EasydbClient:
         self._ensure_status_2xx(response)
         element_id = response.data['id']
         fields = self._parse_element_fields(response.data['fields'])
-        return Element(element_id, fields)
-
-    async def filter_elements_by_query(self, query: FilterQuery):
-        if query.query:
-            request = Request('%s/spaces/%s/buckets/%s/elements?limit=%d&offset=%d&query=%s' %
-                    (self.server_url, query.space_name, query.bucket_name, query.limit, query.offset, query.query), 'GET')
-        else:
-            request = Request('%s/spaces/%s/buckets/%s/elements?limit=%d&offset=%d' %
-                    (self.server_url, query.space_name, query.bucket_name, query.limit, query.offset), 'GET')
-
-        response = await self._perform_request(request)
+        element = Element(element_id, fields)
+        if self.element_cache is not None:
+            self.element_cache.put(space_name, bucket_name, element, generation)
+        return element
+
+    async def add_elements(self, space_name, bucket_name, elements_fields: Iterable[MultipleElementFields],
+                           concurrency=10):
+        return await self._run_bulk(
+            (functools.partial(self.add_element, space_name, bucket_name, element_fields)
+             for element_fields in elements_fields), concurrency)
+
+    async def get_elements(self, space_name, bucket_name, element_ids: Iterable[str], concurrency=10):
+        return await self._run_bulk(
+            (functools.partial(self.get_element, space_name, bucket_name, element_id)
+             for element_id in element_ids), concurrency)
+
+    async def update_elements(self, space_name, bucket_name,
+                              updates: Iterable[Tuple[str, MultipleElementFields]], concurrency=10):
+        return await self._run_bulk(
+            (functools.partial(self.update_element, space_name, bucket_name, element_id, element_fields)
+             for element_id, element_fields in updates), concurrency)
+
+    async def delete_elements(self, space_name, bucket_name, element_ids: Iterable[str], concurrency=10):
+        return await self._run_bulk(
+            (functools.partial(self.delete_element, space_name, bucket_name, element_id)
+             for element_id in element_ids), concurrency)
+
+    async def filter_elements_by_query(self, query: FilterQuery, lazy=False):
+        if self.single_flight is not None:
+            key = ('filter_elements_by_query', query.space_name, query.bucket_name, query.limit, query.offset,
+                   query.query, lazy)
+            return await self.single_flight.do(key, functools.partial(self._filter_elements_by_query, query, lazy),
+                                               PaginatedElements.copy)
+        return await self._filter_elements_by_query(query, lazy)
+
+    async def _filter_elements_by_query(self, query: FilterQuery, lazy):
+        response = await self._perform_request(self._build_filter_request(query))
 
         self._ensure_space_found(response, query.space_name)
         self._ensure_bucket_found(response, query.space_name, query.bucket_name)
-        return self._parse_filter_response(response)
-
-    async def filter_elements_by_link(self, link: str):
-        response = await self._perform_request(Request(link, 'GET'))
-        return self._parse_filter_response(response)
+        return self._parse_filter_response(response, lazy)
+
+    async def filter_elements_by_link(self, link: str, lazy=False):
+        response = await self._perform_request(Request(link, 'GET', hedge=True))
+        return self._parse_filter_response(response, lazy)
+
+    def stream_elements_by_query(self, query: FilterQuery):
+        def ensure_found(response):
+            self._ensure_space_found(response, query.space_name)
+            self._ensure_bucket_found(response, query.space_name, query.bucket_name)
+
+        return ElementStream(functools.partial(self._open_stream, self._build_filter_request(query), ensure_found),
+                             self._parse_single_element)
+
+    def stream_elements_by_link(self, link: str):
+        return ElementStream(functools.partial(self._open_stream, Request(link, 'GET'), lambda response: None),
+                             self._parse_single_element)
+
+    async def iter_elements(self, query: FilterQuery, prefetch=1):
+        if prefetch < 1:
+            raise ValueError('prefetch must be at least 1, got %s' % prefetch)
+
+        pages = asyncio.Queue(maxsize=prefetch)
+        producer = asyncio.ensure_future(self._produce_pages(query, pages))
+        try:
+            while True:
+                page = await pages.get()
+                if page is None:
+                    return
+                if isinstance(page, Exception):
+                    raise page
+                for element in page.elements:
+                    yield element
+        finally:
+            producer.cancel()
+
+    async def scan_bucket(self, space_name: str, bucket_name: str, shard_size=100, concurrency=4, ordered=True,
+                          query=None):
+        if shard_size < 1 or concurrency < 1:
+            raise ValueError('shard_size and concurrency must be positive, got %s and %s' % (shard_size, concurrency))
+
+        windows = {}
+        next_window = 0
+        last_window = None
+        try:
+            while True:
+                while len(windows) < concurrency and (last_window is None or next_window <= last_window):
+                    windows[next_window] = asyncio.ensure_future(
+                        self._fetch_window(space_name, bucket_name, next_window * shard_size, shard_size, query))
+                    next_window += 1
+
+                if not windows:
+                    return
+
+                if ordered:
+                    index = min(windows)
+                    elements = await windows.pop(index)
+                else:
+                    done, _ = await asyncio.wait(list(windows.values()), return_when=asyncio.FIRST_COMPLETED)
+                    index = next(i for i, window in windows.items() if window in done)
+                    elements = windows.pop(index).result()
+
+                if len(elements) < shard_size and (last_window is None or index < last_window):
+                    last_window = index
+                    for i in [i for i in windows if i > last_window]:
+                        windows.pop(i).cancel()
+
+                if last_window is None or index <= last_window:
+                    for element in elements:
+                        yield element
+        finally:
+            for window in windows.values():
+                window.cancel()
 
     async def begin_transaction(self, space_name: str):
-        response = await self._perform_request(
-            Request('%s/spaces/%s/transactions' % (self.server_url, space_name), 'POST'))
+        request = Request('%s/spaces/%s/transactions' % (self.server_url, space_name), 'POST')
+        response = await self._perform_request(request)
 
         self._ensure_space_found(response, space_name)
         self._ensure_status_2xx(response)
-        return self._parse_transaction(response.data)
+        transaction = self._parse_transaction(response.data)
+        if request.endpoint is not None:
+            self.endpoints.pin(transaction.transaction_id, request.endpoint)
+        return transaction
+
+    def transaction(self, space_name: str, window=8):
+        return TransactionBuilder(self, space_name, window)
+
+    def element_writer(self, space_name: str, bucket_name: str, batch_size=100, flush_interval=0.1,
+                       max_queue_size=1000, workers=4, concurrency=10):
+        return ElementWriter(self, space_name, bucket_name, batch_size, flush_interval, max_queue_size, workers,
+                             concurrency)
+
+    async def run_transaction(self, space_name: str, fn, max_attempts=None, window=8):
+        max_attempts = max_attempts or self.retry_policy.max_attempts
+        attempt = 1
+        while True:
+            try:
+                async with TransactionBuilder(self, space_name, window, attempt) as transaction:
+                    result = await fn(transaction)
+                return result
+            except TransactionAbortedException:
+                if attempt >= max_attempts:
+                    raise
+            await sleep(self.retry_policy.backoff(attempt))
+            attempt += 1
 
     async def add_operation(self, space_name: str, transaction_id: str, operation: TransactionOperation):
         self._ensure_operation_constraints(operation)
 
-        # response = await self._add_operation_request_with_retry(
-        #     Request('%s/transactions/%s/add-operation' % (self.server_url, transaction_id), 'POST',
-        #             operation._as_json()))
         response = await self._perform_request(
             Request('%s/spaces/%s/transactions/%s/add-operation' % (self.server_url, space_name, transaction_id), 'POST', operation._as_json()))
+        if response.status in (404, 409) and response.data and \
+                response.data.get('errorCode') in (TRANSACTION_DOES_NOT_EXIST, TRANSACTION_ABORTED):
+            self._forget_transaction(transaction_id)
 
         self._ensure_transaction_found(response, transaction_id)
         self._ensure_bucket_found(response, space_name=None, bucket_name=operation.bucket_name,
@@ -160,45 +409,443 @@ class EasydbClient:
                                    element_id=operation.element_id, transaction_id=transaction_id)
         self._ensure_transaction_not_aborted(response, transaction_id)
         self._ensure_status_2xx(response)
+        if self.element_cache is not None and operation.type in ('UPDATE', 'DELETE'):
+            self._transaction_elements.setdefault(transaction_id, set()).add(
+                (space_name, operation.bucket_name, operation.element_id))
         return self._parse_operation_result(response.data)
 
     async def commit_transaction(self, space_name, transaction_id):
         response = await self._perform_request(
             Request('%s/spaces/%s/transactions/%s/commit' % (self.server_url, space_name, transaction_id), 'POST'))
+        for touched_element in self._forget_transaction(transaction_id):
+            self.element_cache.invalidate(*touched_element)
+        self._forget_reads(space_name)
 
         self._ensure_space_found(response, space_name)
         self._ensure_transaction_found(response, transaction_id)
         self._ensure_transaction_not_aborted(response, transaction_id)
         self._ensure_status_2xx(response)
 
-    def _parse_filter_response(self, response):
+    def _forget_reads(self, space_name, bucket_name=None, element_id=None):
+        if self.single_flight is None:
+            return
+
+        def matches(key):
+            if key[1] != space_name:
+                return False
+            if bucket_name is None:
+                return True
+            if key[0] == 'get_space' or key[2] != bucket_name:
+                return False
+            return element_id is None or key[0] != 'get_element' or key[3] == element_id
+
+        self.single_flight.forget(matches)
+
+    def _forget_transaction(self, transaction_id):
+        if self.endpoints is not None:
+            self.endpoints.unpin(transaction_id)
+        return self._transaction_elements.pop(transaction_id, ())
+
+    def _parse_filter_response(self, response, lazy=False):
         self._ensure_status_2xx(response)
         next_link = response.data['nextPageLink']
-        elements = self._parse_multiple_elements(response.data['results'])
+        if lazy:
+            elements = self._parse_lazy_elements(response.data['results'])
+        else:
+            elements = self._parse_multiple_elements(response.data['results'])
         return PaginatedElements(elements, next_link)
 
-    async def _add_operation_request_with_retry(self, request: Request):
-        counter = 0
-        response = await EasydbClient._perform_request(request)
-        while counter < self.retries_number:
-            if response.status == 200 and response.data['errorCode'] == TRANSACTION_ABORTED:
-                await sleep(self.retry_backoff_millis / 1000)
-                response = await EasydbClient._perform_request(request)
-                counter += 1
+    async def _produce_pages(self, query: FilterQuery, pages: asyncio.Queue):
+        try:
+            page = await self.filter_elements_by_query(query)
+            await pages.put(page)
+            while page.next_link:
+                page = await self.filter_elements_by_link(page.next_link)
+                await pages.put(page)
+            await pages.put(None)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await pages.put(e)
+
+    async def _fetch_window(self, space_name, bucket_name, offset, limit, query):
+        page = await self.filter_elements_by_query(
+            FilterQuery(space_name, bucket_name, limit=limit, offset=offset, query=query))
+        return page.elements
+
+    @staticmethod
+    async def _run_bulk(calls, concurrency):
+        if concurrency < 1:
+            raise ValueError('concurrency must be positive, got %s' % concurrency)
+
+        calls = enumerate(calls)
+        results = {}
+
+        async def worker():
+            for index, call in calls:
+                try:
+                    results[index] = BulkResult(await call())
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    results[index] = BulkResult(error=e)
+
+        await asyncio.gather(*[worker() for _ in range(concurrency)])
+        return [results[index] for index in range(len(results))]
+
+    async def _perform_request(self, request: Request):
+        if request.method not in ['GET', 'POST', 'DELETE', 'PUT']:
+            raise Exception("Incorrect request type")
+
+        self._encode_body(request)
+        if self.instrumentation is None:
+            return await self._perform_with_retries(request)
+
+        metrics = request.metrics = RequestMetrics(request.method, request.url)
+        metrics.bytes_out = len(request.body) if request.body else 0
+        started = time.monotonic()
+        try:
+            response = await self._perform_with_retries(request)
+            metrics.status = response.status
+            metrics.error_code = response.data.get('errorCode') if isinstance(response.data, dict) else None
+            return response
+        except BaseException as e:
+            metrics.error = type(e).__name__
+            raise
+        finally:
+            metrics.total_seconds = time.monotonic() - started
+            self.instrumentation.on_request(metrics)
+
+    async def _perform_with_retries(self, request: Request):
+        attempt = 1
+        while True:
+            try:
+                response = await self._send_attempt(request)
+            except RequestTimeoutException:
+                raise
+            except Exception as e:
+                if not self.retry_policy.can_retry(attempt) or \
+                        not self.retry_policy.should_retry_error(e, request.idempotent):
+                    raise self._translate_timeout(request, e) from e
             else:
-                break
+                if not self.retry_policy.can_retry(attempt) or \
+                        not self.retry_policy.should_retry_response(response, request.idempotent,
+                                                                    request.transaction_id is not None):
+                    return response
+            backoff = self.retry_policy.backoff(attempt)
+            remaining = remaining_budget()
+            if remaining is not None and remaining <= backoff:
+                raise DeadlineExceededException(request.url)
+            await sleep(backoff)
+            attempt += 1
+            if request.metrics is not None:
+                request.metrics.retries += 1
+
+    @staticmethod
+    def _translate_timeout(request: Request, error: Exception):
+        if not isinstance(error, asyncio.TimeoutError):
+            return error
+        remaining = remaining_budget()
+        if remaining is not None and remaining <= 0:
+            return DeadlineExceededException(request.url)
+        return RequestTimeoutException(request.url)
+
+    def _send_attempt(self, request: Request):
+        if self.hedging is not None and request.hedge:
+            return self._send_hedged(request)
+        return self._send_limited(request)
+
+    async def _send_hedged(self, request: Request):
+        hedging = self.hedging
+        hedging.start()
+        started = time.monotonic()
+        primary = asyncio.ensure_future(self._send_limited(request))
+        primary_finished = []
+        primary.add_done_callback(lambda task: primary_finished.append(time.monotonic()))
+        tasks = [primary]
+        pending = {primary}
+        try:
+            delay = hedging.delay()
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if not done and delay is not None and hedging.try_hedge():
+                duplicate = Request(request.url, request.method, request.data)
+                duplicate.body = request.body
+                duplicate.endpoint = request.endpoint if hedging.other_endpoint else None
+                hedge = asyncio.ensure_future(self._send_limited(duplicate))
+                tasks.append(hedge)
+                pending.add(hedge)
+            else:
+                hedge = None
+
+            while True:
+                if not done:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winner = next((task for task in done if task.exception() is None), None)
+                if winner is not None:
+                    break
+                if not pending:
+                    raise done.pop().exception()
+                done = set()
+
+            if winner is hedge:
+                hedging.won += 1
+            # delays derive from the primary attempt, if the hedge won its elapsed time is a lower bound
+            hedging.observe((primary_finished[0] if winner is primary else time.monotonic()) - started)
+            return winner.result()
+        finally:
+            for task in tasks:
+                if task.done():
+                    self._retrieve_exception(task)
+                else:
+                    task.cancel()
+                    task.add_done_callback(self._retrieve_exception)
+
+    @staticmethod
+    def _retrieve_exception(task: asyncio.Future):
+        if not task.cancelled():
+            task.exception()
+
+    async def _send_limited(self, request: Request):
+        if self.limiter is None:
+            return await self._send(request)
+
+        space_name = request.space_name
+        waited = await self._acquire_limiter(request)
+        if request.metrics is not None:
+            request.metrics.queue_seconds += waited
+        started = time.monotonic()
+        latency = None
+        overloaded = False
+        try:
+            response = await self._send(request)
+            latency = time.monotonic() - started
+            overloaded = self._is_overloaded(response)
+            return response
+        except RequestTimeoutException:
+            raise
+        except asyncio.TimeoutError:
+            overloaded = True
+            raise
+        finally:
+            self.limiter.release(space_name, latency, overloaded)
+
+    async def _acquire_limiter(self, request: Request):
+        remaining = remaining_budget()
+        if remaining is None:
+            return await self.limiter.acquire(request.space_name)
+        if remaining <= 0:
+            raise DeadlineExceededException(request.url)
+        try:
+            return await asyncio.wait_for(self.limiter.acquire(request.space_name), remaining)
+        except asyncio.TimeoutError:
+            raise DeadlineExceededException(request.url) from None
+
+    async def _send(self, request: Request):
+        options = self._timeout_options(request)
+        if self.transport is not None:
+            if not options or options['timeout'].total is None:
+                return await self.transport.send(request)
+            return await asyncio.wait_for(self.transport.send(request), options['timeout'].total)
+        if self.endpoints is None:
+            return await self._send_guarded(request, self.server_url, request.url, options)
+
+        endpoint = self._acquire_endpoint(request)
+        started = time.monotonic()
+        try:
+            response = await self._send_guarded(request, endpoint.url, self.endpoints.rewrite(request.url, endpoint),
+                                                options)
+        except (asyncio.CancelledError, CircuitOpenException):
+            self.endpoints.abandon(endpoint)
+            raise
+        except BaseException:
+            self.endpoints.release(endpoint, failed=True)
+            raise
+        if response.status >= 500:
+            self.endpoints.release(endpoint, failed=True)
+        else:
+            self.endpoints.release(endpoint, time.monotonic() - started)
         return response
 
+    async def _send_guarded(self, request: Request, server_url: str, url: str, options: dict):
+        if self.circuit_breaker_policy is None:
+            return await self._send_to(request, url, options)
+
+        breaker = self._circuit_breaker(server_url)
+        breaker.acquire()
+        started = time.monotonic()
+        try:
+            response = await self._send_to(request, url, options)
+        except asyncio.CancelledError:
+            breaker.release()
+            raise
+        except Exception:
+            breaker.record(time.monotonic() - started, failed=True)
+            raise
+        breaker.record(time.monotonic() - started, failed=response.status >= 500)
+        return response
+
+    async def _send_to(self, request: Request, url: str, options: dict):
+        metrics = request.metrics
+        if metrics is None:
+            async with self._get_session().request(request.method, url, data=request.body,
+                                                   headers=self._headers(request), **options) as response:
+                return ResponseData(response.status, await self._read_data(response))
+
+        started = time.monotonic()
+        connect_seconds = metrics.connect_seconds
+        async with self._get_session().request(request.method, url, data=request.body,
+                                               headers=self._headers(request), trace_request_ctx=metrics,
+                                               **options) as response:
+            received = time.monotonic()
+            metrics.server_seconds += received - started - (metrics.connect_seconds - connect_seconds)
+            data = await self._read_data(response, metrics)
+            metrics.parse_seconds += time.monotonic() - received
+            return ResponseData(response.status, data)
+
+    def _encode_body(self, request: Request):
+        if request.body is None and request.data is not None:
+            request.body = self.codec.encode(request.data)
+
+    def _timeout_options(self, request: Request):
+        remaining = remaining_budget()
+        if remaining is not None and remaining <= 0:
+            raise DeadlineExceededException(request.url)
+
+        timeout = current_timeout() or self.timeout
+        if timeout is None and remaining is None:
+            return {}
+        return {'timeout': (timeout or Timeout()).to_client_timeout(remaining)}
+
     @staticmethod
-    async def _perform_request(request: Request):
-        async with aiohttp.ClientSession() as session:
-            if request.method in ['GET', 'POST', 'DELETE', 'PUT']:
-                async with session.request(request.method, request.url, json=request.data) as response:
-                    if EasydbClient._is_empty_response(response):
-                        return ResponseData(response.status, {})
-                    return ResponseData(response.status, await response.json())
+    def _headers(request: Request):
+        return JSON_HEADERS if request.body is not None else None
+
+    async def _read_data(self, response: aiohttp.ClientResponse, metrics: RequestMetrics = None):
+        if EasydbClient._is_empty_response(response):
+            return {}
+        body = await response.read()
+        if metrics is not None:
+            metrics.bytes_in += len(body)
+        if not body:
+            return {}
+        if 200 <= response.status < 300:
+            return self.codec.decode(body)
+        if 'json' not in response.content_type:
+            return {}
+        try:
+            return self.codec.decode(body)
+        except ValueError:
+            return {}
+
+    @contextlib.asynccontextmanager
+    async def _open_stream(self, request: Request, ensure_found, chunk_size=65536):
+        self._encode_body(request)
+        if self.limiter is not None:
+            await self._acquire_limiter(request)
+        try:
+            if self.transport is not None:
+                response = await self.transport.send(request)
+                ensure_found(response)
+                self._ensure_status_2xx(response)
+                yield self._single_chunk(self.codec.encode(response.data))
             else:
-                raise Exception("Incorrect request type")
+                async with self._open_response(request, ensure_found) as response:
+                    yield response.content.iter_chunked(chunk_size)
+        finally:
+            if self.limiter is not None:
+                self.limiter.release(request.space_name)
+
+    @contextlib.asynccontextmanager
+    async def _open_response(self, request: Request, ensure_found):
+        options = self._timeout_options(request)
+        url = request.url
+        server_url = self.server_url
+        endpoint = None
+        if self.endpoints is not None:
+            endpoint = self._acquire_endpoint(request)
+            url = self.endpoints.rewrite(url, endpoint)
+            server_url = endpoint.url
+        breaker = None
+        if self.circuit_breaker_policy is not None:
+            breaker = self._circuit_breaker(server_url)
+            try:
+                breaker.acquire()
+            except CircuitOpenException:
+                if endpoint is not None:
+                    self.endpoints.abandon(endpoint)
+                raise
+        started = time.monotonic()
+        elapsed = None
+        status = None
+        interrupted = False
+        try:
+            async with self._get_session().request(request.method, url, data=request.body,
+                                                   headers=self._headers(request), **options) as response:
+                status = response.status
+                elapsed = time.monotonic() - started
+                if response.status >= 300 or response.status < 200:
+                    error_response = ResponseData(response.status, await self._read_data(response))
+                    ensure_found(error_response)
+                    self._ensure_status_2xx(error_response)
+                yield response
+        except asyncio.CancelledError:
+            if status is None:
+                if endpoint is not None:
+                    self.endpoints.abandon(endpoint)
+                    endpoint = None
+                if breaker is not None:
+                    breaker.release()
+                    breaker = None
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            interrupted = True
+            raise
+        finally:
+            failed = interrupted or status is None or status >= 500
+            if breaker is not None:
+                breaker.record(time.monotonic() - started if elapsed is None else elapsed, failed=failed)
+            if endpoint is not None:
+                self.endpoints.release(endpoint, failed=failed)
+
+    def _acquire_endpoint(self, request: Request):
+        transaction_id = request.transaction_id
+        pinned = self.endpoints.pinned(transaction_id) if transaction_id else None
+        if pinned is not None:
+            endpoint = self.endpoints.acquire_endpoint(pinned)
+        else:
+            exclude = [request.endpoint] if request.endpoint else []
+            if self.circuit_breaker_policy is not None:
+                exclude.extend(e for e in self.endpoints.endpoints if not self._circuit_breaker(e.url).allows())
+            endpoint = self.endpoints.acquire(exclude)
+        request.endpoint = endpoint
+        return endpoint
+
+    def _circuit_breaker(self, server_url: str):
+        breaker = self.circuit_breakers.get(server_url)
+        if breaker is None:
+            breaker = self.circuit_breakers[server_url] = CircuitBreaker(server_url, self.circuit_breaker_policy)
+        return breaker
+
+    @staticmethod
+    async def _single_chunk(chunk: bytes):
+        yield chunk
+
+    def _get_session(self):
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.connection_limit,
+                                             limit_per_host=self.connection_limit_per_host,
+                                             keepalive_timeout=self.keepalive_timeout,
+                                             ttl_dns_cache=self.dns_cache_ttl)
+            trace_configs = [self.instrumentation.trace_config()] if self.instrumentation else None
+            self._session = aiohttp.ClientSession(connector=connector, trace_configs=trace_configs)
+        return self._session
+
+    @staticmethod
+    def _is_overloaded(response: ResponseData):
+        if response.status >= 500:
+            return True
+        return response.status == 409 and isinstance(response.data, dict) and \
+               response.data.get('errorCode') == TRANSACTION_ABORTED
 
     @staticmethod
     def _ensure_space_found(response, space_name):
@@ -244,6 +891,10 @@ class EasydbClient:
     def _parse_multiple_elements(data: dict):
         return [Element(f['id'], EasydbClient._parse_element_fields(f['fields'])) for f in data]
 
+    @staticmethod
+    def _parse_lazy_elements(data: dict):
+        return [LazyElement(f['id'], f['fields']) for f in data]
+
     @staticmethod
     def _parse_single_element(data: dict):
         return Element(data['id'], EasydbClient._parse_element_fields(data['fields']))
@@ -264,6 +915,15 @@ class EasydbClient:
     def _is_empty_response(response: aiohttp.ClientResponse):
         return response.content_length is not None and response.content_length == 0
 
+    def _build_filter_request(self, query: FilterQuery):
+        if query.query:
+            return Request('%s/spaces/%s/buckets/%s/elements?limit=%d&offset=%d&query=%s' %
+                           (self.server_url, query.space_name, query.bucket_name, query.limit, query.offset,
+                            query.query), 'GET', hedge=True)
+        return Request('%s/spaces/%s/buckets/%s/elements?limit=%d&offset=%d' %
+                       (self.server_url, query.space_name, query.bucket_name, query.limit, query.offset), 'GET',
+                       hedge=True)
+
     def _build_space_url(self, space_name=""):
         return self._without_ending_slash('%s/spaces/%s' % (self.server_url, space_name))
 
@@ -0,0 +1,194 @@
+import bisect
+import time
+from collections import OrderedDict
+
+import aiohttp
+from yarl import URL
+
+PATH_PARAMETERS = {'spaces': '{space}', 'buckets': '{bucket}', 'elements': '{element}',
+                   'transactions': '{transaction}'}
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PHASES = ('queue', 'connect', 'server', 'parse')
+
+
+def url_template(url: str):
+    segments = URL(url).path.split('/')
+    template = []
+    parameter = None
+    for segment in segments:
+        if parameter:
+            template.append(parameter)
+            parameter = None
+        else:
+            template.append(segment)
+            parameter = PATH_PARAMETERS.get(segment)
+    path = '/'.join(template)
+    api_prefix = path.find('/spaces')
+    return path[api_prefix:] if api_prefix >= 0 else path
+
+
+class RequestMetrics:
+    def __init__(self, method: str, url: str):
+        self.method = method
+        self.url = url
+        self.url_template = url_template(url)
+        self.status = None
+        self.error_code = None
+        self.error = None
+        self.bytes_out = 0
+        self.bytes_in = 0
+        self.retries = 0
+        self.queue_seconds = 0.0
+        self.connect_seconds = 0.0
+        self.server_seconds = 0.0
+        self.parse_seconds = 0.0
+        self.total_seconds = 0.0
+        self._connect_started = None
+
+    def __str__(self):
+        return 'RequestMetrics(method=%s, url_template=%s, status=%s, error_code=%s, error=%s, retries=%d, ' \
+               'total_seconds=%.6f)' % (self.method, self.url_template, self.status, self.error_code, self.error,
+                                        self.retries, self.total_seconds)
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class Instrumentation:
+    def on_request(self, metrics: RequestMetrics):
+        pass
+
+    def trace_config(self):
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_start.append(self._on_connection_create_start)
+        trace_config.on_connection_create_end.append(self._on_connection_create_end)
+        return trace_config
+
+    @staticmethod
+    async def _on_connection_create_start(session, context, params):
+        metrics = context.trace_request_ctx
+        if isinstance(metrics, RequestMetrics):
+            metrics._connect_started = time.monotonic()
+
+    @staticmethod
+    async def _on_connection_create_end(session, context, params):
+        metrics = context.trace_request_ctx
+        if isinstance(metrics, RequestMetrics) and metrics._connect_started is not None:
+            metrics.connect_seconds += time.monotonic() - metrics._connect_started
+            metrics._connect_started = None
+
+
+class Histogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative_counts(self):
+        total = 0
+        for count in self.counts:
+            total += count
+            yield total
+
+    def quantile(self, q: float):
+        if not self.count:
+            return None
+        rank = q * self.count
+        for bound, cumulative in zip(self.buckets + (float('inf'),), self.cumulative_counts()):
+            if cumulative >= rank:
+                return bound
+        return float('inf')
+
+    def __str__(self):
+        return 'Histogram(count=%d, sum=%.6f)' % (self.count, self.sum)
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class InMemoryCollector(Instrumentation):
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.durations = OrderedDict()
+        self.phases = OrderedDict()
+        self.requests = OrderedDict()
+        self.retries = OrderedDict()
+        self.bytes_in = OrderedDict()
+        self.bytes_out = OrderedDict()
+
+    def on_request(self, metrics: RequestMetrics):
+        route = (metrics.method, metrics.url_template)
+        outcome = route + (str(metrics.status) if metrics.status is not None else '',
+                           metrics.error_code or metrics.error or '')
+        self._histogram(self.durations, route).observe(metrics.total_seconds)
+        for phase in PHASES:
+            self._histogram(self.phases, route + (phase,)).observe(getattr(metrics, phase + '_seconds'))
+        self._increment(self.requests, outcome, 1)
+        self._increment(self.retries, route, metrics.retries)
+        self._increment(self.bytes_in, route, metrics.bytes_in)
+        self._increment(self.bytes_out, route, metrics.bytes_out)
+
+    def render_prometheus(self):
+        lines = []
+        self._render_histograms(lines, 'easydb_client_request_duration_seconds',
+                                'Total duration of client requests including retries', ('method', 'route'),
+                                self.durations)
+        self._render_histograms(lines, 'easydb_client_request_phase_seconds',
+                                'Time spent in each phase of client requests', ('method', 'route', 'phase'),
+                                self.phases)
+        self._render_counters(lines, 'easydb_client_requests_total', 'Completed client requests',
+                              ('method', 'route', 'status', 'error'), self.requests)
+        self._render_counters(lines, 'easydb_client_retries_total', 'Retried request attempts',
+                              ('method', 'route'), self.retries)
+        self._render_counters(lines, 'easydb_client_received_bytes_total', 'Response body bytes received',
+                              ('method', 'route'), self.bytes_in)
+        self._render_counters(lines, 'easydb_client_sent_bytes_total', 'Request body bytes sent',
+                              ('method', 'route'), self.bytes_out)
+        return '\n'.join(lines) + '\n'
+
+    def _histogram(self, histograms, key):
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = Histogram(self.buckets)
+        return histogram
+
+    @staticmethod
+    def _increment(counters, key, value):
+        counters[key] = counters.get(key, 0) + value
+
+    @staticmethod
+    def _render_histograms(lines, name, help_text, label_names, histograms):
+        lines.append('# HELP %s %s' % (name, help_text))
+        lines.append('# TYPE %s histogram' % name)
+        for key, histogram in histograms.items():
+            labels = _labels(label_names, key)
+            bounds = [_format_bound(bound) for bound in histogram.buckets] + ['+Inf']
+            for bound, cumulative in zip(bounds, histogram.cumulative_counts()):
+                lines.append('%s_bucket{%s,le="%s"} %d' % (name, labels, bound, cumulative))
+            lines.append('%s_sum{%s} %r' % (name, labels, histogram.sum))
+            lines.append('%s_count{%s} %d' % (name, labels, histogram.count))
+
+    @staticmethod
+    def _render_counters(lines, name, help_text, label_names, counters):
+        lines.append('# HELP %s %s' % (name, help_text))
+        lines.append('# TYPE %s counter' % name)
+        for key, value in counters.items():
+            lines.append('%s{%s} %d' % (name, _labels(label_names, key), value))
+
+
+def _labels(names, values):
+    return ','.join('%s="%s"' % (name, _escape(value)) for name, value in zip(names, values))
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_bound(bound):
+    return repr(float(bound))
@@ -0,0 +1,201 @@
+import asyncio
+import time
+from collections import deque
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int = None, clock=time.monotonic):
+        if rate <= 0:
+            raise ValueError('rate must be positive, got %s' % rate)
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self._clock = clock
+        self._tokens = float(self.capacity)
+        self._updated = clock()
+        self._lock = None
+
+    async def acquire(self):
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def __str__(self):
+        return 'TokenBucket(rate=%s, capacity=%d)' % (self.rate, self.capacity)
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class _WaitStatistics:
+    def __init__(self):
+        self.waiting = 0
+        self.in_flight = 0
+        self.acquisitions = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    @property
+    def average_wait_seconds(self):
+        return self.total_wait_seconds / self.acquisitions if self.acquisitions else 0.0
+
+    def _record_wait(self, waited):
+        self.acquisitions += 1
+        self.total_wait_seconds += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+
+class RequestLimiter(_WaitStatistics):
+    def __init__(self, max_concurrency: int = None, max_concurrency_per_space: int = None,
+                 requests_per_second: float = None, burst: int = None):
+        super().__init__()
+        self.max_concurrency = max_concurrency
+        self.max_concurrency_per_space = max_concurrency_per_space
+        self.token_bucket = TokenBucket(requests_per_second, burst) if requests_per_second else None
+        self._global = None
+        self._spaces = {}
+
+    async def acquire(self, space_name: str = None):
+        started = time.monotonic()
+        self.waiting += 1
+        try:
+            if self.token_bucket:
+                await self.token_bucket.acquire()
+            await self._acquire_slots(space_name)
+        finally:
+            self.waiting -= 1
+
+        waited = time.monotonic() - started
+        self.in_flight += 1
+        self._record_wait(waited)
+        return waited
+
+    def release(self, space_name: str = None, latency: float = None, overloaded=False):
+        self.in_flight -= 1
+        space_semaphore = self._space_semaphore(space_name)
+        if space_semaphore:
+            space_semaphore.release()
+        if self._global:
+            self._global.release()
+
+    async def _acquire_slots(self, space_name):
+        if self.max_concurrency and self._global is None:
+            self._global = asyncio.Semaphore(self.max_concurrency)
+        if self._global:
+            await self._global.acquire()
+
+        space_semaphore = self._space_semaphore(space_name)
+        if space_semaphore:
+            try:
+                await space_semaphore.acquire()
+            except BaseException:
+                if self._global:
+                    self._global.release()
+                raise
+
+    def _space_semaphore(self, space_name):
+        if not self.max_concurrency_per_space or space_name is None:
+            return None
+        semaphore = self._spaces.get(space_name)
+        if semaphore is None:
+            semaphore = self._spaces[space_name] = asyncio.Semaphore(self.max_concurrency_per_space)
+        return semaphore
+
+    def __str__(self):
+        return 'RequestLimiter(in_flight=%d, waiting=%d, acquisitions=%d, average_wait_seconds=%.6f)' % \
+               (self.in_flight, self.waiting, self.acquisitions, self.average_wait_seconds)
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class AdaptiveConcurrencyLimiter(_WaitStatistics):
+    def __init__(self, initial_limit=10, min_limit=1, max_limit=200, backoff_ratio=0.5, latency_tolerance=2.0,
+                 smoothing=0.2, clock=time.monotonic):
+        super().__init__()
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError('expected 1 <= min_limit <= initial_limit <= max_limit')
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff_ratio = backoff_ratio
+        self.latency_tolerance = latency_tolerance
+        self.smoothing = smoothing
+        self.baseline_latency = None
+        self.smoothed_latency = None
+        self._clock = clock
+        self._last_backoff = None
+        self._waiters = deque()
+
+    async def acquire(self, space_name: str = None):
+        started = self._clock()
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+        else:
+            waiter = asyncio.get_event_loop().create_future()
+            self._waiters.append(waiter)
+            self.waiting += 1
+            try:
+                await waiter
+            except BaseException:
+                if waiter.done() and not waiter.cancelled():
+                    self._release_slot()
+                elif waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                raise
+            finally:
+                self.waiting -= 1
+
+        waited = self._clock() - started
+        self._record_wait(waited)
+        return waited
+
+    def release(self, space_name: str = None, latency: float = None, overloaded=False):
+        if overloaded:
+            self._back_off()
+        elif latency is not None:
+            self._observe(latency)
+        self._release_slot()
+
+    def _observe(self, latency):
+        if self.smoothed_latency is None:
+            self.smoothed_latency = latency
+            self.baseline_latency = latency
+        else:
+            self.smoothed_latency += self.smoothing * (latency - self.smoothed_latency)
+            self.baseline_latency = min(latency, self.baseline_latency * (1 + self.smoothing / 100))
+
+        if self.smoothed_latency <= self.baseline_latency * self.latency_tolerance:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def _back_off(self):
+        now = self._clock()
+        if self._last_backoff is not None and self.smoothed_latency is not None and \
+                now - self._last_backoff < self.smoothed_latency:
+            return
+        self._last_backoff = now
+        self.limit = max(self.min_limit, self.limit * self.backoff_ratio)
+
+    def _release_slot(self):
+        self.in_flight -= 1
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def __str__(self):
+        return 'AdaptiveConcurrencyLimiter(limit=%.2f, in_flight=%d, waiting=%d, smoothed_latency=%s)' % \
+               (self.limit, self.in_flight, self.waiting, self.smoothed_latency)
+
+    def __repr__(self):
+        return self.__str__()
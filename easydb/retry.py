@@ -0,0 +1,55 @@
+import asyncio
+import random
+from typing import Iterable
+
+import aiohttp
+
+from easydb.domain import TRANSACTION_ABORTED
+
+SERVER_ERROR_STATUSES = frozenset(range(500, 600))
+
+
+class RetryPolicy:
+    def __init__(self, max_attempts=4, backoff_millis=300, max_backoff_millis=10000,
+                 retryable_statuses: Iterable[int] = SERVER_ERROR_STATUSES,
+                 retryable_error_codes: Iterable[str] = (TRANSACTION_ABORTED,),
+                 retry_on_connection_errors=True, retry_non_idempotent=False):
+        if max_attempts < 1:
+            raise ValueError('max_attempts must be positive, got %s' % max_attempts)
+        self.max_attempts = max_attempts
+        self.backoff_millis = backoff_millis
+        self.max_backoff_millis = max_backoff_millis
+        self.retryable_statuses = frozenset(retryable_statuses)
+        self.retryable_error_codes = frozenset(retryable_error_codes)
+        self.retry_on_connection_errors = retry_on_connection_errors
+        self.retry_non_idempotent = retry_non_idempotent
+
+    def can_retry(self, attempt: int):
+        return attempt < self.max_attempts
+
+    def should_retry_response(self, response, idempotent=True, transaction_scoped=False):
+        if response.status in self.retryable_statuses:
+            return idempotent or self.retry_non_idempotent
+        error_code = response.data.get('errorCode') if isinstance(response.data, dict) else None
+        if transaction_scoped and error_code == TRANSACTION_ABORTED:
+            return False
+        return error_code in self.retryable_error_codes
+
+    def should_retry_error(self, error: Exception, idempotent=True):
+        if not self.retry_on_connection_errors:
+            return False
+        if isinstance(error, aiohttp.ClientConnectorError):
+            return True
+        return (idempotent or self.retry_non_idempotent) and \
+               isinstance(error, (aiohttp.ClientConnectionError, asyncio.TimeoutError))
+
+    def backoff(self, attempt: int):
+        ceiling = min(self.max_backoff_millis, self.backoff_millis * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling) / 1000
+
+    def __str__(self):
+        return 'RetryPolicy(max_attempts=%d, backoff_millis=%s, max_backoff_millis=%s)' % \
+               (self.max_attempts, self.backoff_millis, self.max_backoff_millis)
+
+    def __repr__(self):
+        return self.__str__()
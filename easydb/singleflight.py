@@ -0,0 +1,38 @@
+import asyncio
+
+
+class SingleFlight:
+    def __init__(self):
+        self.coalesced = 0
+        self._calls = {}
+
+    async def do(self, key, call, copy=None):
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._complete(key, done))
+            return await asyncio.shield(task)
+
+        self.coalesced += 1
+        result = await asyncio.shield(task)
+        return copy(result) if copy is not None else result
+
+    def forget(self, matches):
+        for key in [key for key in self._calls if matches(key)]:
+            del self._calls[key]
+
+    def _complete(self, key, task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            task.exception()
+
+    def __len__(self):
+        return len(self._calls)
+
+    def __str__(self):
+        return 'SingleFlight(in_flight=%d, coalesced=%d)' % (len(self), self.coalesced)
+
+    def __repr__(self):
+        return self.__str__()
@@ -0,0 +1,114 @@
+import codecs
+import json
+from typing import AsyncIterable
+
+_WHITESPACE = ' \t\n\r'
+_DELIMITERS = _WHITESPACE + ',:]}'
+_DECODER = json.JSONDecoder()
+
+
+class _JsonReader:
+    def __init__(self, chunks: AsyncIterable[bytes]):
+        self._chunks = chunks.__aiter__()
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._text = ''
+        self._position = 0
+        self._eof = False
+
+    async def next_char(self):
+        char = await self.peek()
+        self._position += 1
+        return char
+
+    async def expect(self, expected):
+        char = await self.next_char()
+        if char != expected:
+            raise ValueError('Expected %r but found %r in response body' % (expected, char))
+
+    async def peek(self):
+        while True:
+            while self._position < len(self._text) and self._text[self._position] in _WHITESPACE:
+                self._position += 1
+            if self._position < len(self._text):
+                return self._text[self._position]
+            if not await self._fill():
+                raise ValueError('Unexpected end of response body')
+
+    async def value(self):
+        await self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._text, self._position)
+            except json.JSONDecodeError:
+                if not await self._fill():
+                    raise
+                continue
+            if (end == len(self._text) or self._text[end] not in _DELIMITERS) and await self._fill():
+                continue
+            self._position = end
+            return value
+
+    async def _fill(self):
+        if self._eof:
+            return False
+        try:
+            chunk = await self._chunks.__anext__()
+        except StopAsyncIteration:
+            self._eof = True
+            chunk = b''
+        self._text = self._text[self._position:] + self._decoder.decode(chunk, final=self._eof)
+        self._position = 0
+        return not self._eof
+
+
+class ElementStream:
+    def __init__(self, open_chunks, parse_element):
+        self.next_link = None
+        self._open_chunks = open_chunks
+        self._parse_element = parse_element
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        async with self._open_chunks() as chunks:
+            async for element in self.parse(chunks):
+                yield element
+
+    async def parse(self, chunks: AsyncIterable[bytes]):
+        reader = _JsonReader(chunks)
+        await reader.expect('{')
+        if await reader.peek() == '}':
+            return
+
+        while True:
+            key = await reader.value()
+            await reader.expect(':')
+            if key == 'results':
+                await reader.expect('[')
+                if await reader.peek() == ']':
+                    await reader.next_char()
+                else:
+                    while True:
+                        yield self._parse_element(await reader.value())
+                        separator = await reader.next_char()
+                        if separator == ']':
+                            break
+                        if separator != ',':
+                            raise ValueError('Expected "," or "]" but found %r in response body' % separator)
+            else:
+                value = await reader.value()
+                if key == 'nextPageLink':
+                    self.next_link = value
+
+            separator = await reader.next_char()
+            if separator == '}':
+                return
+            if separator != ',':
+                raise ValueError('Expected "," or "}" but found %r in response body' % separator)
+
+    def __str__(self):
+        return 'ElementStream(next_link=%s)' % self.next_link
+
+    def __repr__(self):
+        return self.__str__()
@@ -0,0 +1,242 @@
+import asyncio
+import concurrent.futures
+import contextvars
+import threading
+from typing import Iterable, Tuple
+
+from easydb.domain import MultipleElementFields, FilterQuery, TransactionOperation
+from easydb.http import EasydbClient
+from easydb.streaming import ElementStream
+from easydb.transaction import TransactionBuilder
+
+_EXHAUSTED = object()
+
+
+class SyncEasydbClient:
+    def __init__(self, server_url: str, **options):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, name='easydb-client-loop', daemon=True)
+        self._thread.start()
+        self._lock = threading.Lock()
+        self.client = self._call(self._create_client(server_url, options))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        with self._lock:
+            if self._loop.is_closed():
+                return
+            try:
+                self._call(self.client.close())
+            finally:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._thread.join()
+                self._loop.close()
+
+    @property
+    def closed(self):
+        return self._loop.is_closed()
+
+    def create_space(self):
+        return self._call(self.client.create_space())
+
+    def delete_space(self, space_name):
+        return self._call(self.client.delete_space(space_name))
+
+    def get_space(self, space_name):
+        return self._call(self.client.get_space(space_name))
+
+    def create_bucket(self, space_name, bucket_name):
+        return self._call(self.client.create_bucket(space_name, bucket_name))
+
+    def add_element(self, space_name, bucket_name, element_fields: MultipleElementFields):
+        return self._call(self.client.add_element(space_name, bucket_name, element_fields))
+
+    def delete_bucket(self, space_name, bucket_name):
+        return self._call(self.client.delete_bucket(space_name, bucket_name))
+
+    def delete_element(self, space_name, bucket_name, element_id):
+        return self._call(self.client.delete_element(space_name, bucket_name, element_id))
+
+    def update_element(self, space_name, bucket_name, element_id, element_fields: MultipleElementFields):
+        return self._call(self.client.update_element(space_name, bucket_name, element_id, element_fields))
+
+    def get_element(self, space_name, bucket_name, element_id):
+        return self._call(self.client.get_element(space_name, bucket_name, element_id))
+
+    def add_elements(self, space_name, bucket_name, elements_fields: Iterable[MultipleElementFields], concurrency=10):
+        return self._call(self.client.add_elements(space_name, bucket_name, elements_fields, concurrency))
+
+    def get_elements(self, space_name, bucket_name, element_ids: Iterable[str], concurrency=10):
+        return self._call(self.client.get_elements(space_name, bucket_name, element_ids, concurrency))
+
+    def update_elements(self, space_name, bucket_name, updates: Iterable[Tuple[str, MultipleElementFields]],
+                        concurrency=10):
+        return self._call(self.client.update_elements(space_name, bucket_name, updates, concurrency))
+
+    def delete_elements(self, space_name, bucket_name, element_ids: Iterable[str], concurrency=10):
+        return self._call(self.client.delete_elements(space_name, bucket_name, element_ids, concurrency))
+
+    def filter_elements_by_query(self, query: FilterQuery, lazy=False):
+        return self._call(self.client.filter_elements_by_query(query, lazy))
+
+    def filter_elements_by_link(self, link: str, lazy=False):
+        return self._call(self.client.filter_elements_by_link(link, lazy))
+
+    def stream_elements_by_query(self, query: FilterQuery):
+        return SyncElementStream(self, self.client.stream_elements_by_query(query))
+
+    def stream_elements_by_link(self, link: str):
+        return SyncElementStream(self, self.client.stream_elements_by_link(link))
+
+    def iter_elements(self, query: FilterQuery, prefetch=1):
+        return self._iterate(self.client.iter_elements(query, prefetch))
+
+    def scan_bucket(self, space_name: str, bucket_name: str, shard_size=100, concurrency=4, ordered=True,
+                    query=None):
+        return self._iterate(self.client.scan_bucket(space_name, bucket_name, shard_size, concurrency, ordered, query))
+
+    def begin_transaction(self, space_name: str):
+        return self._call(self.client.begin_transaction(space_name))
+
+    def transaction(self, space_name: str, window=8):
+        return SyncTransactionBuilder(self, TransactionBuilder(self.client, space_name, window))
+
+    def run_transaction(self, space_name: str, fn, max_attempts=None, window=8):
+        async def run_in_executor(transaction):
+            return await self._loop.run_in_executor(None, contextvars.copy_context().run, fn,
+                                                    SyncTransactionBuilder(self, transaction))
+
+        return self._call(self.client.run_transaction(space_name, run_in_executor, max_attempts, window))
+
+    def add_operation(self, space_name: str, transaction_id: str, operation: TransactionOperation):
+        return self._call(self.client.add_operation(space_name, transaction_id, operation))
+
+    def commit_transaction(self, space_name, transaction_id):
+        return self._call(self.client.commit_transaction(space_name, transaction_id))
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def _call(self, coroutine):
+        if threading.current_thread() is self._thread:
+            coroutine.close()
+            raise RuntimeError('SyncEasydbClient cannot be called from its own event loop, use client instead')
+        if self._loop.is_closed():
+            coroutine.close()
+            raise RuntimeError('SyncEasydbClient is closed')
+        return self._submit(coroutine).result()
+
+    def _submit(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(self._in_context(contextvars.copy_context(), coroutine), self._loop)
+
+    @staticmethod
+    async def _in_context(context: contextvars.Context, coroutine):
+        for variable, value in context.items():
+            variable.set(value)
+        return await coroutine
+
+    def _iterate(self, async_iterable):
+        iterator = async_iterable.__aiter__()
+        try:
+            while True:
+                element = self._call(self._next(iterator))
+                if element is _EXHAUSTED:
+                    return
+                yield element
+        finally:
+            if hasattr(iterator, 'aclose') and not self._loop.is_closed():
+                self._call(iterator.aclose())
+
+    @staticmethod
+    async def _next(iterator):
+        try:
+            return await iterator.__anext__()
+        except StopAsyncIteration:
+            return _EXHAUSTED
+
+    @staticmethod
+    async def _create_client(server_url, options):
+        return EasydbClient(server_url, **options)
+
+    def __str__(self):
+        return 'SyncEasydbClient(server_url=%s, closed=%s)' % (self.client.server_url, self.closed)
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class SyncElementStream:
+    def __init__(self, sync_client: SyncEasydbClient, stream: ElementStream):
+        self._sync_client = sync_client
+        self._stream = stream
+
+    @property
+    def next_link(self):
+        return self._stream.next_link
+
+    def __iter__(self):
+        return self._sync_client._iterate(self._stream)
+
+    def __str__(self):
+        return 'SyncElementStream(next_link=%s)' % self.next_link
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class SyncTransactionBuilder:
+    def __init__(self, sync_client: SyncEasydbClient, builder: TransactionBuilder):
+        self._sync_client = sync_client
+        self.builder = builder
+        self._submitted = []
+
+    @property
+    def transaction_id(self):
+        return self.builder.transaction_id
+
+    @property
+    def attempt(self):
+        return self.builder.attempt
+
+    @property
+    def results(self):
+        return self.builder.results
+
+    def add_operation(self, operation: TransactionOperation):
+        if self.builder.transaction is None:
+            raise RuntimeError('Transaction has not been started, use "with client.transaction(...)"')
+        self.builder.client._ensure_operation_constraints(operation)
+        submitted = self._sync_client._submit(self._add_operation(operation))
+        self._submitted.append(submitted)
+        return submitted
+
+    def __enter__(self):
+        self._sync_client._call(self.builder.__aenter__())
+        self._submitted = []
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None and self._submitted:
+            concurrent.futures.wait(self._submitted)
+            failed = next((f for f in self._submitted if f.cancelled() or f.exception() is not None), None)
+            if failed is not None:
+                error = concurrent.futures.CancelledError() if failed.cancelled() else failed.exception()
+                self._sync_client._call(self.builder.__aexit__(type(error), error, error.__traceback__))
+                raise error
+        self._sync_client._call(self.builder.__aexit__(exc_type, exc_val, exc_tb))
+
+    async def _add_operation(self, operation: TransactionOperation):
+        return await self.builder.add_operation(operation)
+
+    def __str__(self):
+        return 'SyncTransactionBuilder(space_name=%s, transaction_id=%s, attempt=%d)' % \
+               (self.builder.space_name, self.transaction_id, self.attempt)
+
+    def __repr__(self):
+        return self.__str__()
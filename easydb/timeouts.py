@@ -0,0 +1,56 @@
+import contextlib
+import contextvars
+import time
+
+import aiohttp
+
+_timeout_override = contextvars.ContextVar('easydb_timeout_override', default=None)
+_deadline = contextvars.ContextVar('easydb_deadline', default=None)
+
+
+class Timeout:
+    def __init__(self, total: float = None, connect: float = None, read: float = None):
+        self.total = total
+        self.connect = connect
+        self.read = read
+
+    def to_client_timeout(self, remaining: float = None):
+        total = self.total
+        if remaining is not None:
+            total = remaining if total is None else min(total, remaining)
+        return aiohttp.ClientTimeout(total=total, connect=self.connect, sock_read=self.read)
+
+    def __str__(self):
+        return 'Timeout(total=%s, connect=%s, read=%s)' % (self.total, self.connect, self.read)
+
+    def __repr__(self):
+        return self.__str__()
+
+
+@contextlib.contextmanager
+def request_timeout(total: float = None, connect: float = None, read: float = None):
+    token = _timeout_override.set(Timeout(total, connect, read))
+    try:
+        yield
+    finally:
+        _timeout_override.reset(token)
+
+
+@contextlib.contextmanager
+def deadline(seconds: float):
+    expires_at = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(expires_at if current is None else min(current, expires_at))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def current_timeout():
+    return _timeout_override.get()
+
+
+def remaining_budget():
+    expires_at = _deadline.get()
+    return None if expires_at is None else expires_at - time.monotonic()
@@ -0,0 +1,74 @@
+import asyncio
+
+from easydb.domain import TransactionOperation
+
+
+class TransactionBuilder:
+    def __init__(self, client, space_name: str, window=8, attempt=1):
+        if window < 1:
+            raise ValueError('window must be positive, got %s' % window)
+        self.client = client
+        self.space_name = space_name
+        self.window = window
+        self.attempt = attempt
+        self.transaction = None
+        self.results = None
+        self._semaphore = None
+        self._pending = []
+        self._last_by_element = {}
+
+    @property
+    def transaction_id(self):
+        return self.transaction.transaction_id if self.transaction else None
+
+    def add_operation(self, operation: TransactionOperation):
+        if self.transaction is None:
+            raise RuntimeError('Transaction has not been started, use "async with client.transaction(...)"')
+
+        self.client._ensure_operation_constraints(operation)
+        key = (operation.bucket_name, operation.element_id)
+        previous = self._last_by_element.get(key) if operation.element_id is not None else None
+        pending = asyncio.ensure_future(self._send(operation, previous))
+        if operation.element_id is not None:
+            self._last_by_element[key] = pending
+        self._pending.append(pending)
+        return pending
+
+    async def __aenter__(self):
+        self.transaction = await self.client.begin_transaction(self.space_name)
+        self._semaphore = asyncio.Semaphore(self.window)
+        self._pending = []
+        self._last_by_element = {}
+        self.results = None
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is not None:
+            await self._drop()
+            return
+
+        try:
+            self.results = await asyncio.gather(*self._pending)
+        except BaseException:
+            await self._drop()
+            raise
+        await self.client.commit_transaction(self.space_name, self.transaction_id)
+
+    async def _send(self, operation: TransactionOperation, previous: asyncio.Future = None):
+        if previous is not None:
+            await asyncio.wait([previous])
+        async with self._semaphore:
+            return await self.client.add_operation(self.space_name, self.transaction_id, operation)
+
+    async def _drop(self):
+        for pending in self._pending:
+            pending.cancel()
+        await asyncio.gather(*self._pending, return_exceptions=True)
+        self.client._forget_transaction(self.transaction_id)
+
+    def __str__(self):
+        return 'TransactionBuilder(space_name=%s, transaction_id=%s, window=%d, attempt=%d)' % \
+               (self.space_name, self.transaction_id, self.window, self.attempt)
+
+    def __repr__(self):
+        return self.__str__()
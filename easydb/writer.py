@@ -0,0 +1,160 @@
+import asyncio
+
+from easydb.domain import MultipleElementFields
+
+_FLUSH = object()
+_STOP = object()
+
+
+class ElementWriter:
+    def __init__(self, client, space_name: str, bucket_name: str, batch_size=100, flush_interval=0.1,
+                 max_queue_size=1000, workers=4, concurrency=10):
+        if batch_size < 1 or max_queue_size < 1 or workers < 1 or concurrency < 1:
+            raise ValueError('batch_size, max_queue_size, workers and concurrency must be positive')
+        self.client = client
+        self.space_name = space_name
+        self.bucket_name = bucket_name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue_size = max_queue_size
+        self.workers = workers
+        self.concurrency = concurrency
+        self.written = 0
+        self.failed = 0
+        self.last_error = None
+        self._queue = None
+        self._worker_slots = None
+        self._batcher = None
+        self._writes = set()
+        self._pending = set()
+        self._closed = False
+
+    @property
+    def closed(self):
+        return self._closed
+
+    @property
+    def queued(self):
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def add(self, element_fields: MultipleElementFields):
+        if self._closed:
+            raise RuntimeError('ElementWriter is closed')
+        self._start()
+        future = asyncio.get_event_loop().create_future()
+        await self._queue.put((element_fields, future))
+        self._pending.add(future)
+        future.add_done_callback(self._on_done)
+        return future
+
+    async def flush(self):
+        if self._queue is None:
+            return
+        pending = list(self._pending)
+        if not self._closed:
+            await self._queue.put(_FLUSH)
+        if pending:
+            await asyncio.wait(pending)
+
+    async def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        if self._queue is None:
+            return
+        await self._queue.put(_STOP)
+        await self._batcher
+        leftover = []
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is not _FLUSH and item is not _STOP:
+                leftover.append(item)
+        for start in range(0, len(leftover), self.batch_size):
+            await self._dispatch(leftover[start:start + self.batch_size])
+        if self._writes:
+            await asyncio.wait(list(self._writes))
+
+    async def __aenter__(self):
+        self._start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def _start(self):
+        if self._batcher is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+            self._worker_slots = asyncio.Semaphore(self.workers)
+            self._batcher = asyncio.ensure_future(self._collect_batches())
+
+    async def _collect_batches(self):
+        loop = asyncio.get_event_loop()
+        stopped = False
+        while not stopped:
+            item = await self._queue.get()
+            if item is _STOP:
+                return
+            batch = [] if item is _FLUSH else [item]
+            flush_at = loop.time() + self.flush_interval
+            while batch and len(batch) < self.batch_size:
+                timeout = flush_at - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is _FLUSH:
+                    break
+                if item is _STOP:
+                    stopped = True
+                    break
+                batch.append(item)
+            if batch:
+                await self._dispatch(batch)
+
+    async def _dispatch(self, batch):
+        await self._worker_slots.acquire()
+        write = asyncio.ensure_future(self._write(batch))
+        self._writes.add(write)
+        write.add_done_callback(self._writes.discard)
+
+    async def _write(self, batch):
+        try:
+            results = await self.client.add_elements(self.space_name, self.bucket_name,
+                                                     [element_fields for element_fields, _ in batch],
+                                                     self.concurrency)
+            for (_, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if result.is_failed():
+                    future.set_exception(result.error)
+                else:
+                    future.set_result(result.value)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            self._worker_slots.release()
+            for _, future in batch:
+                if not future.done():
+                    future.cancel()
+
+    def _on_done(self, future: asyncio.Future):
+        self._pending.discard(future)
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is None:
+            self.written += 1
+        else:
+            self.failed += 1
+            self.last_error = error
+
+    def __str__(self):
+        return 'ElementWriter(space_name=%s, bucket_name=%s, queued=%d, written=%d, failed=%d, closed=%s)' % \
+               (self.space_name, self.bucket_name, self.queued, self.written, self.failed, self._closed)
+
+    def __repr__(self):
+        return self.__str__()
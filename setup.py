@@ -27,5 +27,9 @@ setuptools.setup(
         'multidict==4.4.2',
         'yarl==1.2.6'
     ],
+    extras_require={
+        'orjson': ['orjson'],
+        'ujson': ['ujson']
+    },
     test_suite='tests.runner'
 )
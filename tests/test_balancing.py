@@ -0,0 +1,238 @@
+import asyncio
+import unittest
+
+from aioresponses import aioresponses
+
+from easydb import EasydbClient, EndpointPool, LoadBalancingPolicy, RetryPolicy, TransactionOperation, \
+    MultipleElementFields
+from tests.base_test import BaseTest
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class EndpointPoolTests(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def pool(self, strategy='round_robin', **kwargs):
+        return EndpointPool(['http://a/api/v1', 'http://b/api/v1', 'http://c/api/v1'],
+                            LoadBalancingPolicy(strategy, **kwargs), clock=self.clock)
+
+    def test_should_rotate_endpoints(self):
+        # given
+        pool = self.pool()
+
+        # when
+        chosen = [pool.acquire().url for _ in range(4)]
+
+        # then
+        self.assertEqual(chosen, ['http://a/api/v1', 'http://b/api/v1', 'http://c/api/v1', 'http://a/api/v1'])
+
+    def test_should_prefer_endpoint_with_least_outstanding_requests(self):
+        # given
+        pool = self.pool('least_outstanding')
+        a, b, c = pool.endpoints
+        pool.acquire_endpoint(a)
+        pool.acquire_endpoint(c)
+
+        # expect
+        self.assertIs(pool.acquire(), b)
+
+    def test_should_prefer_faster_endpoints(self):
+        # given
+        pool = self.pool('latency_weighted')
+        for endpoint, latency in zip(pool.endpoints, (0.001, 1.0, 1.0)):
+            pool.release(pool.acquire_endpoint(endpoint), latency)
+
+        # when
+        chosen = [pool.acquire() for _ in range(100)]
+
+        # then
+        self.assertGreater(chosen.count(pool.endpoints[0]), 80)
+
+    def test_should_eject_failing_endpoint_and_probe_it_later(self):
+        # given
+        pool = self.pool(max_failures=2, ejection_seconds=10)
+        a, b, c = pool.endpoints
+        for _ in range(2):
+            pool.release(pool.acquire_endpoint(a), failed=True)
+
+        # expect
+        self.assertTrue(a.ejected)
+        self.assertNotIn(a, [pool.acquire() for _ in range(6)])
+
+        # when
+        self.clock.now = 10
+        probes = [pool.acquire() for _ in range(6)]
+
+        # then
+        self.assertEqual(probes.count(a), 1)
+        self.assertTrue(a.probing)
+
+        # when
+        pool.release(a, 0.01)
+
+        # then
+        self.assertFalse(a.ejected)
+        self.assertEqual(a.consecutive_failures, 0)
+
+    def test_should_eject_again_when_probe_fails(self):
+        # given
+        pool = self.pool(max_failures=3, ejection_seconds=10)
+        a = pool.endpoints[0]
+        a.ejected_until = 0
+        pool.acquire_endpoint(a)
+
+        # when
+        pool.release(a, failed=True)
+
+        # then
+        self.assertEqual(a.ejected_until, 10)
+        self.assertFalse(a.probing)
+
+    def test_should_keep_endpoint_ejected_when_probe_is_abandoned(self):
+        # given
+        pool = self.pool(max_failures=2, ejection_seconds=10)
+        a = pool.endpoints[0]
+        for _ in range(2):
+            pool.release(pool.acquire_endpoint(a), failed=True)
+        self.clock.now = 10
+        pool.acquire_endpoint(a)
+
+        # when
+        pool.abandon(a)
+
+        # then
+        self.assertTrue(a.ejected)
+        self.assertEqual((a.consecutive_failures, a.outstanding), (2, 0))
+        self.assertFalse(a.probing)
+
+    def test_should_fail_open_when_all_endpoints_are_ejected(self):
+        # given
+        pool = self.pool()
+        for endpoint, ejected_until in zip(pool.endpoints, (30, 20, 40)):
+            endpoint.ejected_until = ejected_until
+
+        # expect
+        self.assertIs(pool.acquire(), pool.endpoints[1])
+
+    def test_should_rewrite_urls_between_endpoints(self):
+        # given
+        pool = self.pool()
+        a, b, c = pool.endpoints
+
+        # expect
+        self.assertEqual(pool.rewrite('http://a/api/v1/spaces/s?limit=1', c), 'http://c/api/v1/spaces/s?limit=1')
+        self.assertEqual(pool.rewrite('http://other/api/v1/spaces/s', c), 'http://other/api/v1/spaces/s')
+        self.assertIsNone(pool.find('http://a/api/v10/spaces'))
+
+
+class LoadBalancingClientTests(BaseTest):
+    def setUp(self):
+        super().setUp()
+        self.first_url = 'http://localhost:9001'
+        self.second_url = 'http://localhost:9002'
+        self.easydb_client = EasydbClient([self.first_url, self.second_url],
+                                          retry_policy=RetryPolicy(max_attempts=2, backoff_millis=1))
+
+    def tearDown(self):
+        self.loop.run_until_complete(self.easydb_client.close())
+
+    @aioresponses()
+    def test_should_balance_requests_across_endpoints(self, mocked: aioresponses):
+        # given
+        for url in (self.first_url, self.second_url):
+            mocked.get(url + '/api/v1/spaces/exampleSpace', status=200, payload={"spaceName": "exampleSpace"},
+                       repeat=True)
+
+        # when
+        for _ in range(4):
+            self.loop.run_until_complete(self.easydb_client.get_space('exampleSpace'))
+
+        # then
+        self.assertEqual([endpoint.requests for endpoint in self.easydb_client.endpoints.endpoints], [2, 2])
+
+    @aioresponses()
+    def test_should_fail_over_to_another_endpoint(self, mocked: aioresponses):
+        # given
+        mocked.get(self.second_url + '/api/v1/spaces/exampleSpace', status=200, payload={"spaceName": "exampleSpace"})
+
+        # when
+        space = self.loop.run_until_complete(self.easydb_client.get_space('exampleSpace'))
+
+        # then
+        self.assertEqual(space.name, 'exampleSpace')
+        first, second = self.easydb_client.endpoints.endpoints
+        self.assertEqual((first.failures, second.failures), (1, 0))
+
+    @aioresponses()
+    def test_should_follow_next_page_link_on_any_endpoint(self, mocked: aioresponses):
+        # given
+        mocked.get(self.second_url + '/api/v1/spaces/exampleSpace/buckets/users/elements?limit=1&offset=1',
+                   status=200, payload={"results": [], "nextPageLink": None})
+        self.easydb_client.endpoints.acquire()
+
+        # when
+        page = self.loop.run_until_complete(self.easydb_client.filter_elements_by_link(
+            self.first_url + '/api/v1/spaces/exampleSpace/buckets/users/elements?limit=1&offset=1'))
+
+        # then
+        self.assertEqual(page.elements, [])
+
+    @aioresponses()
+    def test_should_pin_transaction_to_endpoint_that_began_it(self, mocked: aioresponses):
+        # given
+        transactions_url = '%s/api/v1/spaces/exampleSpace/transactions'
+        mocked.post(transactions_url % self.second_url, status=201, payload={"transactionId": "exampleTransactionId"})
+        for _ in range(2):
+            mocked.post(transactions_url % self.second_url + '/exampleTransactionId/add-operation', status=200,
+                        payload={"element": None})
+        mocked.post(transactions_url % self.second_url + '/exampleTransactionId/commit', status=202)
+        self.easydb_client.endpoints.acquire()
+
+        async def run():
+            async with self.easydb_client.transaction('exampleSpace') as transaction:
+                for i in range(2):
+                    transaction.add_operation(TransactionOperation(
+                        'CREATE', 'users', fields=MultipleElementFields().add_field('username', 'user%d' % i)))
+
+        # when
+        self.loop.run_until_complete(run())
+
+        # then
+        first, second = self.easydb_client.endpoints.endpoints
+        self.assertEqual((first.requests, second.requests), (1, 4))
+        self.assertIsNone(self.easydb_client.endpoints.pinned('exampleTransactionId'))
+
+    def test_should_keep_endpoint_ejected_when_probe_is_cancelled(self):
+        # given
+        first, second = self.easydb_client.endpoints.endpoints
+        first.ejected_until = 0
+        first.consecutive_failures = 3
+
+        async def hang(request, url, options):
+            await asyncio.sleep(1)
+
+        self.easydb_client._send_to = hang
+
+        # when
+        with self.assertRaises(asyncio.TimeoutError):
+            self.loop.run_until_complete(asyncio.wait_for(self.easydb_client.get_space('exampleSpace'), 0.01))
+
+        # then
+        self.assertEqual((first.requests, first.outstanding), (1, 0))
+        self.assertTrue(first.ejected)
+        self.assertEqual(first.consecutive_failures, 3)
+        self.assertFalse(first.probing)
+
+    def test_should_keep_single_endpoint_client_unbalanced(self):
+        # expect
+        self.assertIsNone(EasydbClient(self.server_url).endpoints)
+        self.assertEqual(EasydbClient(self.server_url, load_balancing=LoadBalancingPolicy()).endpoints.endpoints[0].url,
+                         self.server_url + '/api/v1')
@@ -1,7 +1,7 @@
 from aioresponses import aioresponses
 
 from easydb import EasydbClient, MultipleElementFields, Element, SpaceDoesNotExistException, \
-    BucketDoesNotExistException, ElementDoesNotExistException, FilterQuery, BucketAlreadyExistsException
+    BucketDoesNotExistException, ElementDoesNotExistException, FilterQuery, BucketAlreadyExistsException, LazyElement
 from tests.base_test import BaseTest
 
 
@@ -11,6 +11,9 @@ class BucketTests(BaseTest):
         super().setUp()
         self.easydb_client = EasydbClient(self.server_url)
 
+    def tearDown(self):
+        self.loop.run_until_complete(self.easydb_client.close())
+
     def elements_url(self, space_name, bucket_name=None):
         base_url = "%s/api/v1/spaces/%s/buckets" % (self.server_url, space_name)
         if bucket_name:
@@ -428,6 +431,35 @@ class BucketTests(BaseTest):
         self.assertEqual(paginated_elements.elements,
                          [Element('id1').add_field('firstName', 'Chandler').add_field('lastName', 'Bing')])
 
+    @aioresponses()
+    def test_should_filter_elements_lazily(self, mocked: aioresponses):
+        # given
+        mocked.get(self.elements_url("exampleSpace", "users") + "?limit=20&offset=0", status=200, payload={
+            "nextPageLink": None,
+            "results": [
+                {
+                    "id": "id1",
+                    "fields": [
+                        {
+                            "name": "firstName",
+                            "value": "Chandler"
+                        }
+                    ]
+                }
+            ]
+        })
+
+        # when
+        paginated_elements = self.loop.run_until_complete(
+            self.easydb_client.filter_elements_by_query(FilterQuery('exampleSpace', 'users'), lazy=True))
+
+        # then
+        element = paginated_elements.elements[0]
+        self.assertIsInstance(element, LazyElement)
+        self.assertEqual(element.identifier, 'id1')
+        self.assertFalse(element.materialized)
+        self.assertEqual(element, Element('id1').add_field('firstName', 'Chandler'))
+
     @aioresponses()
     def test_should_throw_error_when_filtering_elements_from_not_existing_space(self, mocked: aioresponses):
         # given
@@ -0,0 +1,78 @@
+from aioresponses import aioresponses
+
+from easydb import EasydbClient, MultipleElementFields, Element, ElementDoesNotExistException, BulkResult
+from tests.base_test import BaseTest
+
+
+class BulkTests(BaseTest):
+    def setUp(self):
+        super().setUp()
+        self.easydb_client = EasydbClient(self.server_url)
+
+    def tearDown(self):
+        self.loop.run_until_complete(self.easydb_client.close())
+
+    def elements_url(self, space_name, bucket_name, element_id=None):
+        base_url = "%s/api/v1/spaces/%s/buckets/%s/elements" % (self.server_url, space_name, bucket_name)
+        if element_id:
+            base_url += "/" + element_id
+        return base_url
+
+    @staticmethod
+    def element_payload(element_id):
+        return {"id": element_id, "fields": [{"name": "name", "value": element_id}]}
+
+    @aioresponses()
+    def test_should_add_elements(self, mocked: aioresponses):
+        # given
+        for element_id in ['id1', 'id2', 'id3']:
+            mocked.post(self.elements_url("exampleSpace", "users"), status=201,
+                        payload=self.element_payload(element_id))
+
+        # when
+        results = self.loop.run_until_complete(self.easydb_client.add_elements(
+            'exampleSpace', 'users', [MultipleElementFields().add_field('name', 'any') for _ in range(3)],
+            concurrency=1))
+
+        # then
+        self.assertEqual(results, [BulkResult(Element(element_id).add_field('name', element_id))
+                                   for element_id in ['id1', 'id2', 'id3']])
+
+    @aioresponses()
+    def test_should_get_elements_preserving_order_and_reporting_failures(self, mocked: aioresponses):
+        # given
+        mocked.get(self.elements_url("exampleSpace", "users", "id1"), status=200, payload=self.element_payload('id1'))
+        mocked.get(self.elements_url("exampleSpace", "users", "notExistingElement"), status=404, payload={
+            "errorCode": "ELEMENT_DOES_NOT_EXIST",
+            "status": "NOT_FOUND",
+            "message": "Element with id notExistingElement does not exist in bucket users"
+        })
+        mocked.get(self.elements_url("exampleSpace", "users", "id3"), status=200, payload=self.element_payload('id3'))
+
+        # when
+        results = self.loop.run_until_complete(self.easydb_client.get_elements(
+            'exampleSpace', 'users', ['id1', 'notExistingElement', 'id3'], concurrency=3))
+
+        # then
+        self.assertEqual([result.is_failed() for result in results], [False, True, False])
+        self.assertEqual(results[0].value, Element('id1').add_field('name', 'id1'))
+        self.assertIsInstance(results[1].error, ElementDoesNotExistException)
+        self.assertEqual(results[2].value, Element('id3').add_field('name', 'id3'))
+
+    @aioresponses()
+    def test_should_update_and_delete_elements(self, mocked: aioresponses):
+        # given
+        mocked.put(self.elements_url("exampleSpace", "users", "id1"), status=200)
+        mocked.put(self.elements_url("exampleSpace", "users", "id2"), status=200)
+        mocked.delete(self.elements_url("exampleSpace", "users", "id1"), status=200)
+
+        # when
+        updated = self.loop.run_until_complete(self.easydb_client.update_elements(
+            'exampleSpace', 'users', [('id1', MultipleElementFields().add_field('name', 'Mirek')),
+                                      ('id2', MultipleElementFields().add_field('name', 'Heniek'))]))
+        deleted = self.loop.run_until_complete(self.easydb_client.delete_elements('exampleSpace', 'users', ['id1']))
+
+        # then
+        self.assertFalse(any(result.is_failed() for result in updated + deleted))
+        self.assertEqual(len(updated), 2)
+        self.assertEqual(len(deleted), 1)
@@ -0,0 +1,245 @@
+import asyncio
+import unittest
+
+from aioresponses import aioresponses
+
+from easydb import EasydbClient, ElementCache, Element, MultipleElementFields, TransactionOperation, \
+    FakeEasydbServer
+from easydb.domain import TransactionAbortedException
+from tests.base_test import BaseTest
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class ElementCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = ElementCache(max_size=2, ttl_seconds=10, clock=self.clock)
+
+    def test_should_evict_least_recently_used_element(self):
+        # given
+        self.cache.put('exampleSpace', 'users', Element('id1'))
+        self.cache.put('exampleSpace', 'users', Element('id2'))
+        self.cache.get('exampleSpace', 'users', 'id1')
+
+        # when
+        self.cache.put('exampleSpace', 'users', Element('id3'))
+
+        # then
+        self.assertEqual(self.cache.get('exampleSpace', 'users', 'id1'), Element('id1'))
+        self.assertIsNone(self.cache.get('exampleSpace', 'users', 'id2'))
+        self.assertEqual(self.cache.get('exampleSpace', 'users', 'id3'), Element('id3'))
+
+    def test_should_expire_elements_after_ttl(self):
+        # given
+        self.cache.put('exampleSpace', 'users', Element('id1'))
+
+        # when
+        self.clock.now = 10
+
+        # then
+        self.assertIsNone(self.cache.get('exampleSpace', 'users', 'id1'))
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 1))
+
+    def test_should_invalidate_whole_bucket_and_space(self):
+        # given
+        self.cache = ElementCache(max_size=10, clock=self.clock)
+        self.cache.put('exampleSpace', 'users', Element('id1'))
+        self.cache.put('exampleSpace', 'groups', Element('id2'))
+        self.cache.put('otherSpace', 'users', Element('id3'))
+
+        # when
+        self.cache.invalidate_bucket('exampleSpace', 'users')
+
+        # then
+        self.assertEqual(len(self.cache), 2)
+
+        # and when
+        self.cache.invalidate_space('exampleSpace')
+
+        # then
+        self.assertEqual(len(self.cache), 1)
+        self.assertEqual(self.cache.get('otherSpace', 'users', 'id3'), Element('id3'))
+
+    def test_should_not_share_cached_elements_with_callers(self):
+        # given
+        element = Element('id1').add_field('username', 'Heniek')
+        self.cache.put('exampleSpace', 'users', element)
+
+        # when
+        element.add_field('age', '22')
+        self.cache.get('exampleSpace', 'users', 'id1').add_field('age', '23')
+
+        # then
+        self.assertEqual(self.cache.get('exampleSpace', 'users', 'id1'), Element('id1').add_field('username', 'Heniek'))
+
+    def test_should_skip_put_of_element_invalidated_since_read_started(self):
+        # given
+        generation = self.cache.generation('exampleSpace', 'users', 'id1')
+        self.cache.invalidate_bucket('exampleSpace', 'users')
+
+        # when
+        self.cache.put('exampleSpace', 'users', Element('id1'), generation)
+
+        # then
+        self.assertEqual(len(self.cache), 0)
+
+        # and when
+        self.cache.put('exampleSpace', 'users', Element('id1'),
+                       self.cache.generation('exampleSpace', 'users', 'id1'))
+
+        # then
+        self.assertEqual(len(self.cache), 1)
+
+    def test_should_skip_stale_put_after_generations_are_forgotten(self):
+        # given
+        generation = self.cache.generation('exampleSpace', 'users', 'id1')
+        for i in range(3):
+            self.cache.invalidate('exampleSpace', 'users', 'id%d' % i)
+
+        # when
+        self.cache.put('exampleSpace', 'users', Element('id1'), generation)
+
+        # then
+        self.assertEqual(len(self.cache), 0)
+
+
+class SlowReadServer(FakeEasydbServer):
+    async def send(self, request):
+        response = await super().send(request)
+        if request.method == 'GET':
+            await asyncio.sleep(0.01)
+        return response
+
+
+class CachingClientTests(BaseTest):
+    def setUp(self):
+        super().setUp()
+        self.element_cache = ElementCache()
+        self.easydb_client = EasydbClient(self.server_url, retries_number=0, element_cache=self.element_cache)
+
+    def tearDown(self):
+        self.loop.run_until_complete(self.easydb_client.close())
+
+    def element_url(self, element_id):
+        return "%s/api/v1/spaces/exampleSpace/buckets/users/elements/%s" % (self.server_url, element_id)
+
+    def transactions_url(self, transaction_id=None):
+        base_url = "%s/api/v1/spaces/exampleSpace/transactions" % self.server_url
+        if transaction_id:
+            base_url += "/" + transaction_id
+        return base_url
+
+    def mock_get_element(self, mocked, element_id, username):
+        mocked.get(self.element_url(element_id), status=200, payload={
+            "id": element_id,
+            "fields": [{"name": "username", "value": username}]
+        })
+
+    def get_element(self, element_id):
+        return self.loop.run_until_complete(self.easydb_client.get_element('exampleSpace', 'users', element_id))
+
+    @aioresponses()
+    def test_should_serve_repeated_reads_from_cache(self, mocked: aioresponses):
+        # given
+        self.mock_get_element(mocked, 'id1', 'Heniek')
+
+        # when
+        first = self.get_element('id1')
+        second = self.get_element('id1')
+
+        # then
+        self.assertEqual(first, Element('id1').add_field('username', 'Heniek'))
+        self.assertEqual(second, first)
+        self.assertEqual((self.element_cache.hits, self.element_cache.misses), (1, 1))
+
+    @aioresponses()
+    def test_should_invalidate_element_on_update(self, mocked: aioresponses):
+        # given
+        self.mock_get_element(mocked, 'id1', 'Heniek')
+        mocked.put(self.element_url('id1'), status=200)
+        self.mock_get_element(mocked, 'id1', 'Mirek')
+        self.get_element('id1')
+
+        # when
+        self.loop.run_until_complete(self.easydb_client.update_element(
+            'exampleSpace', 'users', 'id1', MultipleElementFields().add_field('username', 'Mirek')))
+
+        # then
+        self.assertEqual(self.get_element('id1'), Element('id1').add_field('username', 'Mirek'))
+
+    @aioresponses()
+    def test_should_invalidate_elements_touched_by_committed_transaction(self, mocked: aioresponses):
+        # given
+        self.mock_get_element(mocked, 'id1', 'Heniek')
+        mocked.post(self.transactions_url(), status=201, payload={"transactionId": "exampleTransactionId"})
+        mocked.post(self.transactions_url('exampleTransactionId') + '/add-operation', status=200,
+                    payload={"element": None})
+        mocked.post(self.transactions_url('exampleTransactionId') + '/commit', status=202)
+        self.get_element('id1')
+
+        async def update_element():
+            async with self.easydb_client.transaction('exampleSpace') as transaction:
+                transaction.add_operation(TransactionOperation(
+                    'UPDATE', 'users', 'id1', MultipleElementFields().add_field('username', 'Mirek')))
+
+        # when
+        self.loop.run_until_complete(update_element())
+
+        # then
+        self.assertEqual(len(self.element_cache), 0)
+
+    def test_should_not_cache_element_updated_while_read_was_in_flight(self):
+        # given
+        easydb_client = EasydbClient(self.server_url, element_cache=self.element_cache, transport=SlowReadServer())
+
+        async def read_during_update():
+            space_name = await easydb_client.create_space()
+            await easydb_client.create_bucket(space_name, 'users')
+            element = await easydb_client.add_element(space_name, 'users',
+                                                      MultipleElementFields().add_field('username', 'old'))
+            read = asyncio.ensure_future(easydb_client.get_element(space_name, 'users', element.identifier))
+            await asyncio.sleep(0)
+            await easydb_client.update_element(space_name, 'users', element.identifier,
+                                               MultipleElementFields().add_field('username', 'new'))
+            stale = await read
+            fresh = await easydb_client.get_element(space_name, 'users', element.identifier)
+            return stale, fresh
+
+        # when
+        stale, fresh = self.loop.run_until_complete(read_during_update())
+
+        # then
+        self.assertEqual(stale.get('username'), 'old')
+        self.assertEqual(fresh.get('username'), 'new')
+
+    def test_should_forget_elements_touched_by_aborted_transaction(self):
+        # given
+        server = FakeEasydbServer()
+        easydb_client = EasydbClient(self.server_url, retries_number=0, element_cache=self.element_cache,
+                                     transport=server)
+
+        async def abort_transaction():
+            space_name = await easydb_client.create_space()
+            await easydb_client.create_bucket(space_name, 'users')
+            element = await easydb_client.add_element(space_name, 'users',
+                                                      MultipleElementFields().add_field('username', 'Heniek'))
+            transaction = await easydb_client.begin_transaction(space_name)
+            operation = TransactionOperation('UPDATE', 'users', element.identifier,
+                                             MultipleElementFields().add_field('username', 'Mirek'))
+            await easydb_client.add_operation(space_name, transaction.transaction_id, operation)
+            server.abort_transaction(transaction.transaction_id)
+            await easydb_client.add_operation(space_name, transaction.transaction_id, operation)
+
+        # when
+        with self.assertRaises(TransactionAbortedException):
+            self.loop.run_until_complete(abort_transaction())
+
+        # then
+        self.assertEqual(easydb_client._transaction_elements, {})
@@ -0,0 +1,209 @@
+import unittest
+
+from aioresponses import aioresponses
+
+from easydb import EasydbClient, CircuitBreaker, CircuitBreakerPolicy, CircuitOpenException, RetryPolicy, FilterQuery
+from easydb.domain import UnknownError
+from tests.base_test import BaseTest
+from tests.test_balancing import FakeClock
+
+
+class CircuitBreakerTests(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker('http://localhost:9000/api/v1', CircuitBreakerPolicy(
+            failure_rate_threshold=0.5, slow_call_rate_threshold=0.5, slow_call_seconds=1.0, window_size=4,
+            minimum_calls=4, open_seconds=10, half_open_calls=2), clock=self.clock)
+
+    def call(self, duration=0.01, failed=False):
+        self.breaker.acquire()
+        self.breaker.record(duration, failed)
+
+    def test_should_open_when_failure_rate_exceeds_threshold(self):
+        # when
+        for failed in (False, True, False, True):
+            self.call(failed=failed)
+
+        # then
+        self.assertEqual(self.breaker.state, 'open')
+        with self.assertRaises(CircuitOpenException) as raised:
+            self.breaker.acquire()
+        self.assertEqual(raised.exception.retry_after, 10)
+        self.assertEqual(self.breaker.rejected, 1)
+
+    def test_should_open_when_slow_call_rate_exceeds_threshold(self):
+        # when
+        for duration in (0.1, 2.0, 0.1, 3.0):
+            self.call(duration)
+
+        # then
+        self.assertEqual(self.breaker.state, 'open')
+
+    def test_should_stay_closed_below_minimum_calls(self):
+        # when
+        for _ in range(3):
+            self.call(failed=True)
+
+        # then
+        self.assertEqual(self.breaker.state, 'closed')
+
+    def test_should_close_after_successful_trial_calls(self):
+        # given
+        for _ in range(4):
+            self.call(failed=True)
+        self.clock.now = 10
+
+        # when
+        self.breaker.acquire()
+        self.breaker.acquire()
+
+        # then
+        self.assertEqual(self.breaker.state, 'half_open')
+        with self.assertRaises(CircuitOpenException):
+            self.breaker.acquire()
+
+        # when
+        self.breaker.record(0.01)
+        self.breaker.record(0.01)
+
+        # then
+        self.assertEqual(self.breaker.state, 'closed')
+
+    def test_should_reopen_when_trial_call_fails(self):
+        # given
+        for _ in range(4):
+            self.call(failed=True)
+        self.clock.now = 10
+
+        # when
+        self.call(failed=True)
+
+        # then
+        self.assertEqual(self.breaker.state, 'open')
+        self.assertEqual(self.breaker.opened, 2)
+
+
+class CircuitBreakerClientTests(BaseTest):
+    def setUp(self):
+        super().setUp()
+        self.policy = CircuitBreakerPolicy(window_size=2, minimum_calls=2, open_seconds=60)
+
+    @aioresponses()
+    def test_should_fail_fast_while_circuit_is_open(self, mocked: aioresponses):
+        # given
+        easydb_client = EasydbClient(self.server_url, retry_policy=RetryPolicy(max_attempts=1),
+                                     circuit_breaker=self.policy)
+        mocked.get(self.server_url + '/api/v1/spaces/exampleSpace', status=500, repeat=True)
+        for _ in range(2):
+            with self.assertRaises(UnknownError):
+                self.loop.run_until_complete(easydb_client.get_space('exampleSpace'))
+
+        # when
+        with self.assertRaises(CircuitOpenException):
+            self.loop.run_until_complete(easydb_client.get_space('exampleSpace'))
+
+        # then
+        self.assertEqual(easydb_client.circuit_breaker().state, 'open')
+        self.assertEqual(easydb_client.circuit_breaker(self.server_url).rejected, 1)
+        self.assertEqual(sum(len(calls) for calls in mocked.requests.values()), 2)
+        self.loop.run_until_complete(easydb_client.close())
+
+    @aioresponses()
+    def test_should_route_around_endpoint_with_open_circuit(self, mocked: aioresponses):
+        # given
+        first_url, second_url = 'http://localhost:9001', 'http://localhost:9002'
+        easydb_client = EasydbClient([first_url, second_url], retry_policy=RetryPolicy(max_attempts=1),
+                                     circuit_breaker=self.policy)
+        mocked.get(second_url + '/api/v1/spaces/exampleSpace', status=200, payload={"spaceName": "exampleSpace"},
+                   repeat=True)
+        breaker = easydb_client.circuit_breaker(first_url)
+        breaker.record(0.01, failed=True)
+        breaker.record(0.01, failed=True)
+
+        # when
+        for _ in range(4):
+            self.loop.run_until_complete(easydb_client.get_space('exampleSpace'))
+
+        # then
+        first, second = easydb_client.endpoints.endpoints
+        self.assertEqual((first.requests, second.requests), (0, 4))
+        self.assertEqual(first.failures, 0)
+        self.loop.run_until_complete(easydb_client.close())
+
+    @aioresponses()
+    def test_should_guard_streamed_responses(self, mocked: aioresponses):
+        # given
+        easydb_client = EasydbClient(self.server_url, retry_policy=RetryPolicy(max_attempts=1),
+                                     circuit_breaker=self.policy)
+        mocked.get(self.server_url + '/api/v1/spaces/exampleSpace/buckets/users/elements?limit=2&offset=0',
+                   status=500, repeat=True)
+
+        async def stream():
+            return [element async for element in easydb_client.stream_elements_by_query(
+                FilterQuery('exampleSpace', 'users', limit=2))]
+
+        for _ in range(2):
+            with self.assertRaises(UnknownError):
+                self.loop.run_until_complete(stream())
+
+        # when
+        with self.assertRaises(CircuitOpenException):
+            self.loop.run_until_complete(stream())
+
+        # then
+        self.assertEqual(easydb_client.circuit_breaker().state, 'open')
+        self.assertEqual(sum(len(calls) for calls in mocked.requests.values()), 2)
+        self.loop.run_until_complete(easydb_client.close())
+
+    @aioresponses()
+    def test_should_route_streams_around_endpoint_with_open_circuit(self, mocked: aioresponses):
+        # given
+        first_url, second_url = 'http://localhost:9001', 'http://localhost:9002'
+        easydb_client = EasydbClient([first_url, second_url], retry_policy=RetryPolicy(max_attempts=1),
+                                     circuit_breaker=self.policy)
+        mocked.get(second_url + '/api/v1/spaces/exampleSpace/buckets/users/elements?limit=2&offset=0', status=200,
+                   payload={"results": [], "nextPageLink": None}, repeat=True)
+        breaker = easydb_client.circuit_breaker(first_url)
+        breaker.record(0.01, failed=True)
+        breaker.record(0.01, failed=True)
+
+        async def stream():
+            return [element async for element in easydb_client.stream_elements_by_query(
+                FilterQuery('exampleSpace', 'users', limit=2))]
+
+        # when
+        for _ in range(4):
+            self.loop.run_until_complete(stream())
+
+        # then
+        first, second = easydb_client.endpoints.endpoints
+        self.assertEqual((first.requests, second.requests), (0, 4))
+        self.assertEqual((first.outstanding, second.outstanding), (0, 0))
+        self.loop.run_until_complete(easydb_client.close())
+
+    def test_should_keep_endpoint_ejected_when_circuit_rejects_call(self):
+        # given
+        first_url, second_url = 'http://localhost:9001', 'http://localhost:9002'
+        easydb_client = EasydbClient([first_url, second_url], retry_policy=RetryPolicy(max_attempts=1),
+                                     circuit_breaker=self.policy)
+        for url in (first_url, second_url):
+            breaker = easydb_client.circuit_breaker(url)
+            breaker.record(0.01, failed=True)
+            breaker.record(0.01, failed=True)
+        first, second = easydb_client.endpoints.endpoints
+        first.ejected_until = 0
+        first.consecutive_failures = 3
+
+        # when
+        with self.assertRaises(CircuitOpenException):
+            self.loop.run_until_complete(easydb_client.get_space('exampleSpace'))
+
+        # then
+        self.assertEqual((first.requests, first.outstanding), (1, 0))
+        self.assertTrue(first.ejected)
+        self.assertEqual(first.consecutive_failures, 3)
+        self.loop.run_until_complete(easydb_client.close())
+
+    def test_should_disable_circuit_breaker_by_default(self):
+        # expect
+        self.assertIsNone(EasydbClient(self.server_url).circuit_breaker())
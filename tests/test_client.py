@@ -0,0 +1,58 @@
+from aioresponses import aioresponses
+
+from easydb import EasydbClient
+from tests.base_test import BaseTest
+
+
+class ClientTests(BaseTest):
+    def setUp(self):
+        super().setUp()
+        self.easydb_client = EasydbClient(self.server_url)
+        self.spaces_url = self.server_url + '/api/v1/spaces'
+
+    def tearDown(self):
+        self.loop.run_until_complete(self.easydb_client.close())
+
+    @aioresponses()
+    def test_should_reuse_session_between_requests(self, mocked: aioresponses):
+        # given
+        mocked.get(self.spaces_url + '/exampleSpace', status=200, payload=dict(spaceName='exampleSpace'))
+        mocked.get(self.spaces_url + '/exampleSpace', status=200, payload=dict(spaceName='exampleSpace'))
+
+        # when
+        self.loop.run_until_complete(self.easydb_client.get_space('exampleSpace'))
+        session = self.easydb_client._session
+        self.loop.run_until_complete(self.easydb_client.get_space('exampleSpace'))
+
+        # then
+        self.assertIs(self.easydb_client._session, session)
+
+    def test_should_configure_connection_pool(self):
+        # given
+        easydb_client = EasydbClient(self.server_url, connection_limit=10, connection_limit_per_host=5,
+                                     keepalive_timeout=30, dns_cache_ttl=60)
+
+        # when
+        connector = self.loop.run_until_complete(easydb_client.__aenter__())._session.connector
+
+        # then
+        self.assertEqual(connector.limit, 10)
+        self.assertEqual(connector.limit_per_host, 5)
+        self.loop.run_until_complete(easydb_client.close())
+
+    @aioresponses()
+    def test_should_close_session_when_leaving_context(self, mocked: aioresponses):
+        # given
+        mocked.post(self.spaces_url, status=201, payload=dict(spaceName='exampleSpace'))
+
+        async def create_space():
+            async with EasydbClient(self.server_url) as easydb_client:
+                await easydb_client.create_space()
+                self.assertFalse(easydb_client.closed)
+            return easydb_client
+
+        # when
+        easydb_client = self.loop.run_until_complete(create_space())
+
+        # then
+        self.assertTrue(easydb_client.closed)
@@ -0,0 +1,76 @@
+import json
+import unittest
+
+from aioresponses import aioresponses
+from yarl import URL
+
+from easydb import EasydbClient, JsonCodec, MultipleElementFields, Element, RetryPolicy
+from easydb.codec import default_codec, orjson, ujson, OrjsonCodec, UjsonCodec
+from tests.base_test import BaseTest
+
+
+class RecordingCodec(JsonCodec):
+    def __init__(self):
+        self.encoded = 0
+        self.decoded = 0
+
+    def encode(self, data):
+        self.encoded += 1
+        return super().encode(data)
+
+    def decode(self, body):
+        self.decoded += 1
+        return super().decode(body)
+
+
+class CodecTests(unittest.TestCase):
+    def test_should_round_trip_element_body_with_every_available_codec(self):
+        # given
+        data = MultipleElementFields().add_field('username', 'Zażółć').add_field('age', '30')._as_json()
+        codecs = [JsonCodec()] + ([OrjsonCodec()] if orjson else []) + ([UjsonCodec()] if ujson else [])
+
+        # expect
+        for codec in codecs:
+            body = codec.encode(data)
+            self.assertIsInstance(body, bytes)
+            self.assertEqual(json.loads(body.decode('utf-8')), data)
+            self.assertEqual(codec.decode(body), data)
+
+    def test_should_prefer_fastest_available_codec(self):
+        # when
+        codec = default_codec()
+
+        # then
+        expected = 'orjson' if orjson else 'ujson' if ujson else 'json'
+        self.assertEqual(codec.name, expected)
+
+
+class ClientCodecTests(BaseTest):
+    def setUp(self):
+        super().setUp()
+        self.codec = RecordingCodec()
+        self.easydb_client = EasydbClient(self.server_url, codec=self.codec, retry_policy=RetryPolicy(
+            max_attempts=2, backoff_millis=1, retry_non_idempotent=True))
+
+    def tearDown(self):
+        self.loop.run_until_complete(self.easydb_client.close())
+
+    @aioresponses()
+    def test_should_encode_body_once_and_decode_response_with_codec(self, mocked: aioresponses):
+        # given
+        url = self.server_url + '/api/v1/spaces/exampleSpace/buckets/users/elements'
+        mocked.post(url, status=503)
+        mocked.post(url, status=201, payload={"id": "id1", "fields": [{"name": "username", "value": "Heniek"}]})
+
+        # when
+        element = self.loop.run_until_complete(self.easydb_client.add_element(
+            'exampleSpace', 'users', MultipleElementFields().add_field('username', 'Heniek')))
+
+        # then
+        self.assertEqual(element, Element('id1').add_field('username', 'Heniek'))
+        self.assertEqual(self.codec.encoded, 1)
+        self.assertEqual(self.codec.decoded, 1)
+        sent = mocked.requests[('POST', URL(url))]
+        self.assertEqual(len(sent), 2)
+        self.assertEqual(sent[0].kwargs['data'], b'{"fields":[{"name":"username","value":"Heniek"}]}')
+        self.assertEqual(sent[0].kwargs['headers'], {'Content-Type': 'application/json'})
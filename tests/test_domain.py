@@ -0,0 +1,99 @@
+import unittest
+
+from easydb import Element, ElementField, MultipleElementFields, PaginatedElements, OperationResult, LazyElement
+
+
+class DomainTests(unittest.TestCase):
+    def test_should_not_allocate_instance_dict_for_parsed_values(self):
+        # given
+        values = [ElementField('username', 'Heniek'), MultipleElementFields(), Element('id1'), PaginatedElements(),
+                  OperationResult(None)]
+
+        # expect
+        for value in values:
+            self.assertFalse(hasattr(value, '__dict__'), value)
+
+    def test_should_keep_element_behaviour(self):
+        # given
+        element = Element('id1').add_field('username', 'Heniek')
+
+        # expect
+        self.assertEqual(element, Element('id1', [ElementField('username', 'Heniek')]))
+        self.assertEqual(element.fields, [ElementField('username', 'Heniek')])
+        self.assertEqual(str(element), 'Element(identifier=id1, fields=[ {username = Heniek} ])')
+
+    def test_should_look_up_element_fields_by_name(self):
+        # given
+        element = Element('id1').add_field('firstName', 'Chandler').add_field('lastName', 'Bing')
+
+        # expect
+        self.assertEqual(element['firstName'], 'Chandler')
+        self.assertEqual(element.get('lastName'), 'Bing')
+        self.assertIsNone(element.get('age'))
+        self.assertEqual(element.get('age', 30), 30)
+        self.assertIn('firstName', element)
+        self.assertNotIn('age', element)
+        with self.assertRaises(KeyError):
+            element['age']
+
+    def test_should_index_fields_added_after_lookup(self):
+        # given
+        element = Element('id1').add_field('firstName', 'Chandler')
+        element.get('firstName')
+
+        # when
+        element.add_field('lastName', 'Bing')
+        element.fields.append(ElementField('age', 30))
+
+        # then
+        self.assertEqual(element['lastName'], 'Bing')
+        self.assertEqual(element['age'], 30)
+
+    def test_should_see_fields_replaced_in_place_after_lookup(self):
+        # given
+        element = Element('id1').add_field('a', '1').add_field('c', '3')
+        element.get('a')
+
+        # when
+        element.fields[0] = ElementField('a', '2')
+        element.fields.pop()
+        element.fields.append(ElementField('b', '4'))
+
+        # then
+        self.assertEqual(element['a'], '2')
+        self.assertIn('b', element)
+        self.assertNotIn('c', element)
+
+    def test_should_compare_fields_regardless_of_order(self):
+        # given
+        first = Element('id1').add_field('firstName', 'Chandler').add_field('lastName', 'Bing')
+        second = Element('id1').add_field('lastName', 'Bing').add_field('firstName', 'Chandler')
+
+        # expect
+        self.assertEqual(first, second)
+        self.assertEqual(hash(first), hash(second))
+        self.assertNotEqual(first, Element('id1').add_field('lastName', 'Bing').add_field('lastName', 'Bing'))
+
+    def test_should_read_lazy_element_fields_without_materializing(self):
+        # given
+        element = LazyElement('id1', [{'name': 'firstName', 'value': 'Chandler'}, {'name': 'lastName', 'value': 'Bing'}])
+
+        # expect
+        self.assertEqual(element.identifier, 'id1')
+        self.assertEqual(element['lastName'], 'Bing')
+        self.assertEqual(element.get('age', 30), 30)
+        self.assertIn('firstName', element)
+        self.assertFalse(element.materialized)
+
+    def test_should_materialize_lazy_element_fields_on_first_access(self):
+        # given
+        element = LazyElement('id1', [{'name': 'firstName', 'value': 'Chandler'}])
+
+        # when
+        fields = element.fields
+
+        # then
+        self.assertTrue(element.materialized)
+        self.assertEqual(fields, [ElementField('firstName', 'Chandler')])
+        self.assertEqual(element, Element('id1').add_field('firstName', 'Chandler'))
+        self.assertEqual(element['firstName'], 'Chandler')
@@ -0,0 +1,169 @@
+import asyncio
+
+from aiohttp.test_utils import TestServer
+
+from easydb import EasydbClient, FakeEasydbServer, FilterQuery, MultipleElementFields, TransactionOperation, \
+    ElementDoesNotExistException, SpaceDoesNotExistException, BucketAlreadyExistsException, deadline, \
+    DeadlineExceededException
+from easydb.domain import TransactionAbortedException
+from tests.base_test import BaseTest
+
+
+class FakeEasydbServerTests(BaseTest):
+    def setUp(self):
+        super().setUp()
+        self.server = FakeEasydbServer()
+        self.easydb_client = EasydbClient(self.server_url, retry_backoff_millis=1, transport=self.server)
+        self.space_name = self.loop.run_until_complete(self.easydb_client.create_space())
+        self.loop.run_until_complete(self.easydb_client.create_bucket(self.space_name, 'users'))
+
+    def tearDown(self):
+        self.loop.run_until_complete(self.easydb_client.close())
+
+    def add_users(self, count):
+        return self.loop.run_until_complete(self.easydb_client.add_elements(
+            self.space_name, 'users', [MultipleElementFields().add_field('username', 'user%d' % i)
+                                       for i in range(count)]))
+
+    def test_should_store_and_update_elements(self):
+        # given
+        element = self.loop.run_until_complete(self.easydb_client.add_element(
+            self.space_name, 'users', MultipleElementFields().add_field('username', 'Heniek')))
+
+        # when
+        self.loop.run_until_complete(self.easydb_client.update_element(
+            self.space_name, 'users', element.identifier, MultipleElementFields().add_field('username', 'Zdzichu')))
+        updated = self.loop.run_until_complete(self.easydb_client.get_element(
+            self.space_name, 'users', element.identifier))
+
+        # then
+        self.assertEqual(updated.get('username'), 'Zdzichu')
+        self.assertEqual(self.server.requests, 5)
+
+    def test_should_report_easydb_errors(self):
+        # expect
+        with self.assertRaises(ElementDoesNotExistException):
+            self.loop.run_until_complete(self.easydb_client.get_element(self.space_name, 'users', 'notExisting'))
+        with self.assertRaises(SpaceDoesNotExistException):
+            self.loop.run_until_complete(self.easydb_client.get_space('notExistingSpace'))
+        with self.assertRaises(BucketAlreadyExistsException):
+            self.loop.run_until_complete(self.easydb_client.create_bucket(self.space_name, 'users'))
+
+    def test_should_paginate_with_next_page_links(self):
+        # given
+        self.add_users(45)
+
+        async def iterate():
+            elements = [element async for element in self.easydb_client.iter_elements(
+                FilterQuery(self.space_name, 'users', limit=10))]
+            streamed = [element async for element in self.easydb_client.stream_elements_by_query(
+                FilterQuery(self.space_name, 'users', limit=10, offset=40))]
+            return elements, streamed
+
+        # when
+        elements, streamed = self.loop.run_until_complete(iterate())
+
+        # then
+        self.assertEqual([e.get('username') for e in elements], ['user%d' % i for i in range(45)])
+        self.assertEqual([e.get('username') for e in streamed], ['user%d' % i for i in range(40, 45)])
+
+    def test_should_apply_transaction_operations_on_commit(self):
+        # given
+        first, second = [result.value for result in self.add_users(2)]
+
+        async def run():
+            async with self.easydb_client.transaction(self.space_name) as transaction:
+                transaction.add_operation(TransactionOperation(
+                    'UPDATE', 'users', first.identifier, MultipleElementFields().add_field('username', 'updated')))
+                transaction.add_operation(TransactionOperation('DELETE', 'users', second.identifier))
+                self.assertEqual(len(self.server.spaces[self.space_name]['users']), 2)
+            return await self.easydb_client.filter_elements_by_query(FilterQuery(self.space_name, 'users'))
+
+        # when
+        page = self.loop.run_until_complete(run())
+
+        # then
+        self.assertEqual([(e.identifier, e.get('username')) for e in page.elements], [(first.identifier, 'updated')])
+
+    def test_should_abort_conflicting_transactions(self):
+        # given
+        element = self.add_users(1)[0].value
+        update = TransactionOperation('UPDATE', 'users', element.identifier,
+                                      MultipleElementFields().add_field('username', 'updated'))
+
+        async def run():
+            first = await self.easydb_client.begin_transaction(self.space_name)
+            second = await self.easydb_client.begin_transaction(self.space_name)
+            await self.easydb_client.add_operation(self.space_name, first.transaction_id, update)
+            await self.easydb_client.add_operation(self.space_name, second.transaction_id, update)
+            await self.easydb_client.commit_transaction(self.space_name, first.transaction_id)
+            await self.easydb_client.commit_transaction(self.space_name, second.transaction_id)
+
+        # expect
+        with self.assertRaises(TransactionAbortedException):
+            self.loop.run_until_complete(run())
+        self.assertEqual([t.aborted for t in self.server.transactions.values()], [True])
+
+    def test_should_retry_aborted_transaction(self):
+        # given
+        attempts = []
+
+        async def fn(transaction):
+            attempts.append(transaction.attempt)
+            transaction.add_operation(TransactionOperation(
+                'CREATE', 'users', fields=MultipleElementFields().add_field('username', 'Heniek')))
+            if transaction.attempt == 1:
+                self.server.abort_transaction(transaction.transaction_id)
+
+        requests = self.server.requests
+
+        # when
+        self.loop.run_until_complete(self.easydb_client.run_transaction(self.space_name, fn))
+
+        # then
+        self.assertEqual(attempts, [1, 2])
+        self.assertEqual(len(self.server.spaces[self.space_name]['users']), 1)
+        self.assertEqual(self.server.requests - requests, 5)
+
+    def test_should_bound_transport_calls_by_deadline(self):
+        # given
+        async def slow_send(request):
+            await asyncio.sleep(1)
+
+        self.server.send = slow_send
+        started = self.loop.time()
+
+        # when
+        with self.assertRaises(DeadlineExceededException):
+            with deadline(0.05):
+                self.loop.run_until_complete(self.easydb_client.get_space(self.space_name))
+
+        # then
+        self.assertLess(self.loop.time() - started, 0.5)
+
+    def test_should_serve_easydb_api_over_http(self):
+        # given
+        test_server = TestServer(self.server.app(), loop=self.loop)
+        self.loop.run_until_complete(test_server.start_server())
+        http_client = EasydbClient(str(test_server.make_url('')).rstrip('/'))
+        self.add_users(3)
+
+        async def run():
+            async with http_client:
+                page = await http_client.filter_elements_by_query(FilterQuery(self.space_name, 'users', limit=2))
+                next_page = await http_client.filter_elements_by_link(page.next_link)
+                streamed = [element async for element in http_client.stream_elements_by_query(
+                    FilterQuery(self.space_name, 'users'))]
+                return page, next_page, streamed
+
+        # when
+        try:
+            page, next_page, streamed = self.loop.run_until_complete(run())
+        finally:
+            self.loop.run_until_complete(test_server.close())
+
+        # then
+        self.assertEqual(len(page.elements), 2)
+        self.assertEqual([e.get('username') for e in next_page.elements], ['user2'])
+        self.assertIsNone(next_page.next_link)
+        self.assertEqual(len(streamed), 3)
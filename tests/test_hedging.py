@@ -0,0 +1,160 @@
+import asyncio
+import gc
+import unittest
+
+from easydb import EasydbClient, RequestHedger, MultipleElementFields
+from easydb.http import ResponseData
+from tests.base_test import BaseTest
+
+
+class SlowFirstAttemptClient(EasydbClient):
+    def __init__(self, *args, delays=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.delays = list(delays)
+        self.sent = []
+        self.cancelled = []
+
+    async def _send_to(self, request, url, options):
+        self.sent.append(url)
+        try:
+            await asyncio.sleep(self.delays.pop(0) if self.delays else 0)
+        except asyncio.CancelledError:
+            self.cancelled.append(url)
+            raise
+        if request.method == 'POST':
+            return ResponseData(201, {"id": "id1", "fields": []})
+        return ResponseData(200, {'spaceName': 'exampleSpace', 'source': url})
+
+
+class FailingPrimaryClient(EasydbClient):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sent = 0
+        self.hedge_sent = asyncio.Event()
+
+    async def _send_to(self, request, url, options):
+        self.sent += 1
+        if self.sent % 2:
+            await self.hedge_sent.wait()
+            raise ConnectionResetError('primary failed')
+        self.hedge_sent.set()
+        return ResponseData(200, {'spaceName': 'exampleSpace'})
+
+
+class RequestHedgerTests(unittest.TestCase):
+    def test_should_derive_delay_from_observed_latencies(self):
+        # given
+        hedger = RequestHedger(quantile=0.9, min_samples=10)
+        for latency in range(1, 10):
+            hedger.observe(latency / 1000)
+
+        # expect
+        self.assertIsNone(hedger.delay())
+
+        # when
+        hedger.observe(0.5)
+
+        # then
+        self.assertEqual(hedger.delay(), 0.5)
+
+    def test_should_cap_hedges_with_budget(self):
+        # given
+        hedger = RequestHedger(budget_ratio=0.25, max_tokens=1)
+        hedger.try_hedge()
+
+        # when
+        allowed = []
+        for _ in range(8):
+            hedger.start()
+            allowed.append(hedger.try_hedge())
+
+        # then
+        self.assertEqual(allowed, [False, False, False, True] * 2)
+        self.assertEqual((hedger.hedged, hedger.throttled), (3, 6))
+
+
+class HedgingTests(BaseTest):
+    def test_should_take_hedged_response_and_cancel_slow_one(self):
+        # given
+        hedger = RequestHedger(delay_seconds=0.01)
+        easydb_client = SlowFirstAttemptClient(self.server_url, hedging=hedger, delays=[1.0, 0])
+
+        # when
+        space = self.loop.run_until_complete(easydb_client.get_space('exampleSpace'))
+
+        # then
+        self.assertEqual(space.name, 'exampleSpace')
+        self.assertEqual(len(easydb_client.sent), 2)
+        self.assertEqual(len(easydb_client.cancelled), 1)
+        self.assertEqual((hedger.hedged, hedger.won), (1, 1))
+
+    def test_should_not_hedge_fast_responses(self):
+        # given
+        hedger = RequestHedger(delay_seconds=0.5)
+        easydb_client = SlowFirstAttemptClient(self.server_url, hedging=hedger)
+
+        # when
+        self.loop.run_until_complete(easydb_client.get_space('exampleSpace'))
+
+        # then
+        self.assertEqual(len(easydb_client.sent), 1)
+        self.assertEqual(hedger.hedged, 0)
+
+    def test_should_never_hedge_writes(self):
+        # given
+        hedger = RequestHedger(delay_seconds=0)
+        easydb_client = SlowFirstAttemptClient(self.server_url, hedging=hedger, delays=[0.05])
+
+        # when
+        self.loop.run_until_complete(easydb_client.add_element(
+            'exampleSpace', 'users', MultipleElementFields().add_field('username', 'Heniek')))
+
+        # then
+        self.assertEqual(len(easydb_client.sent), 1)
+        self.assertEqual(hedger.requests, 0)
+
+    def test_should_send_hedge_to_another_endpoint(self):
+        # given
+        first_url, second_url = 'http://localhost:9001', 'http://localhost:9002'
+        easydb_client = SlowFirstAttemptClient([first_url, second_url], hedging=RequestHedger(delay_seconds=0.01),
+                                               delays=[1.0, 0])
+
+        # when
+        self.loop.run_until_complete(easydb_client.get_space('exampleSpace'))
+
+        # then
+        self.assertEqual(easydb_client.sent, [first_url + '/api/v1/spaces/exampleSpace',
+                                              second_url + '/api/v1/spaces/exampleSpace'])
+        first, second = easydb_client.endpoints.endpoints
+        self.assertEqual((first.outstanding, second.outstanding), (0, 0))
+        self.assertEqual(first.failures, 0)
+
+    def test_should_derive_delay_from_primary_attempt_when_hedge_wins(self):
+        # given
+        hedger = RequestHedger(quantile=0.5, min_samples=1)
+        hedger.observe(0.05)
+        easydb_client = SlowFirstAttemptClient(self.server_url, hedging=hedger, delays=[1.0, 0])
+
+        # when
+        self.loop.run_until_complete(easydb_client.get_space('exampleSpace'))
+
+        # then
+        self.assertEqual(hedger.won, 1)
+        self.assertGreaterEqual(hedger.delay(), 0.05)
+
+    def test_should_retrieve_exceptions_of_losing_attempts(self):
+        # given
+        errors = []
+        self.loop.set_exception_handler(lambda loop, context: errors.append(context))
+        self.addCleanup(self.loop.set_exception_handler, None)
+        easydb_client = FailingPrimaryClient(self.server_url, retries_number=0,
+                                             hedging=RequestHedger(delay_seconds=0))
+
+        # when
+        for _ in range(10):
+            easydb_client.hedge_sent.clear()
+            self.loop.run_until_complete(easydb_client.get_space('exampleSpace'))
+        gc.collect()
+
+        # then
+        self.assertEqual(errors, [])
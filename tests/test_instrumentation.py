@@ -0,0 +1,121 @@
+import unittest
+
+from aioresponses import aioresponses
+
+from easydb import EasydbClient, InMemoryCollector, Instrumentation, MultipleElementFields, \
+    SpaceDoesNotExistException, RequestLimiter, RetryPolicy
+from easydb.instrumentation import url_template, Histogram
+from tests.base_test import BaseTest
+
+
+class RecordingInstrumentation(Instrumentation):
+    def __init__(self):
+        self.recorded = []
+
+    def on_request(self, metrics):
+        self.recorded.append(metrics)
+
+
+class UrlTemplateTests(unittest.TestCase):
+    def test_should_replace_path_parameters_with_placeholders(self):
+        # expect
+        for url, expected in [
+            ('http://localhost:9000/api/v1/spaces', '/spaces'),
+            ('http://localhost:9000/api/v1/spaces/exampleSpace', '/spaces/{space}'),
+            ('http://localhost:9000/api/v1/spaces/s/buckets/users/elements/id1',
+             '/spaces/{space}/buckets/{bucket}/elements/{element}'),
+            ('http://localhost:9000/api/v1/spaces/s/buckets/users/elements?limit=2&offset=0',
+             '/spaces/{space}/buckets/{bucket}/elements'),
+            ('http://localhost:9000/api/v1/spaces/s/transactions/t1/add-operation',
+             '/spaces/{space}/transactions/{transaction}/add-operation'),
+        ]:
+            self.assertEqual(url_template(url), expected)
+
+    def test_should_estimate_quantiles_from_buckets(self):
+        # given
+        histogram = Histogram(buckets=(0.1, 0.2, 0.5))
+        for value in [0.05] * 90 + [0.15] * 5 + [0.4] * 4 + [3.0]:
+            histogram.observe(value)
+
+        # expect
+        self.assertEqual(histogram.quantile(0.5), 0.1)
+        self.assertEqual(histogram.quantile(0.95), 0.2)
+        self.assertEqual(histogram.quantile(0.99), 0.5)
+        self.assertEqual(histogram.quantile(1.0), float('inf'))
+
+
+class InstrumentationTests(BaseTest):
+    def setUp(self):
+        super().setUp()
+        self.instrumentation = RecordingInstrumentation()
+        self.easydb_client = EasydbClient(self.server_url, retry_policy=RetryPolicy(
+            max_attempts=3, backoff_millis=1, retry_non_idempotent=True), instrumentation=self.instrumentation,
+            limiter=RequestLimiter(10))
+
+    def tearDown(self):
+        self.loop.run_until_complete(self.easydb_client.close())
+
+    @aioresponses()
+    def test_should_record_request_metrics(self, mocked: aioresponses):
+        # given
+        url = self.server_url + '/api/v1/spaces/exampleSpace/buckets/users/elements'
+        mocked.post(url, status=503)
+        mocked.post(url, status=201, payload={"id": "id1", "fields": [{"name": "username", "value": "Heniek"}]})
+
+        # when
+        self.loop.run_until_complete(self.easydb_client.add_element(
+            'exampleSpace', 'users', MultipleElementFields().add_field('username', 'Heniek')))
+
+        # then
+        metrics, = self.instrumentation.recorded
+        self.assertEqual(metrics.method, 'POST')
+        self.assertEqual(metrics.url_template, '/spaces/{space}/buckets/{bucket}/elements')
+        self.assertEqual(metrics.status, 201)
+        self.assertEqual(metrics.retries, 1)
+        self.assertGreater(metrics.bytes_out, 0)
+        self.assertGreater(metrics.bytes_in, 0)
+        self.assertGreaterEqual(metrics.total_seconds, metrics.server_seconds + metrics.parse_seconds)
+
+    @aioresponses()
+    def test_should_record_error_code(self, mocked: aioresponses):
+        # given
+        mocked.get(self.server_url + '/api/v1/spaces/notExistingSpace', status=404, payload={
+            "errorCode": "SPACE_DOES_NOT_EXIST",
+            "status": "NOT_FOUND",
+            "message": "Space notExistingSpace doues not exist"
+        })
+
+        # when
+        with self.assertRaises(SpaceDoesNotExistException):
+            self.loop.run_until_complete(self.easydb_client.get_space('notExistingSpace'))
+
+        # then
+        metrics, = self.instrumentation.recorded
+        self.assertEqual((metrics.status, metrics.error_code), (404, 'SPACE_DOES_NOT_EXIST'))
+
+
+class InMemoryCollectorTests(BaseTest):
+    @aioresponses()
+    def test_should_export_metrics_in_prometheus_text_format(self, mocked: aioresponses):
+        # given
+        collector = InMemoryCollector(buckets=(0.5, 1.0))
+        easydb_client = EasydbClient(self.server_url, instrumentation=collector)
+        mocked.get(self.server_url + '/api/v1/spaces/exampleSpace', status=200, payload={"spaceName": "exampleSpace"})
+        mocked.get(self.server_url + '/api/v1/spaces/otherSpace', status=200, payload={"spaceName": "otherSpace"})
+
+        # when
+        self.loop.run_until_complete(easydb_client.get_space('exampleSpace'))
+        self.loop.run_until_complete(easydb_client.get_space('otherSpace'))
+        self.loop.run_until_complete(easydb_client.close())
+        exported = collector.render_prometheus()
+
+        # then
+        self.assertIn('# TYPE easydb_client_request_duration_seconds histogram', exported)
+        self.assertIn('easydb_client_request_duration_seconds_bucket{method="GET",route="/spaces/{space}",le="+Inf"} 2',
+                      exported)
+        self.assertIn('easydb_client_request_duration_seconds_count{method="GET",route="/spaces/{space}"} 2', exported)
+        self.assertIn('easydb_client_request_phase_seconds_count{method="GET",route="/spaces/{space}",phase="server"} 2',
+                      exported)
+        self.assertIn('easydb_client_requests_total{method="GET",route="/spaces/{space}",status="200",error=""} 2',
+                      exported)
+        self.assertIn('easydb_client_retries_total{method="GET",route="/spaces/{space}"} 0', exported)
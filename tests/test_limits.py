@@ -0,0 +1,169 @@
+import asyncio
+import time
+
+from easydb import EasydbClient, RequestLimiter, TokenBucket, AdaptiveConcurrencyLimiter
+from easydb.domain import UnknownError
+from easydb.http import ResponseData
+from tests.base_test import BaseTest
+
+
+class ConcurrencyRecordingClient(EasydbClient):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.in_flight = {}
+        self.max_in_flight = {}
+
+    async def _send(self, request):
+        space_name = request.space_name
+        for key in (None, space_name):
+            self.in_flight[key] = self.in_flight.get(key, 0) + 1
+            self.max_in_flight[key] = max(self.max_in_flight.get(key, 0), self.in_flight[key])
+        await asyncio.sleep(0.01)
+        for key in (None, space_name):
+            self.in_flight[key] -= 1
+        return ResponseData(200, {'spaceName': space_name})
+
+
+class LimitsTests(BaseTest):
+    def gather(self, calls):
+        async def gather():
+            return await asyncio.gather(*calls)
+
+        return self.loop.run_until_complete(gather())
+
+    def test_should_bound_global_concurrency(self):
+        # given
+        limiter = RequestLimiter(max_concurrency=3)
+        easydb_client = ConcurrencyRecordingClient(self.server_url, limiter=limiter)
+
+        # when
+        self.gather([easydb_client.get_space('space%d' % (i % 4)) for i in range(20)])
+
+        # then
+        self.assertEqual(easydb_client.max_in_flight[None], 3)
+        self.assertEqual(limiter.acquisitions, 20)
+        self.assertEqual(limiter.in_flight, 0)
+        self.assertGreater(limiter.total_wait_seconds, 0)
+        self.assertGreaterEqual(limiter.max_wait_seconds, limiter.average_wait_seconds)
+
+    def test_should_bound_concurrency_per_space(self):
+        # given
+        easydb_client = ConcurrencyRecordingClient(
+            self.server_url, limiter=RequestLimiter(max_concurrency_per_space=2))
+
+        # when
+        self.gather([easydb_client.get_space('space%d' % (i % 2)) for i in range(12)])
+
+        # then
+        self.assertEqual(easydb_client.max_in_flight['space0'], 2)
+        self.assertEqual(easydb_client.max_in_flight['space1'], 2)
+        self.assertEqual(easydb_client.max_in_flight[None], 4)
+
+    def test_should_release_slots_when_request_fails(self):
+        # given
+        limiter = RequestLimiter(max_concurrency=1, max_concurrency_per_space=1)
+        easydb_client = ConcurrencyRecordingClient(self.server_url, limiter=limiter, retries_number=0)
+
+        async def failing_send(request):
+            raise ValueError('boom')
+
+        easydb_client._send = failing_send
+
+        # when
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                self.loop.run_until_complete(easydb_client.get_space('exampleSpace'))
+
+        # then
+        self.assertEqual(limiter.in_flight, 0)
+        self.assertEqual(limiter.acquisitions, 2)
+
+    def test_should_limit_request_rate(self):
+        # given
+        token_bucket = TokenBucket(rate=100, burst=1)
+
+        async def acquire_all():
+            for _ in range(6):
+                await token_bucket.acquire()
+
+        # when
+        started = time.monotonic()
+        self.loop.run_until_complete(acquire_all())
+
+        # then
+        self.assertGreaterEqual(time.monotonic() - started, 0.045)
+
+    def test_should_grow_adaptive_limit_while_latency_stays_flat(self):
+        # given
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=4)
+        easydb_client = ConcurrencyRecordingClient(self.server_url, limiter=limiter)
+
+        # when
+        self.gather([easydb_client.get_space('exampleSpace') for _ in range(40)])
+
+        # then
+        self.assertEqual(limiter.limit, 4)
+        self.assertEqual(easydb_client.max_in_flight[None], 4)
+        self.assertEqual(limiter.in_flight, 0)
+
+    def test_should_back_off_adaptive_limit_on_overload(self):
+        # given
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=16, min_limit=2)
+        easydb_client = EasydbClient(self.server_url, limiter=limiter, retry_backoff_millis=1, retries_number=2)
+
+        async def overloaded_send(request):
+            return ResponseData(503, {})
+
+        easydb_client._send = overloaded_send
+
+        # when
+        with self.assertRaises(UnknownError):
+            self.loop.run_until_complete(easydb_client.get_space('exampleSpace'))
+
+        # then
+        self.assertLess(limiter.limit, 16)
+        self.assertGreaterEqual(limiter.limit, 2)
+        self.assertEqual(limiter.in_flight, 0)
+
+    def test_should_back_off_adaptive_limit_at_most_once_per_latency_interval(self):
+        # given
+        clock = [0.0]
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=16, clock=lambda: clock[0])
+        self.loop.run_until_complete(limiter.acquire())
+        limiter.release(latency=1.0)
+
+        # when
+        for _ in range(3):
+            self.loop.run_until_complete(limiter.acquire())
+            limiter.release(overloaded=True)
+
+        # then
+        self.assertAlmostEqual(limiter.limit, (16 + 1 / 16) / 2)
+
+        # and when
+        clock[0] = 1.0
+        self.loop.run_until_complete(limiter.acquire())
+        limiter.release(overloaded=True)
+
+        # then
+        self.assertAlmostEqual(limiter.limit, (16 + 1 / 16) / 4)
+
+    def test_should_cancel_adaptive_waiter_released_before_it_resumes(self):
+        # given
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1)
+        self.loop.run_until_complete(limiter.acquire())
+
+        async def cancel_then_release():
+            waiting = asyncio.ensure_future(limiter.acquire())
+            await asyncio.sleep(0)
+            waiting.cancel()
+            limiter.release()
+            await asyncio.wait([waiting])
+            return waiting
+
+        # when
+        waiting = self.loop.run_until_complete(cancel_then_release())
+
+        # then
+        self.assertTrue(waiting.cancelled())
+        self.assertEqual((limiter.in_flight, limiter.waiting), (0, 0))
@@ -0,0 +1,156 @@
+import asyncio
+import unittest
+from unittest import mock
+
+import aiohttp
+from aioresponses import aioresponses
+
+from easydb import EasydbClient, RetryPolicy, TransactionOperation, FakeEasydbServer, MultipleElementFields
+from easydb.domain import TransactionAbortedException, UnknownError
+from easydb.http import ResponseData
+from tests.base_test import BaseTest
+
+
+class LostReplyServer(FakeEasydbServer):
+    async def send(self, request):
+        response = await super().send(request)
+        if request.method == 'POST' and request.url.endswith('/elements'):
+            return ResponseData(503, {})
+        return response
+
+
+class RetryTests(BaseTest):
+    def setUp(self):
+        super().setUp()
+        self.easydb_client = EasydbClient(self.server_url, retry_policy=RetryPolicy(max_attempts=3, backoff_millis=1))
+
+    def tearDown(self):
+        self.loop.run_until_complete(self.easydb_client.close())
+
+    def add_operation_url(self, space_name, transaction_id):
+        return "%s/api/v1/spaces/%s/transactions/%s/add-operation" % (self.server_url, space_name, transaction_id)
+
+    @staticmethod
+    def aborted_payload():
+        return {
+            "errorCode": "TRANSACTION_ABORTED",
+            "status": "TRANSACTION_ABORTED",
+            "message": "Transaction was aborted. Possible many conflicting transactions running at the same time. Try later again"
+        }
+
+    @aioresponses()
+    def test_should_not_retry_aborted_transaction_operation(self, mocked: aioresponses):
+        # given
+        mocked.post(self.add_operation_url('users', 'exampleTransactionId'), status=409, payload=self.aborted_payload(),
+                    repeat=True)
+
+        # when
+        with self.assertRaises(TransactionAbortedException):
+            self.loop.run_until_complete(self.easydb_client.add_operation(
+                'users', 'exampleTransactionId', TransactionOperation('DELETE', 'users', 'exampleElementId')))
+
+        # then
+        self.assertEqual(sum(len(calls) for calls in mocked.requests.values()), 1)
+
+    @aioresponses()
+    def test_should_retry_server_errors(self, mocked: aioresponses):
+        # given
+        mocked.get(self.server_url + '/api/v1/spaces/exampleSpace', status=503)
+        mocked.get(self.server_url + '/api/v1/spaces/exampleSpace', status=200, payload={"spaceName": "exampleSpace"})
+
+        # when
+        space = self.loop.run_until_complete(self.easydb_client.get_space('exampleSpace'))
+
+        # then
+        self.assertEqual(space.name, 'exampleSpace')
+
+    @aioresponses()
+    def test_should_retry_server_errors_without_json_body(self, mocked: aioresponses):
+        # given
+        mocked.get(self.server_url + '/api/v1/spaces/exampleSpace', status=503, content_type='text/html',
+                   body='<html><body>Service Unavailable</body></html>')
+        mocked.get(self.server_url + '/api/v1/spaces/exampleSpace', status=502, body='Bad Gateway')
+        mocked.get(self.server_url + '/api/v1/spaces/exampleSpace', status=200, payload={"spaceName": "exampleSpace"})
+
+        # when
+        space = self.loop.run_until_complete(self.easydb_client.get_space('exampleSpace'))
+
+        # then
+        self.assertEqual(space.name, 'exampleSpace')
+
+    @aioresponses()
+    def test_should_give_up_after_max_attempts(self, mocked: aioresponses):
+        # given
+        for _ in range(3):
+            mocked.get(self.server_url + '/api/v1/spaces/exampleSpace', status=503)
+        mocked.get(self.server_url + '/api/v1/spaces/exampleSpace', status=200, payload={"spaceName": "exampleSpace"})
+
+        # expect
+        with self.assertRaises(UnknownError):
+            self.loop.run_until_complete(self.easydb_client.get_space('exampleSpace'))
+
+    def test_should_not_retry_writes_that_may_have_been_applied(self):
+        # given
+        server = LostReplyServer()
+        easydb_client = EasydbClient(self.server_url, retry_policy=RetryPolicy(max_attempts=3, backoff_millis=1),
+                                     transport=server)
+        space_name = self.loop.run_until_complete(easydb_client.create_space())
+        self.loop.run_until_complete(easydb_client.create_bucket(space_name, 'users'))
+
+        # when
+        with self.assertRaises(UnknownError):
+            self.loop.run_until_complete(easydb_client.add_element(
+                space_name, 'users', MultipleElementFields().add_field('username', 'Heniek')))
+
+        # then
+        self.assertEqual(len(server.spaces[space_name]['users']), 1)
+
+    @aioresponses()
+    def test_should_not_retry_client_errors(self, mocked: aioresponses):
+        # given
+        mocked.get(self.server_url + '/api/v1/spaces/exampleSpace', status=400)
+        mocked.get(self.server_url + '/api/v1/spaces/exampleSpace', status=200, payload={"spaceName": "exampleSpace"})
+
+        # expect
+        with self.assertRaises(UnknownError):
+            self.loop.run_until_complete(self.easydb_client.get_space('exampleSpace'))
+
+
+class RetryPolicyTests(unittest.TestCase):
+    def test_should_retry_non_idempotent_requests_only_when_not_sent(self):
+        # given
+        policy = RetryPolicy()
+        not_connected = aiohttp.ClientConnectorError(mock.Mock(), OSError(111, 'Connection refused'))
+
+        # expect
+        self.assertTrue(policy.should_retry_error(not_connected, idempotent=False))
+        self.assertFalse(policy.should_retry_error(aiohttp.ServerDisconnectedError(), idempotent=False))
+        self.assertFalse(policy.should_retry_error(asyncio.TimeoutError(), idempotent=False))
+        self.assertFalse(policy.should_retry_response(ResponseData(503, {}), idempotent=False))
+        self.assertTrue(policy.should_retry_error(asyncio.TimeoutError()))
+        self.assertTrue(policy.should_retry_response(ResponseData(503, {})))
+
+    def test_should_retry_non_idempotent_requests_when_enabled(self):
+        # given
+        policy = RetryPolicy(retry_non_idempotent=True)
+
+        # expect
+        self.assertTrue(policy.should_retry_error(aiohttp.ServerDisconnectedError(), idempotent=False))
+        self.assertTrue(policy.should_retry_response(ResponseData(503, {}), idempotent=False))
+
+    def test_should_use_full_jitter_exponential_backoff(self):
+        # given
+        policy = RetryPolicy(backoff_millis=100, max_backoff_millis=1000)
+
+        # expect
+        for attempt, ceiling in [(1, 0.1), (2, 0.2), (3, 0.4), (5, 1.0), (10, 1.0)]:
+            for _ in range(50):
+                self.assertTrue(0 <= policy.backoff(attempt) <= ceiling)
+
+    def test_should_build_default_policy_from_client_arguments(self):
+        # when
+        easydb_client = EasydbClient('http://localhost:9000', retry_backoff_millis=50, retries_number=2)
+
+        # then
+        self.assertEqual(easydb_client.retry_policy.max_attempts, 3)
+        self.assertEqual(easydb_client.retry_policy.backoff_millis, 50)
@@ -0,0 +1,109 @@
+from aioresponses import aioresponses
+
+from easydb import EasydbClient, Element, FilterQuery, SpaceDoesNotExistException
+from tests.base_test import BaseTest
+
+
+class ScanningTests(BaseTest):
+    def setUp(self):
+        super().setUp()
+        self.easydb_client = EasydbClient(self.server_url)
+
+    def tearDown(self):
+        self.loop.run_until_complete(self.easydb_client.close())
+
+    def elements_url(self, space_name, bucket_name):
+        return "%s/api/v1/spaces/%s/buckets/%s/elements" % (self.server_url, space_name, bucket_name)
+
+    @staticmethod
+    def page_payload(element_ids, next_link=None):
+        return {
+            "nextPageLink": next_link,
+            "results": [{"id": element_id, "fields": [{"name": "name", "value": element_id}]}
+                        for element_id in element_ids]
+        }
+
+    @staticmethod
+    def expected_elements(element_ids):
+        return [Element(element_id).add_field('name', element_id) for element_id in element_ids]
+
+    def collect(self, async_iterable):
+        async def collect():
+            return [element async for element in async_iterable]
+
+        return self.loop.run_until_complete(collect())
+
+    @aioresponses()
+    def test_should_iterate_elements_across_pages(self, mocked: aioresponses):
+        # given
+        url = self.elements_url("exampleSpace", "users")
+        mocked.get(url + "?limit=2&offset=0", status=200,
+                   payload=self.page_payload(['id1', 'id2'], url + "?limit=2&offset=2"))
+        mocked.get(url + "?limit=2&offset=2", status=200,
+                   payload=self.page_payload(['id3', 'id4'], url + "?limit=2&offset=4"))
+        mocked.get(url + "?limit=2&offset=4", status=200, payload=self.page_payload(['id5']))
+
+        # when
+        elements = self.collect(self.easydb_client.iter_elements(FilterQuery('exampleSpace', 'users', limit=2),
+                                                                 prefetch=2))
+
+        # then
+        self.assertEqual(elements, self.expected_elements(['id1', 'id2', 'id3', 'id4', 'id5']))
+
+    @aioresponses()
+    def test_should_propagate_error_when_iterating_elements(self, mocked: aioresponses):
+        # given
+        mocked.get(self.elements_url("notExistingSpace", "users") + "?limit=20&offset=0", status=404, payload={
+            "errorCode": "SPACE_DOES_NOT_EXIST",
+            "status": "NOT_FOUND",
+            "message": "Space notExistingSpace doues not exist"
+        })
+
+        # expect
+        with self.assertRaises(SpaceDoesNotExistException):
+            self.collect(self.easydb_client.iter_elements(FilterQuery('notExistingSpace', 'users')))
+
+    def test_should_reject_non_positive_prefetch(self):
+        # expect
+        with self.assertRaises(ValueError):
+            self.collect(self.easydb_client.iter_elements(FilterQuery('exampleSpace', 'users'), prefetch=0))
+
+    @aioresponses()
+    def test_should_scan_bucket_in_order(self, mocked: aioresponses):
+        # given
+        self.mock_windows(mocked, [['id1', 'id2'], ['id3', 'id4'], ['id5'], []])
+
+        # when
+        elements = self.collect(self.easydb_client.scan_bucket('exampleSpace', 'users', shard_size=2, concurrency=3))
+
+        # then
+        self.assertEqual(elements, self.expected_elements(['id1', 'id2', 'id3', 'id4', 'id5']))
+
+    @aioresponses()
+    def test_should_scan_bucket_unordered(self, mocked: aioresponses):
+        # given
+        self.mock_windows(mocked, [['id1', 'id2'], ['id3', 'id4'], ['id5'], []])
+
+        # when
+        elements = self.collect(self.easydb_client.scan_bucket('exampleSpace', 'users', shard_size=2, concurrency=3,
+                                                               ordered=False))
+
+        # then
+        self.assertEqual(sorted(elements, key=lambda element: element.identifier),
+                         self.expected_elements(['id1', 'id2', 'id3', 'id4', 'id5']))
+
+    @aioresponses()
+    def test_should_stop_scan_on_empty_first_window(self, mocked: aioresponses):
+        # given
+        self.mock_windows(mocked, [[], []])
+
+        # when
+        elements = self.collect(self.easydb_client.scan_bucket('exampleSpace', 'users', shard_size=2, concurrency=2))
+
+        # then
+        self.assertEqual(elements, [])
+
+    def mock_windows(self, mocked, windows):
+        url = self.elements_url("exampleSpace", "users")
+        for index, element_ids in enumerate(windows):
+            mocked.get(url + "?limit=2&offset=%d" % (index * 2), status=200, payload=self.page_payload(element_ids))
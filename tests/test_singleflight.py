@@ -0,0 +1,119 @@
+import asyncio
+
+from aioresponses import aioresponses
+
+from easydb import EasydbClient, Element, FilterQuery, SpaceDoesNotExistException, FakeEasydbServer, \
+    MultipleElementFields
+from tests.base_test import BaseTest
+
+
+class SlowReadServer(FakeEasydbServer):
+    async def send(self, request):
+        response = await super().send(request)
+        if request.method == 'GET':
+            await asyncio.sleep(0.01)
+        return response
+
+
+class SingleFlightTests(BaseTest):
+    def setUp(self):
+        super().setUp()
+        self.easydb_client = EasydbClient(self.server_url, retries_number=0, coalesce_reads=True)
+
+    def tearDown(self):
+        self.loop.run_until_complete(self.easydb_client.close())
+
+    def gather(self, *calls):
+        async def gather():
+            return await asyncio.gather(*calls, return_exceptions=True)
+
+        return self.loop.run_until_complete(gather())
+
+    @aioresponses()
+    def test_should_share_single_request_between_concurrent_identical_reads(self, mocked: aioresponses):
+        # given
+        mocked.get(self.server_url + '/api/v1/spaces/exampleSpace/buckets/users/elements/id1', status=200, payload={
+            "id": "id1",
+            "fields": [{"name": "username", "value": "Heniek"}]
+        })
+
+        # when
+        results = self.gather(*[self.easydb_client.get_element('exampleSpace', 'users', 'id1') for _ in range(5)])
+
+        # then
+        self.assertEqual(results, [Element('id1').add_field('username', 'Heniek')] * 5)
+        self.assertEqual(self.easydb_client.single_flight.coalesced, 4)
+        self.assertEqual(len(self.easydb_client.single_flight), 0)
+
+    @aioresponses()
+    def test_should_share_errors_between_concurrent_identical_reads(self, mocked: aioresponses):
+        # given
+        mocked.get(self.server_url + '/api/v1/spaces/notExistingSpace', status=404, payload={
+            "errorCode": "SPACE_DOES_NOT_EXIST",
+            "status": "NOT_FOUND",
+            "message": "Space notExistingSpace doues not exist"
+        })
+
+        # when
+        results = self.gather(*[self.easydb_client.get_space('notExistingSpace') for _ in range(3)])
+
+        # then
+        self.assertTrue(all(isinstance(result, SpaceDoesNotExistException) for result in results))
+
+    @aioresponses()
+    def test_should_not_share_requests_with_different_arguments(self, mocked: aioresponses):
+        # given
+        url = self.server_url + '/api/v1/spaces/exampleSpace/buckets/users/elements'
+        mocked.get(url + '?limit=1&offset=0', status=200, payload={"nextPageLink": None, "results": []})
+        mocked.get(url + '?limit=1&offset=1', status=200, payload={"nextPageLink": None, "results": []})
+
+        # when
+        results = self.gather(
+            self.easydb_client.filter_elements_by_query(FilterQuery('exampleSpace', 'users', limit=1, offset=0)),
+            self.easydb_client.filter_elements_by_query(FilterQuery('exampleSpace', 'users', limit=1, offset=1)))
+
+        # then
+        self.assertEqual([len(result.elements) for result in results], [0, 0])
+        self.assertEqual(self.easydb_client.single_flight.coalesced, 0)
+
+    def test_should_not_join_reads_started_before_own_write(self):
+        # given
+        server = SlowReadServer()
+        easydb_client = EasydbClient(self.server_url, coalesce_reads=True, transport=server)
+
+        async def read_after_update():
+            space_name = await easydb_client.create_space()
+            await easydb_client.create_bucket(space_name, 'users')
+            element = await easydb_client.add_element(space_name, 'users',
+                                                      MultipleElementFields().add_field('username', 'old'))
+            requests = server.requests
+            before = asyncio.ensure_future(easydb_client.get_element(space_name, 'users', element.identifier))
+            while server.requests == requests:
+                await asyncio.sleep(0)
+            await easydb_client.update_element(space_name, 'users', element.identifier,
+                                               MultipleElementFields().add_field('username', 'new'))
+            after = await easydb_client.get_element(space_name, 'users', element.identifier)
+            return await before, after
+
+        # when
+        before, after = self.loop.run_until_complete(read_after_update())
+
+        # then
+        self.assertEqual(before.get('username'), 'old')
+        self.assertEqual(after.get('username'), 'new')
+
+    @aioresponses()
+    def test_should_give_every_caller_its_own_result(self, mocked: aioresponses):
+        # given
+        mocked.get(self.server_url + '/api/v1/spaces/exampleSpace/buckets/users/elements/id1', status=200, payload={
+            "id": "id1",
+            "fields": [{"name": "username", "value": "Heniek"}]
+        })
+
+        # when
+        first, second = self.gather(*[self.easydb_client.get_element('exampleSpace', 'users', 'id1') for _ in range(2)])
+        first.add_field('age', '22')
+
+        # then
+        self.assertIsNot(first, second)
+        self.assertEqual(second, Element('id1').add_field('username', 'Heniek'))
@@ -10,6 +10,9 @@ class SpaceTests(BaseTest):
         self.easydb_client = EasydbClient(self.server_url)
         self.spaces_url = self.server_url + '/api/v1/spaces'
 
+    def tearDown(self):
+        self.loop.run_until_complete(self.easydb_client.close())
+
     @aioresponses()
     def test_should_create_space(self, mocked: aioresponses):
         # given
@@ -0,0 +1,114 @@
+import json
+
+from aioresponses import aioresponses
+
+from easydb import EasydbClient, Element, FilterQuery, ElementStream, BucketDoesNotExistException
+from tests.base_test import BaseTest
+
+
+async def chunked(body: bytes, chunk_size: int):
+    for i in range(0, len(body), chunk_size):
+        yield body[i:i + chunk_size]
+
+
+def page_body(elements, next_link=None, results_first=True):
+    results = [{"id": element_id, "fields": [{"name": "name", "value": value}]} for element_id, value in elements]
+    items = [("results", results), ("nextPageLink", next_link)]
+    return json.dumps(dict(items if results_first else reversed(items))).encode('utf-8')
+
+
+class ElementStreamParserTests(BaseTest):
+    def parse(self, body, chunk_size):
+        stream = ElementStream(None, EasydbClient._parse_single_element)
+
+        async def parse():
+            return [element async for element in stream.parse(chunked(body, chunk_size))]
+
+        return self.loop.run_until_complete(parse()), stream.next_link
+
+    def test_should_parse_elements_regardless_of_chunk_boundaries(self):
+        # given
+        body = page_body([('id1', 'Zażółć gęślą jaźń'), ('id2', 'quote " and \\ backslash')], 'http://next')
+
+        # expect
+        for chunk_size in range(1, len(body) + 1):
+            elements, next_link = self.parse(body, chunk_size)
+            self.assertEqual(elements, [Element('id1').add_field('name', 'Zażółć gęślą jaźń'),
+                                        Element('id2').add_field('name', 'quote " and \\ backslash')])
+            self.assertEqual(next_link, 'http://next')
+
+    def test_should_parse_numbers_split_across_chunks(self):
+        # given
+        body = json.dumps({"total": 12.5, "count": -3e-2, "results": [{"id": "id1", "fields": []}],
+                           "nextPageLink": None}).encode('utf-8')
+
+        # expect
+        for chunk_size in range(1, len(body) + 1):
+            self.assertEqual(self.parse(body, chunk_size), ([Element('id1')], None))
+
+    def test_should_read_next_link_before_results(self):
+        # when
+        elements, next_link = self.parse(page_body([('id1', 'a')], 'http://next', results_first=False), 3)
+
+        # then
+        self.assertEqual(elements, [Element('id1').add_field('name', 'a')])
+        self.assertEqual(next_link, 'http://next')
+
+    def test_should_parse_empty_results(self):
+        # expect
+        self.assertEqual(self.parse(page_body([]), 2), ([], None))
+
+    def test_should_fail_on_truncated_body(self):
+        # expect
+        with self.assertRaises(ValueError):
+            self.parse(page_body([('id1', 'a'), ('id2', 'b')])[:-20], 4)
+
+
+class StreamingClientTests(BaseTest):
+    def setUp(self):
+        super().setUp()
+        self.easydb_client = EasydbClient(self.server_url, retries_number=0)
+
+    def tearDown(self):
+        self.loop.run_until_complete(self.easydb_client.close())
+
+    def elements_url(self, bucket_name):
+        return "%s/api/v1/spaces/exampleSpace/buckets/%s/elements" % (self.server_url, bucket_name)
+
+    def collect(self, stream):
+        async def collect():
+            return [element async for element in stream]
+
+        return self.loop.run_until_complete(collect())
+
+    @aioresponses()
+    def test_should_stream_filtered_elements(self, mocked: aioresponses):
+        # given
+        mocked.get(self.elements_url('users') + '?limit=2&offset=0', status=200,
+                   body=page_body([('id1', 'Chandler'), ('id2', 'Joe')], self.elements_url('users') + '?limit=2&offset=2'))
+        mocked.get(self.elements_url('users') + '?limit=2&offset=2', status=200, body=page_body([('id3', 'Monica')]))
+
+        # when
+        stream = self.easydb_client.stream_elements_by_query(FilterQuery('exampleSpace', 'users', limit=2))
+        elements = self.collect(stream)
+        next_stream = self.easydb_client.stream_elements_by_link(stream.next_link)
+        next_elements = self.collect(next_stream)
+
+        # then
+        self.assertEqual(elements, [Element('id1').add_field('name', 'Chandler'),
+                                    Element('id2').add_field('name', 'Joe')])
+        self.assertEqual(next_elements, [Element('id3').add_field('name', 'Monica')])
+        self.assertIsNone(next_stream.next_link)
+
+    @aioresponses()
+    def test_should_throw_error_when_streaming_from_not_existing_bucket(self, mocked: aioresponses):
+        # given
+        mocked.get(self.elements_url('notExistingBucket') + '?limit=20&offset=0', status=404, payload={
+            "errorCode": "BUCKET_DOES_NOT_EXIST",
+            "status": "NOT_FOUND",
+            "message": "Bucket notExistingBucket does not exist"
+        })
+
+        # expect
+        with self.assertRaises(BucketDoesNotExistException):
+            self.collect(self.easydb_client.stream_elements_by_query(FilterQuery('exampleSpace', 'notExistingBucket')))
@@ -0,0 +1,178 @@
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from easydb import SyncEasydbClient, FakeEasydbServer, FilterQuery, MultipleElementFields, TransactionOperation, \
+    SpaceDoesNotExistException, deadline, DeadlineExceededException, UnknownOperationException, \
+    ElementDoesNotExistException, request_timeout, RequestTimeoutException
+
+
+class SlowServer(FakeEasydbServer):
+    def __init__(self):
+        super().__init__()
+        self.delay = 0
+
+    async def send(self, request):
+        await asyncio.sleep(self.delay)
+        return await super().send(request)
+
+
+class SyncEasydbClientTests(unittest.TestCase):
+    def setUp(self):
+        self.server = SlowServer()
+        self.easydb_client = SyncEasydbClient('http://localhost:9000', transport=self.server)
+        self.space_name = self.easydb_client.create_space()
+        self.easydb_client.create_bucket(self.space_name, 'users')
+
+    def tearDown(self):
+        self.easydb_client.close()
+
+    def add_users(self, count):
+        return [result.value for result in self.easydb_client.add_elements(
+            self.space_name, 'users', [MultipleElementFields().add_field('username', 'user%d' % i)
+                                       for i in range(count)])]
+
+    def test_should_perform_blocking_calls(self):
+        # when
+        element = self.easydb_client.add_element(self.space_name, 'users',
+                                                 MultipleElementFields().add_field('username', 'Heniek'))
+
+        # then
+        self.assertEqual(self.easydb_client.get_element(self.space_name, 'users', element.identifier), element)
+        with self.assertRaises(SpaceDoesNotExistException):
+            self.easydb_client.get_space('notExistingSpace')
+
+    def test_should_share_one_loop_between_threads(self):
+        # given
+        loop_threads = set()
+        send = self.server.send
+
+        async def recording_send(request):
+            loop_threads.add(threading.current_thread())
+            return await send(request)
+
+        def add_user(i):
+            return self.easydb_client.add_element(self.space_name, 'users',
+                                                  MultipleElementFields().add_field('username', 'user%d' % i))
+
+        self.server.send = recording_send
+
+        # when
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            elements = list(executor.map(add_user, range(50)))
+
+        # then
+        self.assertEqual(len({element.identifier for element in elements}), 50)
+        self.assertEqual(len(self.server.spaces[self.space_name]['users']), 50)
+        self.assertEqual(loop_threads, {self.easydb_client._thread})
+
+    def test_should_iterate_over_pages(self):
+        # given
+        self.add_users(25)
+
+        # when
+        iterated = list(self.easydb_client.iter_elements(FilterQuery(self.space_name, 'users', limit=10)))
+        scanned = list(self.easydb_client.scan_bucket(self.space_name, 'users', shard_size=10))
+        stream = self.easydb_client.stream_elements_by_query(FilterQuery(self.space_name, 'users', limit=10))
+        streamed = list(stream)
+
+        # then
+        self.assertEqual([e.get('username') for e in iterated], ['user%d' % i for i in range(25)])
+        self.assertEqual(scanned, iterated)
+        self.assertEqual(streamed, iterated[:10])
+        self.assertIsNotNone(stream.next_link)
+
+    def test_should_commit_transaction(self):
+        # given
+        element, = self.add_users(1)
+
+        # when
+        with self.easydb_client.transaction(self.space_name) as transaction:
+            read = transaction.add_operation(TransactionOperation('READ', 'users', element.identifier))
+            transaction.add_operation(TransactionOperation(
+                'UPDATE', 'users', element.identifier, MultipleElementFields().add_field('username', 'updated')))
+
+        # then
+        self.assertEqual(read.result().element, element)
+        self.assertEqual(self.easydb_client.get_element(self.space_name, 'users', element.identifier).get('username'),
+                         'updated')
+
+    def test_should_reject_invalid_operation_without_committing_the_rest(self):
+        # given
+        element, = self.add_users(1)
+
+        # when
+        with self.assertRaises(UnknownOperationException):
+            with self.easydb_client.transaction(self.space_name) as transaction:
+                transaction.add_operation(TransactionOperation('DELETE', 'users', element.identifier))
+                transaction.add_operation(TransactionOperation('BOGUS', 'users', element.identifier))
+
+        # then
+        self.assertEqual(self.easydb_client.get_element(self.space_name, 'users', element.identifier), element)
+
+    def test_should_not_commit_transaction_when_submitted_operation_fails(self):
+        # given
+        element, = self.add_users(1)
+
+        # when
+        with self.assertRaises(ElementDoesNotExistException):
+            with self.easydb_client.transaction(self.space_name) as transaction:
+                transaction.add_operation(TransactionOperation('DELETE', 'users', element.identifier))
+                transaction.add_operation(TransactionOperation('DELETE', 'users', 'notExisting'))
+
+        # then
+        self.assertEqual(self.easydb_client.get_element(self.space_name, 'users', element.identifier), element)
+
+    def test_should_retry_transaction_function_in_worker_thread(self):
+        # given
+        attempts = []
+
+        def fn(transaction):
+            attempts.append((transaction.attempt, threading.current_thread() is self.easydb_client._thread))
+            transaction.add_operation(TransactionOperation(
+                'CREATE', 'users', fields=MultipleElementFields().add_field('username', 'Heniek')))
+            if transaction.attempt == 1:
+                self.server.abort_transaction(transaction.transaction_id)
+            return transaction.attempt
+
+        # when
+        result = self.easydb_client.run_transaction(self.space_name, fn)
+
+        # then
+        self.assertEqual(result, 2)
+        self.assertEqual(attempts, [(1, False), (2, False)])
+        self.assertEqual(len(self.server.spaces[self.space_name]['users']), 1)
+
+    def test_should_propagate_caller_deadline(self):
+        # expect
+        with self.assertRaises(DeadlineExceededException):
+            with deadline(0):
+                self.easydb_client.get_space(self.space_name)
+
+    def test_should_apply_caller_timeouts_in_loop_thread(self):
+        # given
+        self.server.delay = 1
+        easydb_client = SyncEasydbClient('http://localhost:9000', retries_number=0, transport=self.server)
+        started = time.monotonic()
+
+        # expect
+        with self.assertRaises(DeadlineExceededException):
+            with deadline(0.05):
+                easydb_client.get_space(self.space_name)
+        with self.assertRaises(RequestTimeoutException):
+            with request_timeout(total=0.05):
+                easydb_client.get_space(self.space_name)
+        self.assertLess(time.monotonic() - started, 0.5)
+        easydb_client.close()
+
+    def test_should_stop_loop_thread_on_close(self):
+        # when
+        self.easydb_client.close()
+
+        # then
+        self.assertTrue(self.easydb_client.closed)
+        self.assertFalse(self.easydb_client._thread.is_alive())
+        with self.assertRaises(RuntimeError):
+            self.easydb_client.get_space(self.space_name)
@@ -0,0 +1,126 @@
+import asyncio
+
+from aioresponses import aioresponses
+
+from easydb import EasydbClient, Timeout, deadline, request_timeout, RequestTimeoutException, \
+    DeadlineExceededException, FilterQuery, FakeEasydbServer, RequestLimiter
+from easydb.http import Request, ResponseData
+from tests.base_test import BaseTest
+
+
+class SlowServer(FakeEasydbServer):
+    async def send(self, request):
+        await asyncio.sleep(1)
+        return await super().send(request)
+
+
+class TimeoutsTests(BaseTest):
+    def setUp(self):
+        super().setUp()
+        self.easydb_client = EasydbClient(self.server_url, retries_number=0, timeout=Timeout(total=5, connect=1, read=2))
+        self.request = Request(self.server_url + '/api/v1/spaces/exampleSpace', 'GET')
+
+    def tearDown(self):
+        self.loop.run_until_complete(self.easydb_client.close())
+
+    def test_should_use_client_timeout_settings(self):
+        # when
+        timeout = self.easydb_client._timeout_options(self.request)['timeout']
+
+        # then
+        self.assertEqual((timeout.total, timeout.connect, timeout.sock_read), (5, 1, 2))
+
+    def test_should_override_timeout_for_single_call(self):
+        # when
+        with request_timeout(total=0.5):
+            timeout = self.easydb_client._timeout_options(self.request)['timeout']
+
+        # then
+        self.assertEqual((timeout.total, timeout.connect, timeout.sock_read), (0.5, None, None))
+        self.assertEqual(self.easydb_client._timeout_options(self.request)['timeout'].total, 5)
+
+    def test_should_cap_timeout_with_remaining_deadline(self):
+        # when
+        with deadline(1):
+            timeout = self.easydb_client._timeout_options(self.request)['timeout']
+
+        # then
+        self.assertLessEqual(timeout.total, 1)
+        self.assertEqual(timeout.connect, 1)
+
+    def test_should_keep_aiohttp_defaults_without_timeouts(self):
+        # expect
+        self.assertEqual(EasydbClient(self.server_url)._timeout_options(self.request), {})
+
+    @aioresponses()
+    def test_should_raise_request_timeout(self, mocked: aioresponses):
+        # given
+        mocked.get(self.server_url + '/api/v1/spaces/exampleSpace', timeout=True)
+
+        # expect
+        with self.assertRaises(RequestTimeoutException):
+            self.loop.run_until_complete(self.easydb_client.get_space('exampleSpace'))
+
+    def test_should_stop_retrying_when_deadline_is_exhausted(self):
+        # given
+        easydb_client = EasydbClient(self.server_url, retry_backoff_millis=10, retries_number=100)
+        attempts = []
+
+        async def slow_failing_send(request):
+            attempts.append(request)
+            await asyncio.sleep(0.02)
+            return ResponseData(503, {})
+
+        easydb_client._send = slow_failing_send
+
+        async def get_space():
+            with deadline(0.1):
+                await easydb_client.get_space('exampleSpace')
+
+        # expect
+        with self.assertRaises(DeadlineExceededException):
+            self.loop.run_until_complete(get_space())
+        self.assertLess(len(attempts), 10)
+
+    def test_should_propagate_deadline_to_page_prefetching(self):
+        # given
+        async def iterate():
+            with deadline(0):
+                return [element async for element in self.easydb_client.iter_elements(
+                    FilterQuery('exampleSpace', 'users'))]
+
+        # expect
+        with self.assertRaises(DeadlineExceededException):
+            self.loop.run_until_complete(iterate())
+
+    def test_should_enforce_deadline_while_waiting_for_limiter(self):
+        # given
+        limiter = RequestLimiter(max_concurrency=1)
+        easydb_client = EasydbClient(self.server_url, retries_number=0, limiter=limiter, transport=SlowServer())
+
+        async def wait_for_slot():
+            occupying = asyncio.ensure_future(easydb_client.get_space('exampleSpace'))
+            while not limiter.in_flight:
+                await asyncio.sleep(0)
+            errors = []
+            for call in (easydb_client.get_space('exampleSpace'),
+                         self.collect(easydb_client.stream_elements_by_query(FilterQuery('exampleSpace', 'users')))):
+                with deadline(0.05):
+                    try:
+                        await asyncio.wait_for(call, 0.5)
+                    except Exception as e:
+                        errors.append(e)
+            occupying.cancel()
+            await asyncio.gather(occupying, return_exceptions=True)
+            return errors
+
+        # when
+        errors = self.loop.run_until_complete(wait_for_slot())
+
+        # then
+        self.assertEqual([type(error) for error in errors], [DeadlineExceededException] * 2)
+        self.assertEqual(limiter.waiting, 0)
+
+    @staticmethod
+    async def collect(stream):
+        return [element async for element in stream]
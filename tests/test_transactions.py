@@ -1,17 +1,36 @@
+import asyncio
+
 from aioresponses import aioresponses
+from yarl import URL
 
 from easydb import EasydbClient, SpaceDoesNotExistException, TransactionOperation, OperationResult, \
     Element, TransactionDoesNotExistException, BucketDoesNotExistException, ElementDoesNotExistException, \
-    UnknownOperationException
+    UnknownOperationException, FakeEasydbServer
 from easydb.domain import TransactionAbortedException, MultipleElementFields
 from tests.base_test import BaseTest
 
 
+class SlowFirstOperationServer(FakeEasydbServer):
+    def __init__(self):
+        super().__init__()
+        self.operations = []
+        self.delays = [0.05]
+
+    async def send(self, request):
+        if request.url.endswith('/add-operation'):
+            await asyncio.sleep(self.delays.pop(0) if self.delays else 0)
+            self.operations.append((request.data['type'], request.data['elementId']))
+        return await super().send(request)
+
+
 class TransactionTest(BaseTest):
     def setUp(self):
         super().setUp()
         self.easydb_client = EasydbClient(self.server_url, retry_backoff_millis=1, retries_number=0)
 
+    def tearDown(self):
+        self.loop.run_until_complete(self.easydb_client.close())
+
     def transactions_url(self, space_name, transaction_id=None):
         base_url = "%s/api/v1/spaces/%s/transactions" % (self.server_url, space_name)
         if transaction_id:
@@ -203,4 +222,118 @@ class TransactionTest(BaseTest):
 
         # expect
         with self.assertRaises(TransactionAbortedException):
-            self.loop.run_until_complete(self.easydb_client.add_operation('users', 'exampleTransactionId', operation))
\ No newline at end of file
+            self.loop.run_until_complete(self.easydb_client.add_operation('users', 'exampleTransactionId', operation))
+
+    @aioresponses()
+    def test_should_pipeline_operations_and_commit_transaction(self, mocked: aioresponses):
+        # given
+        mocked.post(self.transactions_url('users'), status=201, payload={"transactionId": "exampleTransactionId"})
+        for element_id in ['id1', 'id2', 'id3']:
+            mocked.post(self.transactions_url('users', 'exampleTransactionId') + '/add-operation', status=200,
+                        payload={"element": None})
+        mocked.post(self.transactions_url('users', 'exampleTransactionId') + '/commit', status=202)
+
+        async def run_transaction():
+            async with self.easydb_client.transaction('users', window=2) as transaction:
+                for element_id in ['id1', 'id2', 'id3']:
+                    transaction.add_operation(TransactionOperation('DELETE', 'users', element_id))
+            return transaction
+
+        # when
+        transaction = self.loop.run_until_complete(run_transaction())
+
+        # then
+        self.assertEqual(transaction.transaction_id, 'exampleTransactionId')
+        self.assertEqual(len(transaction.results), 3)
+        self.assertTrue(all(result.is_empty() for result in transaction.results))
+        self.assertIn(('POST', URL(self.transactions_url('users', 'exampleTransactionId') + '/commit')),
+                      mocked.requests)
+
+    def test_should_keep_order_of_operations_on_same_element(self):
+        # given
+        server = SlowFirstOperationServer()
+        easydb_client = EasydbClient(self.server_url, transport=server)
+
+        async def run_transaction():
+            space_name = await easydb_client.create_space()
+            await easydb_client.create_bucket(space_name, 'users')
+            first, second = [(await easydb_client.add_element(space_name, 'users', MultipleElementFields()
+                                                              .add_field('username', name))).identifier
+                             for name in ('Heniek', 'Zdzisiek')]
+            async with easydb_client.transaction(space_name, window=4) as transaction:
+                transaction.add_operation(TransactionOperation(
+                    'UPDATE', 'users', first, MultipleElementFields().add_field('username', 'Mietek')))
+                transaction.add_operation(TransactionOperation('DELETE', 'users', first))
+                transaction.add_operation(TransactionOperation('DELETE', 'users', second))
+            return first, second
+
+        # when
+        first, second = self.loop.run_until_complete(run_transaction())
+
+        # then
+        self.assertEqual(server.operations, [('DELETE', second), ('UPDATE', first), ('DELETE', first)])
+
+    @aioresponses()
+    def test_should_not_commit_transaction_when_operation_fails(self, mocked: aioresponses):
+        # given
+        mocked.post(self.transactions_url('users'), status=201, payload={"transactionId": "exampleTransactionId"})
+        mocked.post(self.transactions_url('users', 'exampleTransactionId') + '/add-operation', status=409, payload={
+            "errorCode": "TRANSACTION_ABORTED",
+            "status": "TRANSACTION_ABORTED",
+            "message": "Transaction was aborted. Possible many conflicting transactions running at the same time. Try later again"
+        })
+
+        async def run_transaction():
+            async with self.easydb_client.transaction('users') as transaction:
+                transaction.add_operation(TransactionOperation('READ', 'users', 'exampleElementId'))
+
+        # expect
+        with self.assertRaises(TransactionAbortedException):
+            self.loop.run_until_complete(run_transaction())
+        self.assertNotIn(('POST', URL(self.transactions_url('users', 'exampleTransactionId') + '/commit')),
+                         mocked.requests)
+
+    @aioresponses()
+    def test_should_replay_aborted_transaction(self, mocked: aioresponses):
+        # given
+        mocked.post(self.transactions_url('users'), status=201, payload={"transactionId": "firstTransactionId"})
+        mocked.post(self.transactions_url('users', 'firstTransactionId') + '/add-operation', status=200,
+                    payload={"element": None})
+        mocked.post(self.transactions_url('users', 'firstTransactionId') + '/commit', status=409, payload={
+            "errorCode": "TRANSACTION_ABORTED",
+            "status": "TRANSACTION_ABORTED",
+            "message": "Transaction was aborted. Possible many conflicting transactions running at the same time. Try later again"
+        })
+        mocked.post(self.transactions_url('users'), status=201, payload={"transactionId": "secondTransactionId"})
+        mocked.post(self.transactions_url('users', 'secondTransactionId') + '/add-operation', status=200,
+                    payload={"element": None})
+        mocked.post(self.transactions_url('users', 'secondTransactionId') + '/commit', status=202)
+
+        async def delete_element(transaction):
+            transaction.add_operation(TransactionOperation('DELETE', 'users', 'exampleElementId'))
+            return transaction.attempt, transaction.transaction_id
+
+        # when
+        attempt, transaction_id = self.loop.run_until_complete(
+            self.easydb_client.run_transaction('users', delete_element, max_attempts=2))
+
+        # then
+        self.assertEqual(attempt, 2)
+        self.assertEqual(transaction_id, 'secondTransactionId')
+
+    @aioresponses()
+    def test_should_give_up_replaying_transaction_after_max_attempts(self, mocked: aioresponses):
+        # given
+        mocked.post(self.transactions_url('users'), status=201, payload={"transactionId": "exampleTransactionId"})
+        mocked.post(self.transactions_url('users', 'exampleTransactionId') + '/commit', status=409, payload={
+            "errorCode": "TRANSACTION_ABORTED",
+            "status": "TRANSACTION_ABORTED",
+            "message": "Transaction was aborted. Possible many conflicting transactions running at the same time. Try later again"
+        })
+
+        async def do_nothing(transaction):
+            pass
+
+        # expect
+        with self.assertRaises(TransactionAbortedException):
+            self.loop.run_until_complete(self.easydb_client.run_transaction('users', do_nothing, max_attempts=1))
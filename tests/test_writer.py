@@ -0,0 +1,176 @@
+import asyncio
+
+from easydb import EasydbClient, FakeEasydbServer, MultipleElementFields, ElementWriter, BucketDoesNotExistException
+from tests.base_test import BaseTest
+
+
+class CountingServer(FakeEasydbServer):
+    def __init__(self, delay=0.0):
+        super().__init__()
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def send(self, request):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            return await super().send(request)
+        finally:
+            self.in_flight -= 1
+
+
+class ElementWriterTests(BaseTest):
+    def setUp(self):
+        super().setUp()
+        self.server = CountingServer()
+        self.easydb_client = EasydbClient(self.server_url, transport=self.server)
+        self.space_name = self.loop.run_until_complete(self.easydb_client.create_space())
+        self.loop.run_until_complete(self.easydb_client.create_bucket(self.space_name, 'users'))
+
+    def tearDown(self):
+        self.loop.run_until_complete(self.easydb_client.close())
+
+    @staticmethod
+    def user(i):
+        return MultipleElementFields().add_field('username', 'user%d' % i)
+
+    def test_should_resolve_futures_with_created_elements(self):
+        # given
+        writer = self.easydb_client.element_writer(self.space_name, 'users', batch_size=10)
+
+        async def write():
+            futures = [await writer.add(self.user(i)) for i in range(25)]
+            await writer.close()
+            return futures
+
+        # when
+        futures = self.loop.run_until_complete(write())
+
+        # then
+        elements = [future.result() for future in futures]
+        self.assertEqual([e.get('username') for e in elements], ['user%d' % i for i in range(25)])
+        self.assertEqual(len(self.server.spaces[self.space_name]['users']), 25)
+        self.assertEqual((writer.written, writer.failed), (25, 0))
+
+    def test_should_flush_partial_batch_on_interval(self):
+        # given
+        writer = ElementWriter(self.easydb_client, self.space_name, 'users', batch_size=100, flush_interval=0.01)
+
+        async def write():
+            future = await writer.add(self.user(1))
+            element = await asyncio.wait_for(future, 1)
+            await writer.close()
+            return element
+
+        # expect
+        self.assertEqual(self.loop.run_until_complete(write()).get('username'), 'user1')
+
+    def test_should_flush_on_demand(self):
+        # given
+        writer = ElementWriter(self.easydb_client, self.space_name, 'users', flush_interval=60)
+
+        async def write():
+            futures = [await writer.add(self.user(i)) for i in range(3)]
+            await writer.flush()
+            done = all(future.done() for future in futures)
+            await writer.close()
+            return done
+
+        # expect
+        self.assertTrue(self.loop.run_until_complete(write()))
+        self.assertEqual(len(self.server.spaces[self.space_name]['users']), 3)
+
+    def test_should_apply_backpressure_when_queue_is_full(self):
+        # given
+        self.server.delay = 0.01
+        writer = ElementWriter(self.easydb_client, self.space_name, 'users', batch_size=2, max_queue_size=2,
+                               workers=1, concurrency=2)
+        max_queued = []
+
+        async def write():
+            async with writer:
+                for i in range(20):
+                    await writer.add(self.user(i))
+                    max_queued.append(writer.queued)
+
+        # when
+        self.loop.run_until_complete(write())
+
+        # then
+        self.assertLessEqual(max(max_queued), 2)
+        self.assertLessEqual(self.server.max_in_flight, 2)
+        self.assertEqual(writer.written, 20)
+
+    def test_should_not_wait_for_element_cancelled_during_backpressure(self):
+        # given
+        self.server.delay = 0.05
+        writer = ElementWriter(self.easydb_client, self.space_name, 'users', batch_size=1, max_queue_size=1,
+                               workers=1)
+
+        async def write():
+            futures = []
+            for i in range(5):
+                try:
+                    futures.append(await asyncio.wait_for(writer.add(self.user(i)), 0.01))
+                except asyncio.TimeoutError:
+                    pass
+            await asyncio.wait_for(writer.flush(), 1)
+            await writer.close()
+            return futures
+
+        # when
+        futures = self.loop.run_until_complete(write())
+
+        # then
+        self.assertLess(len(futures), 5)
+        self.assertTrue(all(future.done() for future in futures))
+        self.assertEqual(writer.written, len(futures))
+
+    def test_should_cancel_futures_of_cancelled_write(self):
+        # given
+        self.server.delay = 1
+        writer = ElementWriter(self.easydb_client, self.space_name, 'users', flush_interval=0)
+
+        async def write():
+            future = await writer.add(self.user(1))
+            while not self.server.in_flight:
+                await asyncio.sleep(0.001)
+            for pending_write in list(writer._writes):
+                pending_write.cancel()
+            await asyncio.wait_for(writer.flush(), 1)
+            await writer.close()
+            return future
+
+        # when
+        future = self.loop.run_until_complete(write())
+
+        # then
+        self.assertTrue(future.cancelled())
+        self.assertEqual((writer.written, writer.failed), (0, 0))
+
+    def test_should_fail_futures_of_rejected_elements(self):
+        # given
+        writer = ElementWriter(self.easydb_client, self.space_name, 'notExistingBucket')
+
+        async def write():
+            async with writer:
+                future = await writer.add(self.user(1))
+            return future
+
+        # when
+        future = self.loop.run_until_complete(write())
+
+        # then
+        self.assertIsInstance(future.exception(), BucketDoesNotExistException)
+        self.assertEqual(writer.failed, 1)
+
+    def test_should_reject_elements_after_close(self):
+        # given
+        writer = ElementWriter(self.easydb_client, self.space_name, 'users')
+        self.loop.run_until_complete(writer.close())
+
+        # expect
+        with self.assertRaises(RuntimeError):
+            self.loop.run_until_complete(writer.add(self.user(1)))